@@ -1,70 +1,37 @@
-from math import sqrt, ceil
 from Computation.RootFinding import int_root, is_square
+from Computation.FactorizationECM import pipeline_factorization
 
 
-# Needed to avoid circular reference with sequences
-def _primes_():
-    """Prime Numbers"""
-    D = {}
-    q = 2
-    
-    while True:
-        if q not in D:
-            
-            yield q
-                
-            D[q * q] = [q]
-        else:
-            for p in D[q]:
-                D.setdefault(p + q, []).append(p)
-            del D[q]
-        q += 1
+def _divisors(F):
+    """Sorted divisors from prime factors with multiplicity"""
+    L = [1]
+    i = 0
+    while i < len(F):
+        p, k = F[i], F.count(F[i])
+        L = [d*p**e for d in L for e in range(k+1)]
+        i += k
+    return sorted(L)
+
 
 def factorization(n,nontrivial=False):
     """All Unique Factors"""
     if type(n) != int:
         raise Exception("n must be an integer") 
     
-    lim = int_root(n)+1
+    # The divisors are built from the prime factors
+    L = _divisors(prime_factorization(n))
     
     # Either include or don't include trivial factors
     if nontrivial == True:
-        L = []
-    else:
-        L = [1,n]
-    
-    
-    for i in range(2,lim):
-        f,r = divmod(n,i)
-        if r == 0:
-            L.append(i)
-            L.append(f)
-            
-    L = list(set(L))
-    L.sort()
-    
+        return L[1:-1]
     return L
     
+
 def prime_factorization(n):
     """Prime Factors with Multiplicity"""
-    if type(n) != int:
-        raise Exception("n must be an integer") 
-    
-    lim = ceil(sqrt(n))+1
-    L = []
-    
-    for p in _primes_():
-        while n % p == 0:
-            L.append(p)
-            n = n // p
-            
-        if n == 1:
-            break
-        
-        if p > lim:
-            L.append(n)
-            break
-    return L
+    # Small numbers come straight from the prime factor index, larger ones go
+    # through trial division, Brent's rho, p-1 and ECM
+    return pipeline_factorization(n)
 
 
 def aliquot_sum(n):
@@ -1,5 +1,6 @@
 from math import sqrt,floor,gcd,log
 from PrimeNumbers import primes
+from Computation.FactorizationQuadraticSieve import gf2_dependencies
 
 #  http://blog.fkraiem.org/2013/12/07/factoring-integers-factor-bases/
 #  http://blog.fkraiem.org/2013/12/08/factoring-integers-dixons-algorithm/
@@ -20,7 +21,7 @@ def prime_exponent_vector(x,P):
     return out
 
 def vector_sum(A,B):
-    return [a*b for a,b in zip(A,B)]
+    return [a+b for a,b in zip(A,B)]
 
 def all_even(L):
     for i in L:
@@ -63,17 +64,21 @@ def dixon_factorization(N,P,S):
         if len(L) == S:
             break
     
-    for i in range(S):
-        for j in  range(i):
-            S = vector_sum(L[i],L[j])
-            if  all_even(S):
-                A,B = K[i],K[j]
-                X = [i//2 for i in S]
-                z1 = A*B%N
-                z2 = vec2num(X,factor_base)
-                g = gcd(z1-z2,N)
-                if g != 1 and g !=  N:
-                    return  g,N//g
+    # Any set of relations whose exponent vectors add up to all even numbers
+    # gives a congruence of squares, those sets are found by elimination on
+    # the vectors modulo 2
+    rows = [sum(1 << n for n,e in enumerate(B) if e % 2 == 1) for B in L]
+    for dep in gf2_dependencies(rows):
+        S = [0]*len(factor_base)
+        z1 = 1
+        for d in dep:
+            S = vector_sum(S,L[d])
+            z1 = z1*K[d] % N
+        X = [i//2 for i in S]
+        z2 = vec2num(X,factor_base)
+        g = gcd(z1-z2,N)
+        if g != 1 and g !=  N:
+            return  g,N//g
                 
     print("Unable to find non-trivial factors.")
 
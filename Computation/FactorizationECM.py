@@ -0,0 +1,391 @@
+from math import gcd
+from random import randrange
+import numpy as np
+from PrimeNumbers import is_prime, primes_in_range
+from Computation.PrimeFactorIndex import indexed, factor_indexed
+from Computation.FactorizationQuadraticSieve import quadratic_sieve
+
+# A factoring pipeline where each stage is more expensive than the last but
+# finds larger factors. What is left after each one is checked for primality
+# so no time is spent trying to split a prime.
+#
+# trial division : every prime below TRIAL_LIMIT
+# Brent's rho    : Pollard's rho with Brent's cycle finding, gcds taken over
+#                  products of many differences at once
+# Pollard p-1    : finds p when p-1 has only small prime factors
+# Lenstra ECM    : the same idea as p-1 in the group of an elliptic curve,
+#                  each new curve is another chance at a smooth group order
+# quadratic sieve: once ECM has ruled out factors up to about a third of the
+#                  digits of n the rest are probably of similar size, then
+#                  numbers up to QS_MAX_DIGITS are split by the quadratic
+#                  sieve whose time doesn't depend on the size of the factors
+#
+# The curves are in Montgomery form By^2 = x^3 + Ax^2 + x so only the x and z
+# coordinates are needed and a point is multiplied by a Montgomery ladder.
+
+# Primes below this are removed by trial division
+TRIAL_LIMIT = 2**12
+
+# Iterations of Brent's rho before moving on
+RHO_ITERATIONS = 2**16
+
+# Bounds for the p-1 method
+PM1_B1 = 10**5
+PM1_B2 = 2*10**6
+
+# (digits, B1, curves) for ECM, roughly the best choice for factors of that
+# many digits. B2 is 100*B1
+ECM_SCHEDULE = [(15,2000,25), (20,11000,90), (25,50000,300), (30,250000,700), (35,1000000,1800)]
+
+# ECM searches for factors of up to about this fraction of the digits of n
+# before the quadratic sieve takes over
+ECM_FRACTION = 1/3
+
+# Largest number of digits handed to the quadratic sieve
+QS_MAX_DIGITS = 80
+
+_TRIAL_PRIMES = []
+_PRIMES = {"N": 0, "P": np.zeros(0,dtype=np.int64)}
+
+
+def _primes_to(N):
+    """Array of the primes up to N, kept for the small bounds of stage one"""
+    if N > _PRIMES["N"]:
+        _PRIMES["P"] = primes_in_range(0,N+1)
+        _PRIMES["N"] = N
+    P = _PRIMES["P"]
+    return P[:np.searchsorted(P,N,side="right")]
+
+
+def _primes_between(a, b):
+    """Array of the primes p with a < p <= b"""
+    # The stage two bounds go up to 10^8 so these come from the segmented
+    # sieve and are not kept
+    return primes_in_range(a+1,b+1)
+
+
+def _trial_primes():
+    if not _TRIAL_PRIMES:
+        _TRIAL_PRIMES.extend(_primes_to(TRIAL_LIMIT).tolist())
+    return _TRIAL_PRIMES
+
+
+def _stage_one_exponent(B1):
+    """Product of the largest power of each prime up to B1 that is at most B1"""
+    k = 1
+    for p in _primes_to(B1).tolist():
+        q = p
+        while q*p <= B1:
+            q *= p
+        k *= q
+    return k
+
+
+def _iroot(n, k):
+    """Largest integer x with x^k <= n"""
+    x = 1 << (n.bit_length()//k + 1)
+    while True:
+        y = ((k-1)*x + n//x**(k-1))//k
+        if y >= x:
+            return x
+        x = y
+
+
+def _perfect_power(n):
+    """(r,k) with r^k = n and k as large as possible, k = 1 if n is not a power"""
+    for k in range(n.bit_length(),1,-1):
+        r = _iroot(n,k)
+        if r > 1 and r**k == n:
+            return r, k
+    return n, 1
+
+
+## Brent's rho ##
+
+def brent_rho(n, c = 1, batch = 128, max_iter = RHO_ITERATIONS):
+    """Nontrivial factor of a composite n by Brent's variant of Pollard's rho, None on failure"""
+    if n % 2 == 0:
+        return 2
+    y, x, ys = 2, 2, 2
+    g, q, r = 1, 1, 1
+    k = 0
+    while g == 1:
+        x = y
+        for i in range(r):
+            y = (y*y + c) % n
+        # Multiply the differences together so only one gcd is needed for
+        # each batch of steps
+        k = 0
+        while k < r and g == 1:
+            ys = y
+            for i in range(min(batch,r-k)):
+                y = (y*y + c) % n
+                q = q * abs(x-y) % n
+            g = gcd(q,n)
+            k += batch
+        r *= 2
+        if r > max_iter:
+            break
+
+    # The batch may have passed more than one factor, step back through it
+    # one gcd at a time
+    if g == n:
+        while True:
+            ys = (ys*ys + c) % n
+            g = gcd(abs(x-ys),n)
+            if g > 1:
+                break
+    if g == 1 or g == n:
+        return None
+    return g
+
+
+## Pollard p-1 ##
+
+def _stage_two_steps(B1, B2, D):
+    """For each m the d with m*D +/- d a prime in (B1,B2], with gcd(d,D) = 1 and d < D/2"""
+    P = _primes_between(B1,B2)
+    m = (P + D//2) // D
+    d = np.abs(P - m*D)
+    # There are millions of pairs for the largest B2, the lists share one int
+    # object for each d so they only cost a pointer per prime
+    small = list(range(D))
+    cut = np.flatnonzero(np.diff(m)) + 1
+    steps = {}
+    for a,g in zip(m[np.r_[0,cut]].tolist(),np.split(d,cut)):
+        steps[a] = [small[b] for b in g.tolist()]
+    return steps
+
+
+def pollard_pm1(n, B1 = PM1_B1, B2 = PM1_B2):
+    """Nontrivial factor of a composite n by Pollard's p-1 method, None on failure"""
+    a = 2
+    a = pow(a,_stage_one_exponent(B1),n)
+    g = gcd(a-1,n)
+    if g == n:
+        return None
+    if g > 1:
+        return g
+
+    # Stage two allows for one prime q up to B2 in p-1, the powers of a for
+    # consecutive primes differ by a^gap and there are only a few gaps
+    P = _primes_between(B1,B2).tolist()
+    if not P:
+        return None
+    gaps = {}
+    x = pow(a,P[0],n)
+    acc = x-1
+    prev = P[0]
+    for ctr,q in enumerate(P[1:],1):
+        gap = q - prev
+        if gap not in gaps:
+            gaps[gap] = pow(a,gap,n)
+        x = x * gaps[gap] % n
+        acc = acc * (x-1) % n
+        prev = q
+        if ctr % 1024 == 0:
+            g = gcd(acc,n)
+            if g != 1:
+                break
+    g = gcd(acc,n)
+    if g == 1 or g == n:
+        return None
+    return g
+
+
+## Lenstra ECM ##
+
+def _xdbl(X, Z, a24, n):
+    s = (X+Z) * (X+Z) % n
+    d = (X-Z) * (X-Z) % n
+    t = s-d
+    return s*d % n, t*(d + a24*t) % n
+
+
+def _xadd(X1, Z1, X2, Z2, Xd, Zd, n):
+    """x coordinate of P+Q from those of P, Q and P-Q"""
+    u = (X1-Z1) * (X2+Z2)
+    v = (X1+Z1) * (X2-Z2)
+    s = u+v
+    t = u-v
+    return Zd * s * s % n, Xd * t * t % n
+
+
+def _ladder(k, X, Z, a24, n):
+    """x coordinate of kP by the Montgomery ladder"""
+    if k == 1:
+        return X, Z
+    # Invariant (R0,R1) = (mP,(m+1)P) for the bits of k read so far
+    X0, Z0 = X, Z
+    X1, Z1 = _xdbl(X,Z,a24,n)
+    for bit in bin(k)[3:]:
+        u = (X0-Z0) * (X1+Z1)
+        v = (X0+Z0) * (X1-Z1)
+        s = u+v
+        t = u-v
+        Xa, Za = Z * s * s % n, X * t * t % n
+        if bit == "1":
+            s = (X1+Z1) * (X1+Z1) % n
+            d = (X1-Z1) * (X1-Z1) % n
+            t = s-d
+            X0, Z0 = Xa, Za
+            X1, Z1 = s*d % n, t*(d + a24*t) % n
+        else:
+            s = (X0+Z0) * (X0+Z0) % n
+            d = (X0-Z0) * (X0-Z0) % n
+            t = s-d
+            X0, Z0 = s*d % n, t*(d + a24*t) % n
+            X1, Z1 = Xa, Za
+    return X0, Z0
+
+
+def _suyama_curve(n, sigma):
+    """Starting point and (A+2)/4 for the curve with parameter sigma, or a factor of n"""
+    u = (sigma*sigma - 5) % n
+    v = 4*sigma % n
+    X = pow(u,3,n)
+    Z = pow(v,3,n)
+    num = pow(v-u,3,n) * (3*u+v) % n
+    den = 16 * X * v % n
+    g = gcd(den,n)
+    if g != 1:
+        return g
+    return X, Z, num * pow(den,-1,n) % n
+
+
+def _ecm_curve(n, k, B1, B2, steps, D, sigma):
+    curve = _suyama_curve(n,sigma)
+    if type(curve) == int:
+        return curve if curve != n else None
+    X, Z, a24 = curve
+
+    # Stage one
+    X, Z = _ladder(k,X,Z,a24,n)
+    g = gcd(Z,n)
+    if g != 1:
+        return g if g != n else None
+
+    # Stage two, a single larger prime in the group order. For p = mD +/- d
+    # the points mDQ and dQ have the same x coordinate exactly when pQ is the
+    # identity modulo a factor of n
+    baby = {1:(X,Z)}
+    X2, Z2 = _xdbl(X,Z,a24,n)
+    prev, cur = (X,Z), _xadd(X2,Z2,X,Z,X,Z,n)
+    for d in range(3,D//2,2):
+        if gcd(d,D) == 1:
+            baby[d] = cur
+        prev, cur = cur, _xadd(cur[0],cur[1],X2,Z2,prev[0],prev[1],n)
+
+    XD, ZD = _ladder(D,X,Z,a24,n)
+    m0 = min(steps)
+    Rp = _ladder((m0-1)*D,X,Z,a24,n) if m0 > 1 else None
+    R = _ladder(m0*D,X,Z,a24,n)
+    acc = 1
+    for m in range(m0,max(steps)+1):
+        if m in steps:
+            Xm, Zm = R
+            for d in steps[m]:
+                Xd, Zd = baby[d]
+                acc = acc * (Xm*Zd - Xd*Zm) % n
+        if Rp is None:
+            Rp, R = R, _xdbl(R[0],R[1],a24,n)
+        else:
+            Rp, R = R, _xadd(R[0],R[1],XD,ZD,Rp[0],Rp[1],n)
+    g = gcd(acc,n)
+    if g == 1 or g == n:
+        return None
+    return g
+
+
+def lenstra_ecm(n, B1 = 11000, curves = 90, B2 = None):
+    """Nontrivial factor of a composite n by Lenstra's elliptic curve method, None on failure"""
+    if B2 is None:
+        B2 = 100*B1
+    D = 2310 if B1 >= 2310 else 210
+    k = _stage_one_exponent(B1)
+    steps = _stage_two_steps(B1,B2,D)
+    for i in range(curves):
+        g = _ecm_curve(n,k,B1,B2,steps,D,randrange(6,n-1))
+        if g is not None:
+            return g
+    return None
+
+
+## Pipeline ##
+
+def find_factor(n):
+    """Nontrivial factor of a composite n, None if every stage fails"""
+    r, e = _perfect_power(n)
+    if e > 1:
+        return r
+    for c in [1,3]:
+        g = brent_rho(n,c)
+        if g is not None:
+            return g
+    g = pollard_pm1(n)
+    if g is not None:
+        return g
+    # A small factor is found far sooner by ECM than by sieving, but once the
+    # tier nearest to a third of the digits of n has failed n is likely a
+    # product of primes of similar size and the rest of the tiers would cost
+    # more than the sieve
+    d = len(str(n))
+    last = min(ECM_SCHEDULE,key=lambda t: abs(t[0]-d*ECM_FRACTION))[0]
+    for digits,B1,curves in ECM_SCHEDULE:
+        if digits > last and d <= QS_MAX_DIGITS:
+            return quadratic_sieve(n)
+        g = lenstra_ecm(n,B1,curves)
+        if g is not None:
+            return g
+    return None
+
+
+def pipeline_factorization(n):
+    """Prime factors of n with multiplicity in increasing order"""
+    if type(n) != int:
+        raise Exception("n must be an integer")
+    if n < 1:
+        raise Exception("n must be positive")
+    if indexed(n):
+        return factor_indexed(n)
+
+    L = []
+    for p in _trial_primes():
+        if n % p == 0:
+            while n % p == 0:
+                L.append(p)
+                n //= p
+    if n == 1:
+        return L
+    if indexed(n):
+        return sorted(L + factor_indexed(n))
+
+    stack = [n]
+    while stack:
+        m = stack.pop()
+        if m == 1:
+            continue
+        if indexed(m):
+            L += factor_indexed(m)
+            continue
+        if is_prime(m):
+            L.append(m)
+            continue
+        g = find_factor(m)
+        if g is None:
+            raise Exception(f"unable to factor {m}")
+        stack += [g,m//g]
+    return sorted(L)
+
+
+
+if __name__ == '__main__':
+    import time
+
+    for n in [2**64+1, 10**20+1, 600851475143*1000000007,
+              1000000007*998244353*1000000009,
+              100000000000000000039*1000000000000000000117,
+              12345678901234619*3000000000000000000000000000000000000037]:
+        t0 = time.time()
+        F = pipeline_factorization(n)
+        print(f"{n} = {' * '.join(str(f) for f in F)}  ({time.time()-t0:.2f}s)")
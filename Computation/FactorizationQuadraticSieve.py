@@ -0,0 +1,407 @@
+from math import gcd, isqrt, log2
+from random import Random
+import numpy as np
+from Computation.PrimeFactorIndex import spf_index
+from PrimeNumbers import is_prime
+
+# The self initializing quadratic sieve. For a polynomial Q(x) = (Ax+B)^2 - kN
+# every value is a square modulo N, so if enough values factor completely
+# over a set of small primes some product of them is a square on both sides
+# and X^2 = Y^2 (mod N) gives a factor as gcd(X-Y,N).
+#
+# sieving      : log2(p) is added at every x where p divides Q(x) and the x
+#                whose total is close to log2|Q(x)| are trial divided
+# polynomials  : A is a product of s primes from the factor base chosen so the
+#                values are as small as possible. Each A gives 2^(s-1) values
+#                of B and moving between them only shifts the sieve roots
+# large primes : a value with one leftover prime that is not too large is
+#                kept and two with the same leftover prime make a relation
+# dependencies : the exponent vectors modulo 2 are Python int bitsets, first
+#                relations with a prime no other relation has are dropped
+#                then Gaussian elimination finds the subsets that sum to zero
+#
+# Polynomials can be sieved in a process pool, each worker handles a batch of
+# values of A and sends back the relations it found.
+
+# (digits, factor base size, sieve half width)
+QS_PARAMETERS = [(15,60,2**13), (20,100,2**15), (25,150,2**15), (30,200,2**16), (35,300,2**17),
+                 (40,500,2**18), (45,700,2**18), (50,1000,2**19), (55,1400,2**19),
+                 (60,2000,2**19), (65,2800,2**20), (70,4000,2**20), (80,6000,2**20)]
+
+# Primes below this are not sieved, their contribution is small and slow, so
+# they are trial divided out of every candidate instead
+SMALL_PRIME = 32
+
+# A leftover factor up to this times the largest prime in the factor base is
+# kept as a large prime
+LARGE_PRIME_MULTIPLIER = 64
+
+# Relations beyond the size of the factor base
+EXTRA_RELATIONS = 16
+
+# Values of A handled by each task
+POLYNOMIALS_PER_TASK = 4
+
+
+def _sqrt_mod(a, p):
+    """Square root of a quadratic residue modulo an odd prime by Tonelli-Shanks"""
+    a %= p
+    if a == 0:
+        return 0
+    if p % 4 == 3:
+        return pow(a,(p+1)//4,p)
+    q, s = p-1, 0
+    while q % 2 == 0:
+        q //= 2
+        s += 1
+    z = 2
+    while pow(z,(p-1)//2,p) != p-1:
+        z += 1
+    m, c, t, r = s, pow(z,q,p), pow(a,q,p), pow(a,(q+1)//2,p)
+    while t != 1:
+        i, t2 = 0, t
+        while t2 != 1:
+            t2 = t2*t2 % p
+            i += 1
+        b = pow(c,1 << (m-i-1),p)
+        m, c, t, r = i, b*b % p, t*b*b % p, r*b % p
+    return r
+
+
+def _parameters(N):
+    digits = len(str(N))
+    for d,F,M in QS_PARAMETERS:
+        if digits <= d:
+            return F, M
+    return QS_PARAMETERS[-1][1:]
+
+
+def _small_primes(count):
+    """At least count odd primes"""
+    N = 2**12
+    while True:
+        spf = spf_index(N)
+        P = np.flatnonzero(spf == np.arange(N+1,dtype=np.uint32))
+        P = P[P > 2]
+        if len(P) >= count:
+            return P.tolist()
+        N *= 4
+
+
+def _multiplier(N):
+    """Knuth-Schroeppel multiplier k so kN has many small quadratic residues"""
+    P = _small_primes(300)
+    best, best_k = None, 1
+    for k in [1,3,5,7,11,13,15,17,19,21,23,29,31,33,35,37,39,41,43,47,51,53,55,57,59,61,65,67,69,71,73]:
+        kN = k*N
+        score = -0.5*log2(k)
+        if kN % 8 == 1:
+            score += 2
+        elif kN % 8 == 5:
+            score += 1
+        else:
+            score += 0.5
+        for p in P:
+            if k % p == 0:
+                score += log2(p)/p
+            elif pow(kN,(p-1)//2,p) == 1:
+                score += 2*log2(p)/(p-1)
+        if best is None or score > best:
+            best, best_k = score, k
+    return best_k
+
+
+def _factor_base(kN, F):
+    """Primes p with kN a square modulo p and a square root of kN modulo each"""
+    P, T = [2], [kN % 2]
+    count = 2*F
+    while len(P) < F:
+        for p in _small_primes(count):
+            if len(P) == F:
+                break
+            if p <= P[-1]:
+                continue
+            r = kN % p
+            if r == 0 or pow(r,(p-1)//2,p) == 1:
+                P.append(p)
+                T.append(_sqrt_mod(r,p))
+        count *= 2
+    return P, T
+
+
+def _choose_A(kN, M, P, T, rng, used):
+    """A product of factor base primes close to sqrt(2kN)/M and its prime indices"""
+    target = isqrt(2*kN) // M
+    # The number of primes s is the smallest that keeps them below 2000, or
+    # below most of the factor base when that is small
+    top = min(2000,P[(3*len(P))//4])
+    s = 1
+    while target ** (1/s) > top:
+        s += 1
+    s = max(s,2)
+    q = target ** (1/s)
+    band = [i for i,p in enumerate(P) if SMALL_PRIME < p and T[i] != 0 and q/2 <= p <= 2*q]
+    if len(band) < s+2:
+        band = [i for i,p in enumerate(P) if SMALL_PRIME < p and T[i] != 0]
+
+    for attempt in range(100):
+        idx = rng.sample(band,s-1)
+        A = 1
+        for i in idx:
+            A *= P[i]
+        # The last prime brings A as close as possible to the target
+        rest = target // A
+        last = min((i for i in range(1,len(P)) if i not in idx and P[i] > SMALL_PRIME and T[i] != 0),
+                   key = lambda i: abs(P[i]-rest))
+        idx.append(last)
+        A *= P[last]
+        key = tuple(sorted(idx))
+        if key not in used:
+            used.add(key)
+            return A, list(key)
+    raise Exception("unable to find a new polynomial")
+
+
+def _sieve_task(args):
+    """Relations from a batch of polynomials, each (Y, exponents by prime index, large prime)"""
+    N, kN, P, T, M, seed, count = args
+    rng = Random(seed)
+    F = len(P)
+    pmax = P[-1]
+    large = pmax*LARGE_PRIME_MULTIPLIER
+
+    p_arr = np.array(P,dtype=np.int64)
+    t_arr = np.array(T,dtype=np.int64)
+    logp = np.round(np.log2(p_arr)).astype(np.uint8).tolist()
+    sieved = [i for i in range(F) if P[i] > SMALL_PRIME]
+    small = [i for i in range(F) if P[i] <= SMALL_PRIME]
+
+    # log2 of the largest value of Q(x)/A, less one large prime and some
+    # slack for the unsieved small primes and rounding
+    thresh = int(log2(M) + log2(kN)/2 - 0.5 - log2(large) - 8)
+
+    relations = []
+    used = set()
+    for poly in range(count):
+        A, Aidx = _choose_A(kN,M,P,T,rng,used)
+        Aset = set(Aidx)
+
+        # B_l = (A/q_l) * (t_l * (A/q_l)^-1 mod q_l) so B^2 = kN modulo A for
+        # every choice of signs in B = sum(+/- B_l)
+        Bl = []
+        for i in Aidx:
+            q = P[i]
+            a = A//q
+            Bl.append(a * (T[i]*pow(a,-1,q) % q))
+        B = sum(Bl)
+
+        ainv = np.zeros(F,dtype=np.int64)
+        for i in range(F):
+            if i not in Aset:
+                ainv[i] = pow(A % P[i],-1,P[i])
+        B2ainv = [np.array([2*b % P[i] * int(ainv[i]) % P[i] for i in range(F)],dtype=np.int64) for b in Bl]
+        Bmod = np.array([B % p for p in P],dtype=np.int64)
+        r1 = ainv * (t_arr - Bmod) % p_arr
+        r2 = ainv * (-t_arr - Bmod) % p_arr
+
+        s = len(Aidx)
+        for i in range(2**(s-1)):
+            if i > 0:
+                # Gray code order so each B differs from the last in the sign
+                # of one B_l and the roots move by 2 B_l / A
+                v = (i & -i).bit_length()-1
+                if (i ^ (i >> 1)) >> v & 1:
+                    B -= 2*Bl[v]
+                    r1 = (r1 + B2ainv[v]) % p_arr
+                    r2 = (r2 + B2ainv[v]) % p_arr
+                else:
+                    B += 2*Bl[v]
+                    r1 = (r1 - B2ainv[v]) % p_arr
+                    r2 = (r2 - B2ainv[v]) % p_arr
+            C = (B*B - kN) // A
+
+            sieve = np.zeros(2*M,dtype=np.uint8)
+            s1 = ((r1 + M) % p_arr).tolist()
+            s2 = ((r2 + M) % p_arr).tolist()
+            for j in sieved:
+                if j in Aset:
+                    continue
+                p, l = P[j], logp[j]
+                sieve[s1[j]::p] += l
+                if s2[j] != s1[j]:
+                    sieve[s2[j]::p] += l
+
+            X = np.flatnonzero(sieve > thresh) - M
+            if len(X) == 0:
+                continue
+
+            # Only the primes with x at one of their roots can divide Q(x)/A,
+            # the small primes are not sieved so they are always tried
+            hit = ((X[:,None] - r1[None,:]) % p_arr[None,:] == 0) | \
+                  ((X[:,None] - r2[None,:]) % p_arr[None,:] == 0)
+            for x,row in zip(X.tolist(),hit):
+                g = (A*x + 2*B)*x + C
+                exps = {}
+                if g < 0:
+                    exps[-1] = 1
+                    g = -g
+                for j in Aidx:
+                    exps[j] = 1
+                for j in small + Aidx + np.flatnonzero(row).tolist():
+                    p = P[j]
+                    while g % p == 0:
+                        g //= p
+                        exps[j] = exps.get(j,0) + 1
+                if g == 1 or pmax < g < large and is_prime(g):
+                    relations.append(((A*x + B) % N,exps,g))
+    return relations
+
+
+def _combine(relations, N):
+    """Full relations plus one for each pair of partial relations with the same large prime"""
+    full = []
+    partial = {}
+    for Y,exps,lp in relations:
+        if lp == 1:
+            full.append((Y,exps,1))
+        elif lp in partial:
+            Y2,exps2,_ = partial[lp]
+            merged = dict(exps)
+            for j,e in exps2.items():
+                merged[j] = merged.get(j,0) + e
+            full.append((Y*Y2 % N,merged,lp))
+        else:
+            partial[lp] = (Y,exps,lp)
+    return full
+
+
+def _remove_singletons(vectors):
+    """Indices of the vectors left after repeatedly dropping any with a prime only it has"""
+    alive = set(range(len(vectors)))
+    while True:
+        count = {}
+        for i in alive:
+            for j in vectors[i]:
+                count[j] = count.get(j,0) + 1
+        drop = {i for i in alive if any(count[j] == 1 for j in vectors[i])}
+        if not drop:
+            return sorted(alive)
+        alive -= drop
+
+
+def gf2_dependencies(rows):
+    """Subsets of a list of bitsets whose XOR is zero, each as a list of indices"""
+    # Each pivot is keyed by its lowest set bit and carries the rows that were
+    # combined to make it
+    pivots = {}
+    deps = []
+    for i,v in enumerate(rows):
+        h = 1 << i
+        while v:
+            low = v & -v
+            if low not in pivots:
+                pivots[low] = (v,h)
+                break
+            pv, ph = pivots[low]
+            v ^= pv
+            h ^= ph
+        else:
+            deps.append([j for j in range(i+1) if h >> j & 1])
+    return deps
+
+
+def _relation_vectors(full, columns):
+    vectors = []
+    for Y,exps,lp in full:
+        vectors.append([columns[j] for j,e in exps.items() if e % 2 == 1])
+    return vectors
+
+
+def quadratic_sieve(N, workers = None, seed = 0):
+    """Nontrivial factor of an odd composite N that is not a perfect power"""
+    if N % 2 == 0:
+        return 2
+    r = isqrt(N)
+    if r*r == N:
+        return r
+
+    k = _multiplier(N)
+    kN = k*N
+    F, M = _parameters(N)
+    P, T = _factor_base(kN,F)
+    for p in P:
+        if N % p == 0 and p != N:
+            return p
+
+    columns = {j:c for c,j in enumerate([-1] + list(range(F)))}
+    relations = []
+    seen = set()
+    need = F + EXTRA_RELATIONS
+    task = seed
+
+    def add(new):
+        for rel in new:
+            key = (rel[0],rel[2])
+            if key not in seen:
+                seen.add(key)
+                relations.append(rel)
+
+    if workers is None:
+        pool = None
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(workers)
+
+    try:
+        while True:
+            if pool is None:
+                add(_sieve_task((N,kN,P,T,M,task,POLYNOMIALS_PER_TASK)))
+                task += 1
+            else:
+                tasks = [(N,kN,P,T,M,task+i,POLYNOMIALS_PER_TASK) for i in range(workers)]
+                task += workers
+                for new in pool.map(_sieve_task,tasks):
+                    add(new)
+
+            full = _combine(relations,N)
+            if len(full) < need:
+                continue
+            # Small N give far more relations than needed from a single task
+            # and the elimination only has to see enough of them
+            full = full[:need]
+
+            vectors = _relation_vectors(full,columns)
+            alive = _remove_singletons(vectors)
+            rows = [sum(1 << c for c in vectors[i]) for i in alive]
+            for dep in gf2_dependencies(rows):
+                X, total, L = 1, {}, 1
+                for d in dep:
+                    Y,exps,lp = full[alive[d]]
+                    X = X*Y % N
+                    L = L*lp % N
+                    for j,e in exps.items():
+                        total[j] = total.get(j,0) + e
+                Z = L
+                for j,e in total.items():
+                    if j != -1:
+                        Z = Z * pow(P[j],e//2,N) % N
+                g = gcd(X-Z,N)
+                if 1 < g < N:
+                    return g
+            # Every dependency was trivial, more relations give new ones
+            need += EXTRA_RELATIONS
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+
+if __name__ == '__main__':
+    import time
+
+    for N in [1000000007*998244353,
+              100000000000000000039*1000000000000000000117,
+              1000000000000000000000007*1000000000000000000000049]:
+        t0 = time.time()
+        g = quadratic_sieve(N)
+        print(f"{N} = {g} * {N//g}  ({time.time()-t0:.2f}s)")
@@ -5,9 +5,14 @@
 # logarithm of the number. Since the logarithm function increases slowly there
 # is not much loss of accuracy from simply finding a nearby smooth number and
 # factoring it.
+#
+# This is only for the ordinary real logarithm. Logarithms modulo m, where the
+# same idea is the basis of index calculus, are in ModularArithmetic.DiscreteLog
+# which uses Pohlig-Hellman with baby step giant step or Pollard's rho.
 
 
-from math import log2, ceil, sqrt
+from math import log2
+from Computation.Factorization import prime_factorization
 
 # A simple method for 
 def simple_root(f,val,tol=.01,max_iter=10000):
@@ -42,29 +47,6 @@ def log_basis(B):
     return D
 
 
-def prime_factorization(n):
-    """Prime Factors with Multiplicity"""
-    if type(n) != int:
-        raise Exception("n must be an integer") 
-    
-    lim = ceil(sqrt(n))+1
-    L = []
-    
-    p = 1
-    while True:
-        p += 1
-        while n % p == 0:
-            L.append(p)
-            n = n // p
-            
-        if n == 1:
-            break
-        
-        if p > lim:
-            L.append(n)
-            break
-    return L
-
 def find_smooth(n,B):
     while True:
         P = prime_factorization(n)
@@ -75,19 +57,16 @@ def find_smooth(n,B):
 
 
 def estimate_log(n,D,B):
-    
-    D = {}
-    for b in B:
-        D[b] = log2(b)
-    
+    """Base 2 logarithm of the nearest B-smooth number at most n, D holds the logs of B"""
     S = find_smooth(n,B)
-    print(S)
     return sum(D[s] for s in S)
 
 
-B = [2,3,5,7,11,13,17,19]
-D = log_basis(B)
-for N in range(800,1500,37):
-    print(estimate_log(N,D,B))
-    print(log2(N))
-    print()
\ No newline at end of file
+
+if __name__ == '__main__':
+    B = [2,3,5,7,11,13,17,19]
+    D = log_basis(B)
+    for N in range(800,1500,37):
+        print(estimate_log(N,D,B))
+        print(log2(N))
+        print()
\ No newline at end of file
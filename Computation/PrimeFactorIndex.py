@@ -0,0 +1,115 @@
+import numpy as np
+
+# A shared table of the smallest prime factor of every n up to some bound.
+# With it any n below the bound factors by repeated division by spf(n) which
+# takes at most log2(n) steps. The table is grown on demand, at least
+# doubling each time, and kept for the life of the process.
+#
+# Large tables can be written to a .npy file and opened again as a read only
+# memory map so several processes share one copy without rebuilding it.
+
+# Size of the index built when a single value is looked up
+INDEX_SIZE = 2**20
+
+# Slices of the table handled at once when finishing a memory mapped build
+CHUNK_SIZE = 2**22
+
+_INDEX = {"N": 0, "spf": None}
+
+
+def _sieve(spf):
+    """Fill an array of zeros with the smallest prime factor of each index"""
+    N = len(spf)-1
+    spf[1:2] = 1
+    spf[2::2] = 2
+    for p in range(3,int(N**0.5)+1,2):
+        if spf[p] == 0:
+            block = spf[p*p::2*p]
+            block[block == 0] = p
+    # Whatever is left is prime, done in pieces so a memory map isn't read
+    # into memory all at once
+    for lo in range(0,N+1,CHUNK_SIZE):
+        seg = spf[lo:lo+CHUNK_SIZE]
+        rest = np.flatnonzero(seg == 0)
+        rest = rest[rest+lo > 1]
+        seg[rest] = rest+lo
+    return spf
+
+
+def build_index(N, path = None):
+    """Smallest prime factor of every n up to N, written to path as .npy if given"""
+    assert N < 2**32, "the index is stored as uint32"
+    if path is None:
+        spf = _sieve(np.zeros(N+1,dtype=np.uint32))
+    else:
+        spf = np.lib.format.open_memmap(path,mode="w+",dtype=np.uint32,shape=(N+1,))
+        _sieve(spf)
+        spf.flush()
+    _INDEX["spf"] = spf
+    _INDEX["N"] = N
+    return spf
+
+
+def save_index(path):
+    """Write the current index to a .npy file"""
+    assert _INDEX["spf"] is not None, "no index has been built"
+    np.save(path,_INDEX["spf"])
+
+
+def load_index(path, mmap = True):
+    """Use an index saved by save_index or build_index, memory mapped by default"""
+    spf = np.load(path,mmap_mode="r" if mmap else None)
+    assert spf.dtype == np.uint32, "not a smallest prime factor index"
+    if len(spf)-1 > _INDEX["N"]:
+        _INDEX["spf"] = spf
+        _INDEX["N"] = len(spf)-1
+    return spf
+
+
+def index_limit():
+    """Largest n covered by the index"""
+    return _INDEX["N"]
+
+
+def spf_index(N):
+    """Smallest prime factor of each n from 0 to N, spf(1) = 1"""
+    if N > _INDEX["N"]:
+        build_index(max(N,2*_INDEX["N"]))
+    return _INDEX["spf"][:N+1]
+
+
+def indexed(n):
+    """Check if n can be factored from the index, building the default one if needed"""
+    return 1 <= n <= max(_INDEX["N"],INDEX_SIZE)
+
+
+def factor_indexed(n):
+    """Prime factors of n with multiplicity, in increasing order"""
+    assert indexed(n), "n is outside the index"
+    spf = spf_index(max(n,INDEX_SIZE)) if n > _INDEX["N"] else _INDEX["spf"]
+    L = []
+    while n > 1:
+        p = int(spf[n])
+        L.append(p)
+        n //= p
+    return L
+
+
+
+if __name__ == '__main__':
+    import os, tempfile, time
+
+    t0 = time.time()
+    spf_index(10**7)
+    print(f"index to 10^7 in {time.time()-t0:.2f}s")
+
+    t0 = time.time()
+    for n in range(10**6,10**6+10**5):
+        factor_indexed(n)
+    print(f"factored 10^5 numbers in {time.time()-t0:.2f}s")
+    print(factor_indexed(9699690))
+
+    path = os.path.join(tempfile.gettempdir(),"spf_index.npy")
+    save_index(path)
+    print(load_index(path)[:20])
+    os.remove(path)
@@ -7,6 +7,9 @@ from Computation.DucciSequence import ducci_step, ducci_sequence, show_ducci_seq
 from Computation.ExponentiationBySquaring import binary_partition, exp_by_squaring
 from Computation.Factorization import factorization, prime_factorization, aliquot_sum, fermats_method, fermat_and_trial, fermats_method_recursive
 from Computation.FactorizationDixon import dixon_factorization
+from Computation.FactorizationQuadraticSieve import quadratic_sieve
+from Computation.FactorizationECM import brent_rho, pollard_pm1, lenstra_ecm, pipeline_factorization
+from Computation.PrimeFactorIndex import spf_index, build_index, save_index, load_index, factor_indexed
 from Computation.FigurateRoots import figurate_root
 from Computation.IteratedLog import iterated_log
 from Computation.KroneckerDelta import kronecker_delta
@@ -23,5 +26,8 @@ __all__=["long_division","long_multiplication","long_multiplication_steps",
          "ducci_step", "ducci_sequence", "show_ducci_sequence",
          "factorization", "prime_factorization", "aliquot_sum", "fermats_method", 
          "fermat_and_trial", "fermats_method_recursive", "dixon_factorization",
+         "brent_rho", "pollard_pm1", "lenstra_ecm", "pipeline_factorization",
+         "quadratic_sieve",
+         "spf_index", "build_index", "save_index", "load_index", "factor_indexed",
          "figurate_root", "iterated_log", "kronecker_delta", "euclidean_triple",
          "subset_sum", "subset_sums", "subset_sum_dynamic"]
\ No newline at end of file
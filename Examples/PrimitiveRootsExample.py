@@ -6,7 +6,7 @@ print("\nOften we are most interested in the natural numbers coprime to and less
 print(f"\nFor example the numbers coprime to {m} are {coprimes(m)}")
 print("\nA related concept is that of primitive roots.")
 print("\nA primitive root modulo some number is one such that its powers modulo that number include all the numbers coprime of that number.")
-r = primitive_roots(m)
+r = sorted(primitive_roots(m))
 print(f"\nThe primitive roots of {m} are {r}")
 
 print()
@@ -1,32 +1,254 @@
-# The discrete log is only guaranteed t exist when b is a primitive root of m
-# (ie when it is a generator)
+from math import gcd, isqrt
+from random import randrange
+from ModularArithmetic.Utils import group_order, element_order
 
-def discrete_log(a,b,m):
-    """integer k such that b^k = a (mod m)"""
+# The discrete log of a to the base b modulo m is a k with b^k = a (mod m). It
+# only exists when a is in the subgroup generated by b and it is guaranteed to
+# exist when b is a primitive root of m (ie when it is a generator).
+#
+# When the order n of b is known along with its factors the Pohlig-Hellman
+# method splits the problem into one for each prime power q^e dividing n, each
+# of which is e logs in a subgroup of prime order q. The answers are combined
+# by the Chinese remainder theorem. So the work depends on the largest prime
+# factor of n rather than on n.
+#
+# Logs in a subgroup of order q are found by baby step giant step using a
+# table of at most TABLE_LIMIT baby steps, the tables are kept so repeated logs
+# to the same base don't rebuild them. Beyond RHO_LIMIT the giant steps alone
+# would take too long and Pollard's rho is used instead, it stores only the
+# distinguished points of its walks so its memory doesn't grow with q.
+
+# Most baby steps stored in one table
+TABLE_LIMIT = 2**20
+
+# Subgroups of prime order above this use Pollard's rho rather than BSGS
+RHO_LIMIT = 2**40
+
+# Number of baby step tables kept, the oldest is dropped first
+CACHED_TABLES = 16
+
+# Number of multipliers in the random walk used by Pollard's rho
+RHO_PARTITIONS = 20
+
+_TABLES = {}
+
+
+def _crt(R, M):
+    """x with x = r (mod q) for each r, q in R, M with the q pairwise coprime"""
+    x, N = 0, 1
+    for r,q in zip(R,M):
+        # x + N*t = r (mod q)
+        t = (r - x) * pow(N,-1,q) % q
+        x += N*t
+        N *= q
+    return x % N
+
+
+def _baby_steps(b, m, size):
+    """Dict from b^j modulo m to j for j below size, cached"""
+    key = (b,m,size)
+    if key in _TABLES:
+        # Move it to the back so the least recently used table goes first
+        _TABLES[key] = _TABLES.pop(key)
+        return _TABLES[key]
+    T = {}
+    x = 1
+    for j in range(size):
+        if x in T:
+            break
+        T[x] = j
+        x = x*b % m
+    _TABLES[key] = T
+    while len(_TABLES) > CACHED_TABLES:
+        del _TABLES[next(iter(_TABLES))]
+    return T
+
+
+def baby_step_giant_step(a, b, m, n = None):
+    """integer k such that b^k = a (mod m), where n is at least the order of b"""
+    if n is None:
+        n = m
+    a %= m
+    size = min(isqrt(n)+1,TABLE_LIMIT)
+    T = _baby_steps(b % m,m,size)
+    # Each giant step multiplies by b^-size, with a smaller table there are
+    # just more of them
+    giant = pow(b,-size,m)
+    y = a
+    for i in range(-(-n // size)):
+        if y in T:
+            return i*size + T[y]
+        y = y*giant % m
+    return None
+
+
+def pollard_rho_log(a, b, m, q, dp_bits = None):
+    """integer k such that b^k = a (mod m), where b has prime order q"""
+    a %= m
+    if dp_bits is None:
+        dp_bits = max(0,q.bit_length()//4 - 2)
+    mask = (1 << dp_bits) - 1
+
+    # Every point of a walk is b^u a^v with u and v known. The walk moves by
+    # one of a few fixed multipliers chosen by the current point
+    steps = [(randrange(q),randrange(q)) for i in range(RHO_PARTITIONS)]
+    mult = [pow(b,u,m) * pow(a,v,m) % m for u,v in steps]
+
+    # Walks from random starts run until they hit a distinguished point. Two
+    # walks that meet go on to the same distinguished point, where the two
+    # different ways of writing it give the log. Give up after many more
+    # walks than should be needed, as happens if a isn't a power of b
+    seen = {}
+    for walk in range(64 + 8*(isqrt(q) >> dp_bits)):
+        u, v = randrange(q), randrange(q)
+        x = pow(b,u,m) * pow(a,v,m) % m
+        for i in range(20 << dp_bits):
+            if (x // RHO_PARTITIONS) & mask == 0:
+                break
+            j = x % RHO_PARTITIONS
+            x = x * mult[j] % m
+            u = (u + steps[j][0]) % q
+            v = (v + steps[j][1]) % q
+        else:
+            # Caught in a cycle with no distinguished point
+            continue
+        if x in seen:
+            u2, v2 = seen[x]
+            # b^u a^v = b^u2 a^v2 so k(v-v2) = u2-u (mod q)
+            if (v-v2) % q != 0:
+                k = (u2-u) * pow(v-v2,-1,q) % q
+                if pow(b,k,m) == a:
+                    return k
+        seen[x] = (u,v)
+    return None
+
+
+def pollard_kangaroo(a, b, m, lo, hi, tries = 4):
+    """integer k with lo <= k <= hi such that b^k = a (mod m), None if not found"""
+    a %= m
+    w = hi - lo
+    # Jumps are powers of two with a mean close to sqrt(w)/2
+    L = 1
+    while (2**L - 1) / L < isqrt(w) / 2:
+        L += 1
+    jumps = [2**i for i in range(L)]
+    powers = [pow(b,s,m) for s in jumps]
+    N = 4 * (2**L - 1) // L
+
+    for salt in range(tries):
+        # The tame kangaroo starts at the top of the interval and leaves a
+        # trap where it stops
+        x, d = pow(b,hi,m), 0
+        for i in range(N):
+            j = (x + salt) % L
+            d += jumps[j]
+            x = x * powers[j] % m
+        trap = x
+
+        # The wild kangaroo starts at a, once it lands where the tame one did
+        # it follows the same path to the trap
+        y, dw = a, 0
+        while dw <= w + d:
+            if y == trap:
+                k = hi + d - dw
+                if pow(b,k,m) == a:
+                    return k
+                break
+            j = (y + salt) % L
+            dw += jumps[j]
+            y = y * powers[j] % m
+    return None
+
+
+def _prime_order_log(h, g, m, q):
+    """Log of h to the base g where g has prime order q"""
+    if h == 1:
+        return 0
+    if q <= RHO_LIMIT:
+        return baby_step_giant_step(h,g,m,q)
+    return pollard_rho_log(h,g,m,q)
+
+
+def pohlig_hellman(a, b, m, F):
+    """integer k such that b^k = a (mod m), where F is the factorization of the order of b as a dict"""
+    n = 1
+    for q,e in F.items():
+        n *= q**e
+    b_inv = pow(b,-1,m)
+    R, M = [], []
+    for q,e in F.items():
+        # gamma has order q, the log modulo q^e is found one digit in base q
+        # at a time
+        gamma = pow(b,n//q,m)
+        x = 0
+        for k in range(e):
+            h = pow(a * pow(b_inv,x,m) % m, n // q**(k+1), m)
+            d = _prime_order_log(h,gamma,m,q)
+            if d is None:
+                return None
+            x += d * q**k
+        R.append(x)
+        M.append(q**e)
+    return _crt(R,M)
+
+
+def discrete_log(a, b, m):
+    """smallest non-negative integer k such that b^k = a (mod m), None if there is none"""
+    if m == 1:
+        return 0
+    a, b = a % m, b % m
+    if gcd(b,m) != 1:
+        raise Exception("b must be coprime to m")
+    if gcd(a,m) != 1:
+        return None
     if a == 1:
         return 0
-    t = 1
-    for k in range(1,m):
-        # To save some work we multiply by b at each step rather than
-        # going to the trouble of calculating b^k each time
-        t = (t*b) % m
-        if t == a:
-            return k
-
-# A much more efficient method
-from math import ceil, sqrt
-def baby_step_giant_step(a,b,m):
-    """integer k such that b^k = a (mod m)"""
-    lim = ceil(sqrt(m))
-    
-    table = {}
-    
-    for j in range(lim):
-        table[pow(b,j,m)] = j
-    
-    c = pow(b,lim*(m-2),m)
-    y = a
-    for i in range(m):
-        y = ( a * pow(c,i,m) ) % m
-        if y in table:
-            return i*lim+table[y]
+
+    phi, F = group_order(m)
+    n, F = element_order(b,m,F)
+    if pow(a,n,m) != 1:
+        return None
+    k = pohlig_hellman(a,b,m,F)
+    if k is None or pow(b,k,m) != a:
+        return None
+    return k
+
+
+
+if __name__ == '__main__':
+    import time
+
+    # Compare against a direct search
+    for m in [101, 1009, 2**11, 3**7, 1000]:
+        for b in [2, 3, 7]:
+            if gcd(b,m) != 1:
+                continue
+            for a in range(1,60):
+                k = discrete_log(a,b,m)
+                powers = [pow(b,j,m) for j in range(m)]
+                expected = powers.index(a % m) if a % m in powers else None
+                assert k == expected, (a,b,m,k,expected)
+    print("agrees with direct search")
+
+    p = 2**127 - 1
+    a = pow(3,12345678901234567890123456789,p)
+    t0 = time.time()
+    k = discrete_log(a,3,p)
+    print(f"3^{k} = a (mod 2^127-1)  ({time.time()-t0:.2f}s)")
+    t0 = time.time()
+    k = discrete_log(a*a % p,3,p)
+    print(f"3^{k} = a^2 (mod 2^127-1) with cached tables  ({time.time()-t0:.2f}s)")
+
+    # 4 has prime order q modulo a safe prime p = 2q+1
+    from PrimeNumbers import is_prime
+    q = 10**9 + 1
+    while not (is_prime(q) and is_prime(2*q+1)):
+        q += 2
+    p = 2*q + 1
+    t0 = time.time()
+    k = pollard_rho_log(pow(4,123456789,p),4,p,q)
+    print(f"rho: 4^{k} = 4^123456789 (mod {p})  ({time.time()-t0:.2f}s)")
+
+    t0 = time.time()
+    k = pollard_kangaroo(pow(5,10**12+12345,2**61-1),5,2**61-1,10**12,10**12+10**8)
+    print(f"kangaroo: {k}  ({time.time()-t0:.2f}s)")
@@ -1,39 +1,101 @@
-from ModularArithmetic import coprimes
+from math import gcd
+from ModularArithmetic.Utils import canonical_factorization, group_order, element_order
 
 # A pimitive root modulo n g^k = a mod n for every a coprime to n
-# Equivalently a primitive root is a generating element of the multiplicative 
+# Equivalently a primitive root is a generating element of the multiplicative
 # group modulo n
+#
+# The order of any a divides phi(m) so it can be found by removing each prime
+# factor q of phi(m) for as long as a^(n/q) = 1 still holds. Then g is a
+# primitive root exactly when g^(phi/q) != 1 for every prime q dividing phi(m).
+# Primitive roots only exist for m = 1, 2, 4, p^k and 2p^k with p an odd prime
+# and then g^k is a primitive root exactly when k is coprime to phi(m).
 
 # Show all the congruences
 def show_congruences(g,m):
-    # choose the width 
+    # choose the width
     W = len(str(m))
-    t = []
+    # Step through the powers by multiplication until they repeat
+    seen = set()
+    pr = 1 % m
     for i in range(m):
-        pr = g**i % m
-        if pr in t:
+        if pr in seen:
             break
-        t.append(pr)
-        print("{}^{:<{}} = {}".format(g,i,W,pr)) 
+        seen.add(pr)
+        print("{}^{:<{}} = {}".format(g,i,W,pr))
+        pr = pr*g % m
     print()
-    
+
+
+def multiplicative_order(a,m):
+    """Smallest positive k with a^k = 1 (mod m)"""
+    if gcd(a,m) != 1:
+        raise Exception("a must be coprime to m")
+    if m == 1:
+        return 1
+    phi, F = group_order(m)
+    return element_order(a % m,m,F)[0]
+
+
+def _has_primitive_root(m):
+    if m in (1,2,4):
+        return True
+    F = canonical_factorization(m)
+    if m % 4 == 0:
+        return False
+    # p^k or 2p^k for an odd prime p
+    return len([p for p in F if p != 2]) == 1
+
+
+def primitive_root(m):
+    """Smallest primitive root modulo m, None if there isn't one"""
+    if m < 1:
+        raise Exception("m must be positive")
+    if m <= 2:
+        return m-1
+    if not _has_primitive_root(m):
+        return None
+    phi, F = group_order(m)
+    # Primitive roots are common so this doesn't have to look far
+    for g in range(2,m):
+        if gcd(g,m) == 1 and all(pow(g,phi//q,m) != 1 for q in F):
+            return g
+
+
 def primitive_roots(m):
-    # List the numbers coprime to m since primitive roots must be coprime and
-    # they must generate the set of all the numbers coprime to m
-    C = coprimes(m)
-    L = []
-    out = []
-    
-    # Try each coprime number and see if it generates the set C
-    # If it does write down that number otherwise try again
-    for g in C:
-#        if g in out:
-#            break
-        for i in range(m):
-            L.append(g**i % m)
-        
-        if set(L) == set(C):
-            out.append(g)
-        L = []
-        
-    return out
+    """Every primitive root modulo m, as powers of the smallest one"""
+    g = primitive_root(m)
+    if g is None:
+        return
+    if m <= 2:
+        yield g
+        return
+    phi = group_order(m)[0]
+    x = 1
+    for k in range(1,phi):
+        x = x*g % m
+        if gcd(k,phi) == 1:
+            yield x
+
+
+
+if __name__ == '__main__':
+    import time
+
+    # Compare against the definition for small moduli
+    for m in range(1,200):
+        C = [a for a in range(m) if gcd(a,m) == 1]
+        expected = [g for g in C if len({pow(g,i,m) for i in range(m)}) == len(C)]
+        assert sorted(primitive_roots(m)) == expected, m
+        for a in C:
+            k = multiplicative_order(a,m)
+            assert pow(a,k,m) == 1 % m and all(pow(a,j,m) != 1 for j in range(1,k))
+    print("agrees with the definition")
+
+    show_congruences(3,7)
+
+    m = 10**12 + 39
+    t0 = time.time()
+    g = primitive_root(m)
+    print(f"primitive root of {m} is {g}, order of 2 is {multiplicative_order(2,m)}  ({time.time()-t0:.3f}s)")
+    print(f"the first few primitive roots as powers of it: {[r for r,i in zip(primitive_roots(m),range(6))]}")
@@ -0,0 +1,177 @@
+import numpy as np
+from Computation.PrimeFactorIndex import spf_index
+
+# Tables of the common multiplicative functions for every n up to N. The
+# smallest prime factor of each n comes from the shared index in
+# Computation.PrimeFactorIndex. Everything else uses the same recurrences
+# as a linear sieve, f(n) from f(n/p) with p = spf(n) depending only on whether
+# p divides n/p, worked out for a whole range of n in each NumPy call.
+#
+# Tables are built once per process and shared. A request for a larger N
+# rebuilds them, with the size at least doubling so repeated growth is cheap.
+
+# Size of the table built when a single value is looked up
+TABLE_SIZE = 2**20
+
+_TABLES = {"N": 0}
+_SIGMA = {}
+
+
+def _peel(spf, k = None):
+    """Multiplicative functions from the smallest prime factors"""
+    N = len(spf)-1
+    dt = np.int32 if N < 2**31 else np.int64
+    phi = np.zeros(N+1,dtype=dt)
+    mu = np.zeros(N+1,dtype=np.int8)
+    omega = np.zeros(N+1,dtype=np.int8)
+    Omega = np.zeros(N+1,dtype=np.int8)
+    phi[1], mu[1] = 1, 1
+    if k is not None:
+        # ppow[n] is the power of spf(n) that exactly divides n
+        sigma = np.zeros(N+1,dtype=np.int64)
+        ppow = np.ones(N+1,dtype=np.int64)
+        sigma[1] = 1
+
+    # Peeling p = spf(n) off n leaves m = n/p which is at most n/2, so every
+    # value for n from a to 2a-1 depends only on values below a
+    a = 2
+    while a <= N:
+        n = np.arange(a,min(2*a,N+1),dtype=np.int64)
+        p = spf[n].astype(np.int64)
+        m = n // p
+        same = spf[m] == p
+        phi[n] = phi[m] * np.where(same,p,p-1)
+        mu[n] = np.where(same,0,-mu[m])
+        omega[n] = omega[m] + ~same
+        Omega[n] = Omega[m] + 1
+        if k is not None:
+            # sigma_k(p^e r) = sigma_k(p^(e-1) r) + p^(ek) sigma_k(r) when p
+            # divides m, otherwise sigma_k(m) (1 + p^k)
+            pk = p**k
+            q = np.where(same,ppow[m]*p,p)
+            ppow[n] = q
+            sigma[n] = np.where(same,sigma[m] + q**k * sigma[n // q],sigma[m]*(1+pk))
+        a *= 2
+
+    tables = {"phi":phi, "mu":mu, "omega":omega, "Omega":Omega}
+    if k is not None:
+        tables["sigma"] = sigma
+    return tables
+
+
+def _ensure(N):
+    if N <= _TABLES["N"]:
+        return
+    N = max(N,2*_TABLES["N"])
+    spf = spf_index(N)
+    _TABLES.update(_peel(spf))
+    _TABLES["spf"] = spf
+    _TABLES["N"] = N
+    _SIGMA.clear()
+
+
+def table_limit():
+    """Largest n covered by the tables built so far"""
+    return _TABLES["N"]
+
+
+def sieve_tables(N):
+    """Dict of arrays spf, phi, mu, omega and Omega indexed by n from 0 to N"""
+    _ensure(N)
+    return {name:_TABLES[name][:N+1] for name in ["spf","phi","mu","omega","Omega"]}
+
+
+def spf_table(N):
+    """Smallest prime factor of each n from 0 to N, spf(1) = 1"""
+    _ensure(N)
+    return _TABLES["spf"][:N+1]
+
+
+def totient_table(N):
+    """Euler's totient of each n from 0 to N"""
+    _ensure(N)
+    return _TABLES["phi"][:N+1]
+
+
+def mobius_table(N):
+    """Mobius function of each n from 0 to N"""
+    _ensure(N)
+    return _TABLES["mu"][:N+1]
+
+
+def omega_table(N):
+    """Number of distinct prime factors of each n from 0 to N"""
+    _ensure(N)
+    return _TABLES["omega"][:N+1]
+
+
+def bigomega_table(N):
+    """Number of prime factors with multiplicity of each n from 0 to N"""
+    _ensure(N)
+    return _TABLES["Omega"][:N+1]
+
+
+def sigma_table(N, k = 1):
+    """Sum of the kth powers of the divisors of each n from 0 to N"""
+    assert k >= 0, "k must be non-negative"
+    _ensure(N)
+    # sigma_k(n) is below zeta(k)*n^k < 2n^k for k > 1
+    assert k <= 1 or 2*_TABLES["N"]**k < 2**63, f"sigma_{k} overflows int64 for N = {_TABLES['N']}"
+    if k not in _SIGMA:
+        _SIGMA[k] = _peel(_TABLES["spf"],k)["sigma"]
+    return _SIGMA[k][:N+1]
+
+
+def _block_primes(hi):
+    """Primes up to sqrt(hi) as a list, enough to sieve any block below hi"""
+    r = int((hi-1)**0.5)+1
+    spf = spf_table(max(r,TABLE_SIZE))
+    primes = np.flatnonzero(spf[:r+1] == np.arange(r+1))
+    return primes[primes > 1].tolist()
+
+
+def totient_block(lo, hi):
+    """Euler's totient of each n with lo <= n < hi"""
+    assert 1 <= lo <= hi, "need 1 <= lo <= hi"
+    if hi-1 <= _TABLES["N"]:
+        return _TABLES["phi"][lo:hi].astype(np.int64)
+
+    # Segmented sieve, each prime up to sqrt(hi) is divided out of its
+    # multiples in the block and what is left of n is one more prime
+    n = np.arange(lo,hi,dtype=np.int64)
+    phi = n.copy()
+    rest = n.copy()
+    for p in _block_primes(hi):
+        start = (-lo) % p
+        if start >= len(n):
+            continue
+        phi[start::p] -= phi[start::p] // p
+        block = rest[start::p]
+        block //= p
+        m = block % p == 0
+        while m.any():
+            block[m] //= p
+            m = block % p == 0
+    big = rest > 1
+    phi[big] -= phi[big] // rest[big]
+    return phi
+
+
+def mobius_block(lo, hi):
+    """Mobius function of each n with lo <= n < hi"""
+    assert 1 <= lo <= hi, "need 1 <= lo <= hi"
+    if hi-1 <= _TABLES["N"]:
+        return _TABLES["mu"][lo:hi].copy()
+
+    # Segmented sieve, a square of a prime up to sqrt(hi) makes mu zero and
+    # otherwise what isn't accounted for by those primes is one more prime
+    mu = np.ones(hi-lo,dtype=np.int8)
+    prod = np.ones(hi-lo,dtype=np.int64)
+    for p in _block_primes(hi):
+        start = (-lo) % p
+        mu[start::p] *= -1
+        prod[start::p] *= p
+        mu[(-lo) % (p*p)::p*p] = 0
+    n = np.arange(lo,hi,dtype=np.int64)
+    mu[prod < n] *= -1
+    return mu
\ No newline at end of file
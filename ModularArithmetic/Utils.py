@@ -1,6 +1,8 @@
+import math
+import numpy as np
 from Computation.Factorization import factorization, prime_factorization
 from PrimeNumbers import is_prime
-from Sequences import primes
+from ModularArithmetic.SieveTables import TABLE_SIZE, table_limit, totient_table
 
 # Extended Euclidean algorithm
 # Very useful for a bunch of functions in modular arithmetic
@@ -8,35 +10,80 @@ from Sequences import primes
 # x,y : integers such that g = ax + by
 def egcd(a, b):
     """Extended Euclidean Algorithm"""
-    if a == 0:
-        return (b, 0, 1)
-    else:
-        g, y, x = egcd(b % a, a)
-        return (g, x - (b // a) * y, y)
+    # Same sequence of remainders as the recursive definition, the Bezout
+    # coefficients are carried forward instead of built on the way back up
+    x0, y0, x1, y1 = 1, 0, 0, 1
+    while a != 0:
+        q = b // a
+        a, b = b - q*a, a
+        x0, x1 = x1 - q*x0, x0
+        y0, y1 = y1 - q*y0, y0
+    return (b, x1, y1)
+
+
+# Lists of integers are passed to math.gcd and math.lcm this many at a time
+TREE_THRESHOLD = 64
+
+
+def _is_int_array(L):
+    return type(L) == np.ndarray and np.issubdtype(L.dtype,np.integer)
+
+
+def _gcd_list(L):
+    """GCD of a list or array of integers"""
+    # A running gcd drops to a small number almost immediately after which
+    # every step is cheap, so unlike lcm there is nothing to gain from a tree
+    if _is_int_array(L):
+        return int(np.gcd.reduce(L)) if len(L) else 0
+    if all(type(a) == int for a in L):
+        # math.gcd takes any number of arguments but once the result is 1 the
+        # rest of the list doesn't matter
+        g = 0
+        for i in range(0,len(L),TREE_THRESHOLD):
+            g = math.gcd(g,*L[i:i+TREE_THRESHOLD])
+            if g == 1:
+                break
+        return g
+    g = L[0]
+    for a in L[1:]:
+        g = egcd(a,g)[0]
+    return g
+
+
+def _lcm_list(L):
+    """LCM of a list or array of integers"""
+    if _is_int_array(L):
+        L = L.tolist()
+    L = list(L)
+    if len(L) == 0:
+        return 1
+    # Combining neighbours keeps the numbers in each round about the same size
+    # which is much faster than one huge running product
+    while len(L) > TREE_THRESHOLD:
+        nxt = [math.lcm(a,b) for a,b in zip(L[::2],L[1::2])]
+        if len(L) % 2 == 1:
+            nxt.append(L[-1])
+        L = nxt
+    return math.lcm(*L)
+
 
 # Determine the greatest common denominator for a set of integers
 def gcd(*args):
     """Greatest Common Denominator"""
 
     # Handle the case that a list is provided
-    if len(args) == 1 and type(args[0]) is list:
-        return gcd(*args[0])
+    if len(args) == 1 and (type(args[0]) is list or type(args[0]) is np.ndarray):
+        return _gcd_list(args[0])
     
     # the gcd of a number with itself is iself
     if len(args) == 1:
         return args[0]
     
     # calculate gcd for two numbers
-    if len(args) == 2:
-        a = args[0]
-        b = args[1]
-        g,x,y = egcd(a,b)
-        return g
+    if len(args) == 2 and type(args[0]) == int and type(args[1]) == int:
+        return math.gcd(args[0],args[1])
     
-    # if more than two break it up recursively
-    a = gcd(*args[0:2])
-    b = gcd(*args[2:])
-    return gcd(a,b)
+    return _gcd_list(list(args))
 
 
 # Determine the least common multiple for a set of integers
@@ -44,8 +91,8 @@ def lcm(*args):
     """Least Common Multiple"""
     
     # Handle the case that a list is provided
-    if len(args) == 1 and type(args[0]) is list:
-        return lcm(*args[0])
+    if len(args) == 1 and (type(args[0]) is list or type(args[0]) is np.ndarray):
+        return _lcm_list(args[0])
     
     # the lcm of a number with itself is iself
     if len(args) == 1:
@@ -53,38 +100,58 @@ def lcm(*args):
     
     # calculate lcm for two numbers
     if len(args) == 2:
-        a = args[0]
-        b = args[1]
-        g,x,y = egcd(a,b)
-        return abs(a*b)//g
+        return math.lcm(args[0],args[1])
     
-    # if more than two break it up recursively
-    a = lcm(*args[0:2])
-    b = lcm(*args[2:])
-    return lcm(a,b)
+    return _lcm_list(list(args))
 
 
-# Use egcd to calculate the modular multiplicative inverse
+# Use pow to calculate the modular multiplicative inverse
 def modinv(a, m):
     """Modular Multiplicative Inverse"""
+    # NumPy integers are converted since pow only takes Python ints here
+    try:
+        return pow(int(a),-1,int(m))
+    except ValueError:
+        raise Exception('modular inverse does not exist')
+
+
+# Montgomery's trick, inverting n numbers costs one inverse and 3(n-1)
+# multiplications
+def batch_modinv(L, m):
+    """Modular Multiplicative Inverse of every element of a list"""
+    if len(L) == 0:
+        return []
     
-    a = a % m
+    # prefix[i] is the product of the first i+1 elements
+    prefix = [0]*len(L)
+    acc = 1
+    for i,a in enumerate(L):
+        acc = acc * a % m
+        prefix[i] = acc
     
-    g, x, y = egcd(a, m)
-    if g != 1:
-        raise Exception('modular inverse does not exist')
-    else:
-        return x % m
+    inv = modinv(acc,m)
+    
+    # Walk back down, peeling one element off the inverse of the product at
+    # each step
+    out = [0]*len(L)
+    for i in range(len(L)-1,0,-1):
+        out[i] = inv * prefix[i-1] % m
+        inv = inv * L[i] % m
+    out[0] = inv
+    return out
 
 
 # Calculate the numbers coprime to some modulus m
 def coprimes(m):
     """Numbers Coprime to Input"""
-    L = []
-    for i in range(1,m):
-        if gcd(i,m) == 1:
-            L.append(i)
-    return L
+    if m < 1:
+        return []
+    # Cross out the multiples of each prime factor of m
+    mask = np.ones(m,dtype=bool)
+    mask[0] = False
+    for p in sorted(set(prime_factorization(m))):
+        mask[::p] = False
+    return np.flatnonzero(mask).tolist()
 
 
 # Check if two numbers are coprime
@@ -117,19 +184,60 @@ def pairwise_coprime(*args):
 # Count of naturals coprime to n
 def totient(n):
     """Euler's Totient Function"""
+    if n < 1:
+        raise Exception("n must be positive")
+    if n <= table_limit() or n <= TABLE_SIZE:
+        return int(totient_table(max(n,TABLE_SIZE))[n])
+    
     N = 1
     D = 1
-    for p in primes():
-        if p > n:
-            break
-        
-        if n % p == 0:
-            N *= (p-1)
-            D *= p
+    for p in sorted(set(prime_factorization(n))):
+        N *= (p-1)
+        D *= p
     
     return n*N//D
 
 
+def canonical_factorization(n):
+    """Prime factorization as a dict of exponents"""
+    F = {}
+    for p in prime_factorization(n):
+        F[p] = F.get(p,0) + 1
+    return F
+
+
+# The multiplicative group modulo m has order phi(m), factoring it only needs
+# the factors of m and of each p-1
+def group_order(m):
+    """Order of the multiplicative group modulo m and its prime factorization as a dict"""
+    phi, F = 1, {}
+    for p,e in canonical_factorization(m).items():
+        phi *= p**(e-1) * (p-1)
+        if e > 1:
+            F[p] = F.get(p,0) + e-1
+        if p > 2:
+            for q,k in canonical_factorization(p-1).items():
+                F[q] = F.get(q,0) + k
+    return phi, F
+
+
+# Remove each prime from a multiple of the order for as long as b to that
+# power is still 1
+def element_order(b, m, F):
+    """Order of b modulo m and its factorization, given the factorization F of a multiple of it"""
+    n = 1
+    for p,e in F.items():
+        n *= p**e
+    out = {}
+    for p,e in F.items():
+        while e > 0 and pow(b,n//p,m) == 1:
+            n //= p
+            e -= 1
+        if e > 0:
+            out[p] = e
+    return n, out
+
+
 def legendre_symbol(a,p):
     """The Legendre Symbol"""
     assert is_prime(p)
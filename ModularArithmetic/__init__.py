@@ -1,10 +1,21 @@
-from ModularArithmetic.Utils import egcd, gcd, lcm, modinv, coprimes, legendre_symbol,\
-                                    jacobi_symbol, kronecker_symbol, totient, \
-                                    coprime, setwise_coprime, pairwise_coprime
-from ModularArithmetic.PrimitiveRoot import primitive_roots, show_congruences
+from ModularArithmetic.Utils import egcd, gcd, lcm, modinv, batch_modinv, coprimes, \
+                                    legendre_symbol, jacobi_symbol, kronecker_symbol, totient, \
+                                    coprime, setwise_coprime, pairwise_coprime, \
+                                    canonical_factorization, group_order, element_order
+from ModularArithmetic.SieveTables import sieve_tables, spf_table, totient_table, mobius_table, \
+                                          omega_table, bigomega_table, sigma_table, totient_block, \
+                                          mobius_block
+from ModularArithmetic.DiscreteLog import discrete_log, baby_step_giant_step, pollard_rho_log, \
+                                          pollard_kangaroo, pohlig_hellman
+from ModularArithmetic.PrimitiveRoot import multiplicative_order, primitive_root, primitive_roots, \
+                                            show_congruences
 from ModularArithmetic.QuadraticResidue import quad_residue, find_quad_residue, residue_points
 
-__all__=["egcd","gcd","lcm","modinv","coprimes","primitive_roots","quad_residue",
-         "find_quad_residue","show_congruences","residue_points",
+__all__=["egcd","gcd","lcm","modinv","batch_modinv","coprimes","primitive_roots","quad_residue",
+         "multiplicative_order","primitive_root","find_quad_residue","show_congruences","residue_points",
          "legendre_symbol","jacobi_symbol","kronecker_symbol", "totient",
-         "coprime", "setwise_coprime","pairwise_coprime"]
\ No newline at end of file
+         "coprime", "setwise_coprime","pairwise_coprime",
+         "canonical_factorization","group_order","element_order",
+         "sieve_tables","spf_table","totient_table","mobius_table","omega_table",
+         "bigomega_table","sigma_table","totient_block","mobius_block",
+         "discrete_log","baby_step_giant_step","pollard_rho_log","pollard_kangaroo","pohlig_hellman"]
\ No newline at end of file
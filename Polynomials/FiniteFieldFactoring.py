@@ -0,0 +1,374 @@
+import numpy as np
+from random import randrange
+from PrimeNumbers import is_prime
+from Polynomials.PolynomialType import Polynomial
+from Polynomials.PolynomialGCD import poly_gcd_modp
+from Polynomials.PolyDivision import PolyModulus, long_divmod
+from Polynomials.PolyArray import ARRAY_MODULUS_LIMIT, SPLIT_LENGTH, delay_length, \
+                                  array_mult
+from Polynomials.PolyUtils import poly_trim, poly_monic
+
+# Every polynomial over GF(p) factors into irreducibles and there are fast
+# randomized algorithms to find them. This takes three steps.
+#
+# squarefree     : split off repeated factors using gcd(F, F')
+# distinct degree: x^(p^d) - x is the product of every monic irreducible whose
+#                  degree divides d so gcd(F, x^(p^d) - x) collects the factors
+#                  of degree d once the smaller ones are removed
+# equal degree   : Cantor and Zassenhaus, for a random A the polynomial
+#                  A^((p^d-1)/2) - 1 is divisible by about half of the degree d
+#                  factors so taking the gcd with F usually splits it
+#
+# The work is all powers of polynomials modulo F. Since A(x)^p = A(x^p) over
+# GF(p) the pth power is linear in the coefficients of A and is a product with
+# the matrix whose rows are x^(ip) mod F, which is computed once per F.
+#
+# Residues modulo F are kept in NumPy arrays, int64 when p is small enough for
+# the array backend and Python ints otherwise. Everything else is a list of
+# coefficients and goes through poly_gcd_modp and long_divmod.
+
+# For our purposes polynomials will be in ASCENDING order, same as PolyUtils
+
+# Number of steps of the distinct degree factorization that share one gcd
+DDF_BLOCK = 8
+
+
+
+def _dtype(p):
+    return np.int64 if p < ARRAY_MODULUS_LIMIT else object
+
+
+def _array(P, p):
+    return np.array([c % p for c in P],dtype=_dtype(p))
+
+
+def _list(A):
+    """Array of coefficients to a list of ints without trailing zeros"""
+    return poly_trim(A.tolist())
+
+
+def _convolve(A, B, p):
+    if p < ARRAY_MODULUS_LIMIT:
+        return array_mult(A,B,p)
+    return np.convolve(A,B) % p
+
+
+def _matvec(v, M, p):
+    """Product of a vector and a matrix modulo p without overflowing int64"""
+    if p >= ARRAY_MODULUS_LIMIT:
+        return v.dot(M) % p
+    if delay_length(p) > len(v):
+        return v.dot(M) % p
+    # Same split into 16 bit halves as array_mult
+    out = np.zeros(M.shape[1],dtype=np.int64)
+    for i in range(0,len(v),SPLIT_LENGTH):
+        w, N = v[i:i+SPLIT_LENGTH], M[i:i+SPLIT_LENGTH]
+        lo = w.dot(N & 0xFFFF) % p
+        hi = w.dot(N >> 16) % p
+        out = (out + lo + (hi << 16)) % p
+    return out
+
+
+def _quotient(A, B, p):
+    """Exact quotient of two lists"""
+    return long_divmod(A,B,p)[0]
+
+
+def _degree(A):
+    if len(A) == 1 and A[0] == 0:
+        return -1
+    return len(A)-1
+
+
+
+class FrobeniusMap(PolyModulus):
+    """PolyModulus for a monic F over GF(p) on arrays of coefficients with a fast pth power"""
+
+    def __init__(self,F,p):
+        PolyModulus.__init__(self,poly_monic(poly_trim(F),p),p)
+        self.n = n = self.degree()
+        assert n >= 1, "F must not be constant"
+        low = _array(self.F[:n],p)
+
+        # Row j holds x^(n+j) mod F so reducing a product of two reduced
+        # polynomials is a single product with this matrix
+        T = np.zeros((max(n-1,1),n),dtype=_dtype(p))
+        T[0] = (-low) % p
+        for j in range(1,n-1):
+            # Multiply by x and replace the x^n term
+            T[j,1:] = T[j-1,:-1]
+            T[j] = (T[j] - T[j-1,-1]*low) % p
+        self.T = T
+
+        # Row i holds x^(ip) mod F
+        xp = self.powmod(self.x(),p)
+        Q = np.zeros((n,n),dtype=_dtype(p))
+        Q[0,0] = 1
+        for i in range(1,n):
+            Q[i] = self.mulmod(Q[i-1],xp)
+        self.Q = Q
+
+
+    def __repr__(self):
+        return f"FrobeniusMap({self.F}, {self.modulus})"
+
+
+    def x(self):
+        """The polynomial x reduced by F"""
+        return self.reduce([0,1])
+
+
+    def one(self):
+        return self.reduce([1])
+
+
+    def reduce(self,A):
+        """Reduce a list or array of coefficients by F, the result is always an array of length n"""
+        n, p = self.n, self.modulus
+        if len(A) <= n:
+            out = np.zeros(n,dtype=_dtype(p))
+            out[:len(A)] = A
+            return out % p
+        if type(A) == list:
+            A = _array(A,p)
+        if len(A) <= 2*n-1:
+            return (A[:n] + _matvec(A[n:],self.T[:len(A)-n],p)) % p
+        return self.reduce(PolyModulus.reduce(self,_list(A % p)))
+
+
+    def mulmod(self,A,B):
+        """Product of two reduced polynomials reduced by F"""
+        return self.reduce(_convolve(A,B,self.modulus))
+
+
+    def frobenius(self,A,k=1):
+        """A^(p^k) for a reduced polynomial A"""
+        for i in range(k):
+            A = _matvec(A,self.Q,self.modulus)
+        return A
+
+
+
+def squarefree_factorization(P, p):
+    """Squarefree monic factors of P over GF(p) with their multiplicities"""
+    F = poly_trim([c % p for c in P])
+    if len(F) == 1:
+        return []
+    return _squarefree(poly_monic(F,p),p)
+
+
+def _squarefree(F, p):
+    # The factors of multiplicity i are split off one at a time from the
+    # part W that is coprime to the derivative. Multiplicities that are
+    # divisible by p vanish in the derivative and are handled by taking
+    # the pth root of what is left.
+    out = []
+    D = poly_trim([i*c % p for i,c in enumerate(F)][1:])
+    C = poly_gcd_modp(F,D,p)
+    W = _quotient(F,C,p)
+    i = 1
+    while len(W) > 1:
+        Y = poly_gcd_modp(W,C,p)
+        Z = _quotient(W,Y,p)
+        if len(Z) > 1:
+            out.append((Z,i))
+        W = Y
+        C = _quotient(C,Y,p)
+        i += 1
+
+    if len(C) > 1:
+        # Only powers of x^p remain in C
+        root = C[::p]
+        for G,k in _squarefree(root,p):
+            out.append((G,k*p))
+    return out
+
+
+def distinct_degree_factorization(P, p):
+    """Split a squarefree monic P into pairs (G,d) where G is the product of every irreducible factor of degree d"""
+    F = poly_monic(poly_trim([c % p for c in P]),p)
+    return _distinct_degree(F,p)
+
+
+def _distinct_degree(F, p, M = None):
+    n = len(F)-1
+    if n <= 0:
+        return []
+    if M is None:
+        M = FrobeniusMap(F,p)
+
+    out = []
+    x = M.x()
+    H = x
+    i = 0
+    # Products of several x^(p^d) - x are taken before each gcd, a factor is
+    # only looked for one degree at a time when the block finds something
+    while 2*(i+1) <= _degree(F):
+        start = i
+        Hs = []
+        prod = M.one()
+        while len(Hs) < DDF_BLOCK and 2*(i+1) <= _degree(F):
+            i += 1
+            H = M.frobenius(H)
+            Hs.append(H)
+            prod = M.mulmod(prod,(H-x) % p)
+        G = poly_gcd_modp(F,_list(prod),p)
+        if len(G) == 1:
+            continue
+        for k,Hk in enumerate(Hs,start+1):
+            Gk = poly_gcd_modp(G,_list((Hk-x) % p),p)
+            if len(Gk) > 1:
+                out.append((Gk,k))
+                G = _quotient(G,Gk,p)
+                F = _quotient(F,Gk,p)
+            if len(G) == 1:
+                break
+
+    if _degree(F) > 0:
+        out.append((F,_degree(F)))
+    return out
+
+
+def equal_degree_factorization(P, d, p):
+    """Irreducible factors of a squarefree monic P whose factors all have degree d"""
+    F = poly_monic(poly_trim([c % p for c in P]),p)
+    return sorted(_equal_degree(F,d,p))
+
+
+def _equal_degree(F, d, p, M = None):
+    n = len(F)-1
+    if n == d:
+        return [F]
+    if M is None:
+        M = FrobeniusMap(F,p)
+
+    # Every random A gives a B that splits each pending factor with
+    # probability about 1/2, the same B is tried on all of them
+    done = []
+    todo = [F]
+    while todo:
+        A = np.array([randrange(p) for i in range(n)],dtype=_dtype(p))
+        if p == 2:
+            # The trace A + A^2 + A^4 + ... + A^(2^(d-1)) is 0 or 1 modulo
+            # each factor
+            B = A
+            T = A
+            for i in range(d-1):
+                T = M.frobenius(T)
+                B = (B + T) % p
+        else:
+            # (p^d-1)/2 = (p-1)/2 * (1 + p + ... + p^(d-1))
+            T = M.powmod(A,(p-1)//2)
+            B = T
+            for i in range(d-1):
+                T = M.frobenius(T)
+                B = M.mulmod(B,T)
+            B = B.copy()
+            B[0] = (B[0]-1) % p
+        B = _list(B)
+
+        pending = []
+        for G in todo:
+            S = poly_gcd_modp(G,B,p)
+            if 0 < _degree(S) < _degree(G):
+                parts = [S,_quotient(G,S,p)]
+            else:
+                parts = [G]
+            for H in parts:
+                if _degree(H) == d:
+                    done.append(H)
+                else:
+                    pending.append(H)
+        todo = pending
+    return done
+
+
+def factor_modp(P, p = 0):
+    """Leading coefficient and the monic irreducible factors of P over GF(p) with their multiplicities"""
+    # Accept a Polynomial as well as a list of coefficients
+    as_poly = hasattr(P,"coef")
+    if as_poly:
+        p = P.modulus
+        P = P.coef
+    assert is_prime(p), "p must be prime"
+
+    F = poly_trim([c % p for c in P])
+    lead = F[-1]
+    out = []
+    if len(F) == 1:
+        return lead, out
+    for S,k in _squarefree(poly_monic(F,p),p):
+        M = FrobeniusMap(S,p) if len(S) > 2 else None
+        for G,d in _distinct_degree(S,p,M):
+            for H in _equal_degree(G,d,p,M if len(G) == len(S) else None):
+                out.append((H,k))
+    out.sort(key = lambda f: (len(f[0]),f[0][::-1],f[1]))
+
+    if as_poly:
+        return lead, [(Polynomial(F,p),k) for F,k in out]
+    return lead, out
+
+
+def is_irreducible(P, p = 0):
+    """Rabin's test for the irreducibility of P over GF(p)"""
+    if hasattr(P,"coef"):
+        p = P.modulus
+        P = P.coef
+    F = poly_trim([c % p for c in P])
+    n = len(F)-1
+    if n <= 0:
+        return False
+    if n == 1:
+        return True
+
+    # F of degree n is irreducible exactly when x^(p^n) = x mod F and
+    # x^(p^(n/r)) - x is coprime to F for every prime r dividing n
+    M = FrobeniusMap(F,p)
+    x = M.x()
+    divisors = [n//r for r in range(2,n+1) if n % r == 0 and is_prime(r)]
+    H = x
+    k = 0
+    for e in sorted(divisors):
+        H = M.frobenius(H,e-k)
+        k = e
+        if len(poly_gcd_modp(M.F,_list((H-x) % p),p)) > 1:
+            return False
+    H = M.frobenius(H,n-k)
+    return np.array_equal(H % p,x)
+
+
+
+if __name__ == '__main__':
+    import time
+    from Polynomials.PolynomialFactoring import poly_factor_1L
+
+    P = Polynomial([1,0,1,0,0,1,1],2)
+    print(P)
+    for F,k in factor_modp(P)[1]:
+        print(f"  ({F})^{k}")
+
+    # Throughput on random polynomials of degree 50
+    p = 65537
+    polys = [[randrange(p) for i in range(50)] + [1] for j in range(200)]
+    t0 = time.perf_counter()
+    for P in polys:
+        factor_modp(P,p)
+    t = time.perf_counter()-t0
+    print(f"\ndegree 50 modulo {p}: {len(polys)/t:.0f} polynomials per second")
+
+    # Against the search for integer factors in PolynomialFactoring, finding
+    # the factors of a product of small integer polynomials modulo a large
+    # prime
+    p = 1000003
+    tests = [[-6,1,1],[2,-3,1],[6,5,1,0,0,1],[-20,6,2,12],[3,0,-7,0,2,0,1]]
+    for L in tests:
+        P = Polynomial(L[:])
+        t0 = time.perf_counter()
+        old = poly_factor_1L(P)
+        t_old = time.perf_counter()-t0
+        t0 = time.perf_counter()
+        new = factor_modp(Polynomial(L[:],p))
+        t_new = time.perf_counter()-t0
+        print(f"\n{P}")
+        print(f"  PolynomialFactoring  {t_old*1000:8.3f} ms  {old}")
+        print(f"  factor_modp          {t_new*1000:8.3f} ms  {[str(F) for F,k in new[1]]}")
@@ -1,12 +1,508 @@
+import numpy as np
+from PrimeNumbers import is_prime
 from Polynomials.PolynomialType import Polynomial
+from Polynomials.PolyMultiplication import poly_mult
+from Polynomials.PolyDivision import PolyModulus, poly_powmod
+from Polynomials.FiniteFieldFactoring import is_irreducible
+from ModularArithmetic import canonical_factorization
 
-# Examples of finite field of prime power order
-# MAYBE?
+# The finite field GF(p^n) can be represented by polynomials over GF(p) taken
+# modulo an irreducible polynomial of degree n. Here each element is packed
+# into a single integer by treating its coefficients as base p digits, so
+# x^2 + 2 in GF(3^3) is stored as 1*9 + 0*3 + 2 = 11.
+#
+# For small fields every nonzero element is a power of a generator g. Storing
+# the tables exp[i] = g^i and log[g^i] = i turns multiplication, division and
+# inversion into lookups. The Zech logarithm, defined by g^Z(k) = 1 + g^k, does
+# the same for addition since a + b = a*(1 + b/a).
 
-A = Polynomial([2,1],3)
-B = Polynomial([2,1],3)
-P = Polynomial([-1,-1,0,1],3)
-print(P)
-for i in range(14):
-    print(A.coef)
-    A = (A * B)%P
\ No newline at end of file
+# Fields with at most this many elements get log tables
+TABLE_LIMIT = 2**16
+
+
+class GF:
+    """The finite field with p^n elements"""
+
+    def __init__(self,p,n=1,modulus=None):
+        assert is_prime(p), "p must be prime"
+        assert n >= 1, "n must be positive"
+        self.p = p
+        self.n = n
+        self.order = p**n
+        self.powers = [p**i for i in range(n+1)]
+
+        if modulus is None:
+            modulus = self._find_modulus()
+        elif hasattr(modulus,"coef"):
+            modulus = modulus.coef
+        modulus = [c % p for c in modulus]
+        assert len(modulus) == n+1 and modulus[-1] != 0, f"modulus must have degree {n}"
+
+        # Make the modulus monic
+        inv = pow(modulus[-1],-1,p)
+        self.modulus = [c*inv % p for c in modulus]
+        self.R = PolyModulus(self.modulus,p)
+        if not self._is_irreducible(self.modulus):
+            raise Exception(f"{Polynomial(self.modulus,p)} is not irreducible")
+
+        # For GF(2^n) the modulus without its leading term is used as a mask
+        self.mask = self.pack(self.modulus[:n])
+
+        self.exp_table = None
+        self.log_table = None
+        self._zech = None
+        if self.order <= TABLE_LIMIT:
+            self._build_tables()
+
+
+    def __str__(self):
+        if self.n == 1:
+            return f"GF({self.p})"
+        return f"GF({self.p}^{self.n})"
+
+
+    def __repr__(self):
+        return f"GF({self.p}, {self.n}, {self.modulus})"
+
+
+    def __len__(self):
+        """Number of elements"""
+        return self.order
+
+
+    def __eq__(self,other):
+        if type(other) != GF:
+            return False
+        return self.p == other.p and self.modulus == other.modulus
+
+
+    def __hash__(self):
+        return hash((self.p,tuple(self.modulus)))
+
+
+    def __call__(self,a):
+        """Element of the field from a packed int, list of coefficients or Polynomial"""
+        if type(a) == GFElement:
+            assert a.field == self, "element belongs to a different field"
+            return a
+        if hasattr(a,"coef"):
+            a = a.coef
+        if type(a) == list:
+            a = self.pack(self.R.reduce([c % self.p for c in a]))
+        elif self.n == 1:
+            a = a % self.p
+        assert 0 <= a < self.order, f"{a} is not an element of {self}"
+        return GFElement(self,a)
+
+
+    def __iter__(self):
+        for a in range(self.order):
+            yield GFElement(self,a)
+
+
+    ## Conversions ##
+
+    def pack(self,L):
+        """Pack a list of coefficients into an int"""
+        return sum(c*pw for c,pw in zip(L,self.powers))
+
+
+    def unpack(self,a):
+        """Unpack an int into a list of n coefficients"""
+        out = []
+        for i in range(self.n):
+            a,r = divmod(a,self.p)
+            out.append(r)
+        return out
+
+
+    def to_poly(self,a):
+        """Polynomial representing an element"""
+        return Polynomial(self.unpack(int(a)),self.p)
+
+
+    ## Setup ##
+
+    def _find_modulus(self):
+        """Smallest monic irreducible polynomial of degree n"""
+        # When the field will get tables the polynomial should also be
+        # primitive, so that x is a generator and the tables are quick to build
+        p, n = self.p, self.n
+        primitive = n > 1 and self.order <= TABLE_LIMIT
+        for c in range(p**n):
+            L = self._unpack_digits(c,n) + [1]
+            # Skip anything with a root at zero, which covers most of the
+            # reducible polynomials for small p
+            if L[0] == 0 and n > 1:
+                continue
+            if self._is_irreducible(L):
+                if primitive:
+                    R = PolyModulus(L,p)
+                    if any(poly_powmod([0,1],(self.order-1)//r,R) == [1] for r in canonical_factorization(self.order-1)):
+                        continue
+                return L
+
+
+    def _unpack_digits(self,a,k):
+        out = []
+        for i in range(k):
+            a,r = divmod(a,self.p)
+            out.append(r)
+        return out
+
+
+    def _is_irreducible(self,F):
+        """Rabin's test for the irreducibility of F over GF(p)"""
+        return is_irreducible(F,self.p)
+
+
+    def _build_tables(self):
+        """Find a generator and build the exp and log tables"""
+        q = self.order
+
+        # The polynomial x is tried first since multiplying by it is cheap
+        # and it is very often a generator
+        for g in [self.p] + list(range(1,q)):
+            if g < q and self._is_generator(g):
+                break
+        else:
+            raise Exception(f"no generator found for {self}")
+        self.generator = g
+
+        # When the generator is x each step is a shift of the digits followed
+        # by subtracting a multiple of the modulus for the digit that fell off
+        if g == self.p and self.n > 1:
+            top = self.powers[self.n-1]
+            carry = [self.pack([-t*c % self.p for c in self.modulus[:self.n]]) for t in range(self.p)]
+            step = lambda a: self.add(a % top * self.p,carry[a//top])
+        else:
+            step = lambda a: self._mul_slow(a,g)
+
+        exp_table = np.zeros(2*(q-1),dtype=np.int64)
+        a = 1
+        for i in range(q-1):
+            exp_table[i] = a
+            a = step(a)
+        exp_table[q-1:] = exp_table[:q-1]
+
+        # log of zero is undefined so -1 marks it
+        log_table = np.full(q,-1,dtype=np.int64)
+        log_table[exp_table[:q-1]] = np.arange(q-1)
+
+        self.exp_table = exp_table
+        self.log_table = log_table
+        self._exp = exp_table.tolist()
+        self._log = log_table.tolist()
+
+
+    def _is_generator(self,g):
+        """Check if g has multiplicative order p^n - 1"""
+        q = self.order
+        if q == 2:
+            return g == 1
+        for r in canonical_factorization(q-1):
+            if self._pow_slow(g,(q-1)//r) == 1:
+                return False
+        return True
+
+
+    @property
+    def zech(self):
+        """Zech logarithms, g^zech[k] = 1 + g^k with -1 where the sum is zero"""
+        if self.exp_table is None:
+            raise Exception(f"{self} is too large for log tables")
+        if self._zech is None:
+            q = self.order
+            S = self.add_many(np.ones(q-1,dtype=np.int64),self.exp_table[:q-1])
+            self._zech = self.log_table[S]
+        return self._zech
+
+
+    ## Arithmetic on packed ints ##
+
+    def add(self,a,b):
+        """Sum of two elements"""
+        if self.p == 2:
+            return a ^ b
+        if self.n == 1:
+            return (a+b) % self.p
+        out = 0
+        for pw in self.powers[:self.n]:
+            a,x = divmod(a,self.p)
+            b,y = divmod(b,self.p)
+            out += (x+y) % self.p * pw
+        return out
+
+
+    def neg(self,a):
+        """Additive inverse of an element"""
+        if self.p == 2:
+            return a
+        if self.n == 1:
+            return -a % self.p
+        return self.pack([-c % self.p for c in self.unpack(a)])
+
+
+    def sub(self,a,b):
+        """Difference of two elements"""
+        return self.add(a,self.neg(b))
+
+
+    def _mul_slow(self,a,b):
+        """Product of two elements without using tables"""
+        if self.n == 1:
+            return a*b % self.p
+        if self.p == 2:
+            # Carryless multiplication with the reduction done along the way
+            out = 0
+            top = 1 << self.n
+            while b:
+                if b & 1:
+                    out ^= a
+                b >>= 1
+                a <<= 1
+                if a & top:
+                    a ^= top | self.mask
+            return out
+        L = poly_mult(self.unpack(a),self.unpack(b),self.p)
+        return self.pack(self.R.reduce(L))
+
+
+    def _pow_slow(self,a,e):
+        out = 1
+        while e:
+            if e & 1:
+                out = self._mul_slow(out,a)
+            a = self._mul_slow(a,a)
+            e >>= 1
+        return out
+
+
+    def mul(self,a,b):
+        """Product of two elements"""
+        if self.exp_table is None:
+            return self._mul_slow(a,b)
+        if a == 0 or b == 0:
+            return 0
+        return self._exp[self._log[a]+self._log[b]]
+
+
+    def inv(self,a):
+        """Multiplicative inverse of an element"""
+        if a == 0:
+            raise ZeroDivisionError
+        if self.exp_table is None:
+            return self._pow_slow(a,self.order-2)
+        return self._exp[(self.order-1-self._log[a])]
+
+
+    def div(self,a,b):
+        """Quotient of two elements"""
+        return self.mul(a,self.inv(b))
+
+
+    def pow(self,a,e):
+        """Raise an element to an integer power"""
+        if e < 0:
+            a = self.inv(a)
+            e = -e
+        if a == 0:
+            return 1 if e == 0 else 0
+        if self.exp_table is None:
+            return self._pow_slow(a,e % (self.order-1))
+        return self._exp[self._log[a]*e % (self.order-1)]
+
+
+    def log(self,a):
+        """Discrete log of an element with respect to the generator"""
+        if self.exp_table is None:
+            raise Exception(f"{self} is too large for log tables")
+        if a == 0:
+            raise Exception("log of zero is undefined")
+        return self._log[a]
+
+
+    ## Vectorized arithmetic on NumPy arrays of packed ints ##
+
+    def add_many(self,A,B):
+        """Elementwise sum of two arrays of elements"""
+        A = np.asarray(A,dtype=np.int64)
+        B = np.asarray(B,dtype=np.int64)
+        if self.p == 2:
+            return A ^ B
+        out = np.zeros(np.broadcast(A,B).shape,dtype=np.int64)
+        for pw in self.powers[:self.n]:
+            out += (A//pw + B//pw) % self.p * pw
+        return out
+
+
+    def neg_many(self,A):
+        """Elementwise additive inverse of an array of elements"""
+        A = np.asarray(A,dtype=np.int64)
+        if self.p == 2:
+            return A.copy()
+        out = np.zeros(A.shape,dtype=np.int64)
+        for pw in self.powers[:self.n]:
+            out += (-(A//pw)) % self.p * pw
+        return out
+
+
+    def sub_many(self,A,B):
+        """Elementwise difference of two arrays of elements"""
+        return self.add_many(A,self.neg_many(B))
+
+
+    def mul_many(self,A,B):
+        """Elementwise product of two arrays of elements"""
+        A = np.asarray(A,dtype=np.int64)
+        B = np.asarray(B,dtype=np.int64)
+        if self.exp_table is None:
+            f = np.frompyfunc(self._mul_slow,2,1)
+            return f(A,B).astype(np.int64)
+        out = self.exp_table[self.log_table[A] + self.log_table[B]]
+        return np.where((A == 0) | (B == 0),0,out)
+
+
+    def inv_many(self,A):
+        """Elementwise multiplicative inverse of an array of elements"""
+        A = np.asarray(A,dtype=np.int64)
+        if np.any(A == 0):
+            raise ZeroDivisionError
+        if self.exp_table is None:
+            f = np.frompyfunc(self.inv,1,1)
+            return f(A).astype(np.int64)
+        return self.exp_table[self.order-1-self.log_table[A]]
+
+
+    def div_many(self,A,B):
+        """Elementwise quotient of two arrays of elements"""
+        return self.mul_many(A,self.inv_many(B))
+
+
+    def pow_many(self,A,e):
+        """Raise every element of an array to the same integer power"""
+        A = np.asarray(A,dtype=np.int64)
+        if self.exp_table is None:
+            f = np.frompyfunc(lambda a: self.pow(a,e),1,1)
+            return f(A).astype(np.int64)
+        if e < 0:
+            A = self.inv_many(A)
+            e = -e
+        out = self.exp_table[self.log_table[A] * (e % (self.order-1)) % (self.order-1)]
+        return np.where(A == 0,1 if e == 0 else 0,out)
+
+
+
+class GFElement:
+    """An element of a finite field"""
+
+    __slots__ = ("field","val")
+
+    def __init__(self,field,val):
+        self.field = field
+        self.val = val
+
+
+    def _cast(self,other):
+        if type(other) == GFElement:
+            assert other.field == self.field, "elements belong to different fields"
+            return other.val
+        return self.field(other).val
+
+
+    def __str__(self):
+        if self.field.n == 1:
+            return str(self.val)
+        return str(self.field.to_poly(self.val))
+
+
+    def __repr__(self):
+        return f"{self.val} in {self.field}"
+
+
+    def __int__(self):
+        return self.val
+
+
+    def __index__(self):
+        return self.val
+
+
+    def __hash__(self):
+        return hash((self.field,self.val))
+
+
+    def __eq__(self,other):
+        if type(other) == GFElement:
+            return self.field == other.field and self.val == other.val
+        if type(other) == int:
+            return self.val == other
+        return False
+
+
+    def __add__(self,other):
+        return GFElement(self.field,self.field.add(self.val,self._cast(other)))
+
+
+    def __radd__(self,other):
+        return self + other
+
+
+    def __neg__(self):
+        return GFElement(self.field,self.field.neg(self.val))
+
+
+    def __sub__(self,other):
+        return GFElement(self.field,self.field.sub(self.val,self._cast(other)))
+
+
+    def __rsub__(self,other):
+        return GFElement(self.field,self.field.sub(self._cast(other),self.val))
+
+
+    def __mul__(self,other):
+        return GFElement(self.field,self.field.mul(self.val,self._cast(other)))
+
+
+    def __rmul__(self,other):
+        return self * other
+
+
+    def __truediv__(self,other):
+        return GFElement(self.field,self.field.div(self.val,self._cast(other)))
+
+
+    def __rtruediv__(self,other):
+        return GFElement(self.field,self.field.div(self._cast(other),self.val))
+
+
+    def __pow__(self,e):
+        return GFElement(self.field,self.field.pow(self.val,e))
+
+
+    def inv(self):
+        """Multiplicative inverse"""
+        return GFElement(self.field,self.field.inv(self.val))
+
+
+    def log(self):
+        """Discrete log with respect to the generator of the field"""
+        return self.field.log(self.val)
+
+
+
+if __name__ == '__main__':
+    F = GF(3,3,[-1,-1,0,1])
+    print(F)
+    print(F.to_poly(F.generator))
+    A = F([2,1])
+    for i in range(14):
+        print(A)
+        A = A*F([2,1])
+
+    print()
+    G = GF(2,8,[1,1,0,1,1,0,0,0,1])
+    a, b = G(0x53), G(0xca)
+    print(f"{int(a)} * {int(b)} = {int(a*b)}")
+    X = np.arange(1,256)
+    print(np.all(G.mul_many(X,G.inv_many(X)) == 1))
@@ -0,0 +1,133 @@
+from Polynomials.PolyMultiplication import poly_mult
+from Polynomials.PolyDivision import fast_poly_divmod
+from Rationals.RationalType import Rational
+
+# Evaluating a polynomial of degree n at k points one at a time takes O(n*k)
+# steps even with Horner's method. The subproduct tree is a binary tree whose
+# leaves are the linear polynomials (x - x_i) and whose nodes are the products
+# of their children. Reducing P modulo each node on the way down the tree
+# leaves P(x_i) at each leaf, which takes O(M(n) log n) where M(n) is the cost
+# of multiplication. The same tree gives fast Lagrange interpolation.
+#
+# When m is zero the points and values can be integers or rationals.
+
+# For our purposes polynomials will be in ASCENDING order, same as PolyUtils
+
+# Below this many points it is faster to use Horner's method at each point
+MULTIPOINT_THRESHOLD = 32
+
+# Nodes of the tree covering this many points are finished with Horner's method
+LEAF_SIZE = 16
+
+
+def horner(P, x, m = 0):
+    """Evaluate a list of coefficients at a single point"""
+    out = 0
+    if m != 0:
+        for c in reversed(P):
+            out = (out*x + c) % m
+    else:
+        for c in reversed(P):
+            out = out*x + c
+    return out
+
+
+def _divide(a, b, m):
+    if m != 0:
+        return a * pow(b,-1,m) % m
+    if type(a) == int and type(b) == int:
+        return Rational(a,b)
+    return a/b
+
+
+def subproduct_tree(X, m = 0):
+    """Levels of the subproduct tree, from the leaves up to the root"""
+    level = [[-x % m if m != 0 else -x, 1] for x in X]
+    tree = [level]
+    while len(level) > 1:
+        nxt = [poly_mult(level[i],level[i+1],m) for i in range(0,len(level)-1,2)]
+        if len(level) % 2 == 1:
+            nxt.append(level[-1])
+        tree.append(nxt)
+        level = nxt
+    return tree
+
+
+def _evaluate_down(P, X, tree, m):
+    """Reduce P down the subproduct tree and evaluate what is left at the points"""
+    # Every node at depth d covers 2^d consecutive points, the last one may
+    # cover fewer
+    d = len(tree)-1
+    rems = [fast_poly_divmod(P,tree[d][0],m)[1]]
+
+    # Once the nodes are small finish with Horner's method on the remainders
+    while d > 0 and 2**d > LEAF_SIZE:
+        level = tree[d-1]
+        nxt = []
+        for i,R in enumerate(rems):
+            nxt.append(fast_poly_divmod(R,level[2*i],m)[1])
+            if 2*i+1 < len(level):
+                nxt.append(fast_poly_divmod(R,level[2*i+1],m)[1])
+        rems = nxt
+        d -= 1
+
+    w = 2**d
+    out = []
+    for i,R in enumerate(rems):
+        out += [horner(R,x,m) for x in X[i*w:(i+1)*w]]
+    return out
+
+
+def multipoint_evaluate(P, X, m = 0, tree = None):
+    """Evaluate a list of coefficients at many points"""
+    if len(X) < MULTIPOINT_THRESHOLD or len(P) < MULTIPOINT_THRESHOLD:
+        return [horner(P,x,m) for x in X]
+    if tree is None:
+        tree = subproduct_tree(X,m)
+    return _evaluate_down(P,X,tree,m)
+
+
+def _poly_derivative(P, m):
+    D = [c*i for i,c in enumerate(P)][1:]
+    if m != 0:
+        D = [c % m for c in D]
+    return D if D else [0]
+
+
+def _linear_combination(C, tree, m):
+    """Sum of C[i] times the product of (x - x_j) for every j other than i"""
+    level = [[c] for c in C]
+    for depth in range(len(tree)-1):
+        nodes = tree[depth]
+        nxt = []
+        for i in range(0,len(level)-1,2):
+            A = poly_mult(level[i],nodes[i+1],m)
+            B = poly_mult(level[i+1],nodes[i],m)
+            n = max(len(A),len(B))
+            A = A + [0]*(n-len(A))
+            B = B + [0]*(n-len(B))
+            S = [a+b for a,b in zip(A,B)]
+            if m != 0:
+                S = [s % m for s in S]
+            nxt.append(S)
+        if len(level) % 2 == 1:
+            nxt.append(level[-1])
+        level = nxt
+    out = level[0]
+    while out[-1] == 0 and len(out) > 1:
+        out.pop()
+    return out
+
+
+def fast_interpolate(X, Y, m = 0):
+    """Coefficients of the polynomial of least degree through the points (X,Y)"""
+    assert len(X) == len(Y), "need one value for each point"
+    assert len(set(X)) == len(X), "points must be distinct"
+    tree = subproduct_tree(X,m)
+
+    # The Lagrange basis polynomial for x_i is M(x)/((x - x_i)*M'(x_i)) where M
+    # is the product at the root of the tree
+    M = tree[-1][0]
+    W = multipoint_evaluate(_poly_derivative(M,m),X,m,tree)
+    C = [_divide(y,w,m) for y,w in zip(Y,W)]
+    return _linear_combination(C,tree,m)
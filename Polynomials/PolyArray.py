@@ -0,0 +1,91 @@
+import numpy as np
+
+# Polynomials over a small prime field are very common (finite fields, secret
+# sharing, factoring) and for those the coefficients are bounded by the
+# modulus. That lets us keep them in NumPy int64 arrays and do the arithmetic
+# in C rather than one Python int at a time.
+
+# For our purposes polynomials will be in ASCENDING order, same as PolyUtils
+
+# The product of two reduced coefficients must fit in a signed 64-bit integer
+# so the array backend is only used when the modulus is below 2^31. Larger
+# moduli fall back to Python ints.
+ARRAY_MODULUS_LIMIT = 2**31
+
+# Below this many coefficients the overhead of building arrays is more than
+# the time saved
+ARRAY_LENGTH_THRESHOLD = 16
+
+# Number of products of a reduced coefficient and a 16 bit number that can be
+# summed without overflow
+SPLIT_LENGTH = 2**16
+
+
+def use_array_backend(m,n=ARRAY_LENGTH_THRESHOLD):
+    """Check if the array backend can be used for modulus m and length n"""
+    return 0 < m < ARRAY_MODULUS_LIMIT and n >= ARRAY_LENGTH_THRESHOLD
+
+
+def delay_length(m):
+    """Number of products of coefficients modulo m that can be summed before reducing"""
+    return max(1,(2**63-1)//((m-1)**2+1))
+
+
+def to_array(P,m):
+    """Convert a list of coefficients to a reduced int64 array"""
+    return np.array([p % m for p in P],dtype=np.int64)
+
+
+def from_array(A):
+    """Convert an array of coefficients back to a normalized list of Python ints"""
+    out = A.tolist()
+    while out[-1] == 0 and len(out) > 1:
+        out.pop()
+    return out
+
+
+def array_mult(P, Q, m):
+    """Multiply two arrays of coefficients modulo m using delayed reduction"""
+    # Split the shorter polynomial into blocks short enough that convolving with
+    # the longer one cannot overflow then reduce once per block
+    if len(P) < len(Q):
+        P,Q = Q,P
+
+    # For moduli close to 2^31 very few products fit so the shorter one is
+    # also split into 16 bit halves, each product with a half is below 2^47
+    B = delay_length(m)
+    split = B < len(Q) and B < SPLIT_LENGTH
+    if split:
+        B = SPLIT_LENGTH
+
+    out = np.zeros(len(P)+len(Q)-1,dtype=np.int64)
+    for i in range(0,len(Q),B):
+        q = Q[i:i+B]
+        if split:
+            block = (np.convolve(P,q & 0xFFFF) % m + (np.convolve(P,q >> 16) % m << 16)) % m
+        else:
+            block = np.convolve(P,q) % m
+        out[i:i+len(block)] += block
+        out[i:i+len(block)] %= m
+    return out
+
+
+def array_add(P, Q, m):
+    """Add two arrays of coefficients modulo m"""
+    if len(P) < len(Q):
+        P,Q = Q,P
+    out = P.copy()
+    out[:len(Q)] += Q
+    return out % m
+
+
+def poly_mult_array(P, Q, m):
+    """Multiply two lists of coefficients modulo m with the array backend"""
+    A = array_mult(to_array(P,m),to_array(Q,m),m)
+    return from_array(A)
+
+
+def poly_add_array(P, Q, m):
+    """Add two lists of coefficients modulo m with the array backend"""
+    A = array_add(to_array(P,m),to_array(Q,m),m)
+    return from_array(A)
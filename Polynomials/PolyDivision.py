@@ -0,0 +1,211 @@
+from ModularArithmetic import modinv
+from Polynomials.PolyMultiplication import poly_mult
+from Polynomials.PolyUtils import poly_trim, poly_norm, poly_degree
+
+# Long division of polynomials takes O(n*m) steps. For large polynomials it is
+# faster to reverse the divisor, invert it as a power series with Newton's
+# method and then find the quotient with a single multiplication.
+#
+# When m is zero the coefficients are whatever ring the inputs come from. In
+# that case the leading coefficient of the divisor must be a unit, either 1 or
+# -1 for integers or any nonzero value for rationals. Coefficient types that
+# have a faster way to multiply can pass it in as mult.
+
+# For our purposes polynomials will be in ASCENDING order, same as PolyUtils
+
+# Below this many terms in the divisor or the quotient long division is faster
+DIVISION_THRESHOLD = 64
+
+
+def _pad(P, n):
+    return P + [0]*(n-len(P))
+
+
+def _reduce(P, m):
+    if m != 0:
+        return [p % m for p in P]
+    return P[:]
+
+
+def _unit_inverse(c, m):
+    """Multiplicative inverse of a coefficient"""
+    if m != 0:
+        return modinv(c,m)
+    if c == 1 or c == -1:
+        return c
+    if hasattr(c,"inv"):
+        return c.inv()
+    return 1/c
+
+
+def long_divmod(P, Q, m = 0):
+    """Quotient and remainder by dividing out one term at a time"""
+    P = P[:]
+    dP = len(P)-1
+    dQ = len(Q)-1
+    if dP < dQ:
+        return [0], _reduce(P,m)
+
+    inv = _unit_inverse(Q[-1],m)
+    qt = [0]*(dP-dQ+1)
+    for i in range(dP-dQ,-1,-1):
+        if m != 0:
+            c = P[i+dQ] * inv % m
+        else:
+            c = P[i+dQ] * inv
+        qt[i] = c
+        if c != 0:
+            P[i:i+dQ] = [a - c*b for a,b in zip(P[i:i+dQ],Q)]
+
+    rm = P[:dQ] if dQ > 0 else [0]
+    if m != 0:
+        rm = [r % m for r in rm]
+    return poly_trim(qt), poly_trim(rm)
+
+
+def poly_series_inverse(P, n, m = 0, g = None, mult = poly_mult):
+    """Power series inverse of P modulo x^n, optionally extending a known inverse g"""
+    if g is None:
+        g = [_unit_inverse(P[0],m)]
+    k = len(g)
+
+    # Newton iteration doubles the number of correct terms each step
+    # g <- g*(2 - P*g) mod x^k
+    while k < n:
+        k = min(2*k,n)
+        e = mult(P[:k],g,m)[:k]
+        e = [-c for c in e]
+        e[0] += 2
+        g = _pad(mult(g,e,m)[:k],k)
+        if m != 0:
+            g = [c % m for c in g]
+    return g[:n]
+
+
+def fast_divmod(P, Q, m = 0, Qinv = None, mult = poly_mult):
+    """Quotient and remainder using the power series inverse of the reversed divisor"""
+    dP = len(P)-1
+    dQ = len(Q)-1
+    if dP < dQ:
+        return [0], _reduce(P,m)
+
+    # Reversing P and Q turns the quotient into the first k terms of the power
+    # series rev(P)/rev(Q)
+    k = dP-dQ+1
+    if Qinv is None or len(Qinv) < k:
+        Qinv = poly_series_inverse(Q[::-1],k,m,Qinv,mult)
+    qr = _pad(mult(P[::-1][:k],Qinv[:k],m)[:k],k)
+    qt = poly_trim(qr[::-1])
+
+    # The remainder has degree less than dQ so only the low terms of P - q*Q
+    # need to be computed
+    if dQ == 0:
+        return qt, [0]
+    low = _pad(mult(qt[:dQ],Q[:dQ],m)[:dQ],dQ)
+    rm = [a-b for a,b in zip(_pad(P[:dQ],dQ),low)]
+    if m != 0:
+        rm = [r % m for r in rm]
+    return qt, poly_trim(rm)
+
+
+def fast_poly_divmod(P, Q, m = 0):
+    """Divide with whichever method is faster for the sizes involved"""
+    dP = len(P)-1
+    dQ = len(Q)-1
+    if min(dQ,dP-dQ+1) < DIVISION_THRESHOLD:
+        return long_divmod(P,Q,m)
+    return fast_divmod(P,Q,m)
+
+
+# Divide two polynomials modulo some number
+def poly_divmod(P, Q, m = 0):
+    # Don't modify the inputs
+    P = P[:]
+    Q = Q[:]
+    
+    # Remove unnecessary zeroes
+    poly_norm(P)
+    poly_norm(Q)
+    
+    # Check for division by zero    
+    if poly_degree(Q) == -1:
+        raise ZeroDivisionError
+    
+    # Large divisions use Newton iteration, everything else long division
+    return fast_poly_divmod(P,Q,m)
+
+
+
+class PolyModulus:
+    """Precomputed data for repeatedly reducing by the same polynomial"""
+
+    def __init__(self,F,m=0):
+        # Accept a Polynomial as well as a list of coefficients
+        if hasattr(F,"coef"):
+            m = F.modulus
+            F = F.coef
+        self.F = poly_trim(F[:])
+        self.modulus = m
+        if self.F == [0]:
+            raise ZeroDivisionError
+
+        # Reducing the product of two reduced polynomials gives a quotient of
+        # degree less than that of F so that many terms of the inverse are
+        # computed up front. More are added if a larger input shows up.
+        d = len(self.F)-1
+        if d >= DIVISION_THRESHOLD:
+            self.inv = poly_series_inverse(self.F[::-1],d,m)
+        else:
+            self.inv = None
+
+
+    def __repr__(self):
+        return f"PolyModulus({self.F}, {self.modulus})"
+
+
+    def degree(self):
+        """Degree of the modulus polynomial"""
+        return len(self.F)-1
+
+
+    def divmod(self,P):
+        """Quotient and remainder of P divided by the modulus"""
+        d = len(self.F)-1
+        k = len(P)-d
+        if self.inv is None or k < DIVISION_THRESHOLD:
+            return long_divmod(P,self.F,self.modulus)
+        if k > len(self.inv):
+            self.inv = poly_series_inverse(self.F[::-1],k,self.modulus,self.inv)
+        return fast_divmod(P,self.F,self.modulus,self.inv)
+
+
+    def reduce(self,P):
+        """Remainder of P divided by the modulus"""
+        return self.divmod(P)[1]
+
+
+    def mulmod(self,P,Q):
+        """Product of P and Q reduced by the modulus"""
+        return self.reduce(poly_mult(P,Q,self.modulus))
+
+
+    def powmod(self,P,e):
+        """P raised to the power e reduced by the modulus"""
+        return poly_powmod(P,e,self)
+
+
+
+def poly_powmod(P, e, R):
+    """P^e reduced by the PolyModulus R after every step"""
+    # Reducing as we go keeps every intermediate result below the degree of
+    # the modulus even when e is enormous
+    assert e >= 0, f"{e} is negative"
+    out = [1] if R.degree() > 0 else [0]
+    P = R.reduce(P)
+    while e:
+        if e & 1:
+            out = R.mulmod(out,P)
+        e >>= 1
+        if e:
+            P = R.mulmod(P,P)
+    return out
@@ -0,0 +1,258 @@
+import numpy as np
+from functools import lru_cache
+from PrimeNumbers import is_prime
+from ModularArithmetic import primitive_root
+from Polynomials.PolyArray import ARRAY_MODULUS_LIMIT, use_array_backend, \
+                                  to_array, from_array, array_mult, \
+                                  delay_length
+from Polynomials.PolyUtils import poly_trim
+
+# Multiplication is the core of almost everything else done with polynomials
+# so there are several algorithms here and poly_mult picks one based on the
+# lengths of the inputs and the modulus.
+#
+# schoolbook  : O(n*m), best for short polynomials
+# karatsuba   : O(n^1.58), works for coefficients from any ring
+# kronecker   : pack integer coefficients into one huge integer and let
+#               Python's own multiplication do the work
+# ntt         : number theoretic transform, O(n log n), for moduli that fit in
+#               the array backend
+
+# For our purposes polynomials will be in ASCENDING order, same as PolyUtils
+
+KARATSUBA_THRESHOLD = 32
+KRONECKER_THRESHOLD = 32
+NTT_THRESHOLD = 1024
+
+# Primes of the form c*2^k+1 that are used to multiply modulo anything that
+# isn't NTT friendly itself. Their product is larger than any coefficient that
+# can appear before reduction for a modulus under 2^31.
+NTT_PRIMES = [998244353, 167772161, 469762049]
+NTT_MAX_LENGTH = 2**23
+
+
+def schoolbook_mult(P, Q, m = 0):
+    """Multiply two polynomials term by term"""
+    out = [0]*(len(P)+len(Q)-1)
+
+    for i in range(len(P)):
+        for j in range(len(Q)):
+            out[i+j] += P[i]*Q[j]
+
+    # Python ints never overflow so the reduction can wait until the end
+    if m != 0:
+        out = [c % m for c in out]
+
+    return poly_trim(out)
+
+
+def _karatsuba(P, Q):
+    # Both inputs have the same length here
+    n = len(P)
+    if n <= KARATSUBA_THRESHOLD:
+        out = [0]*(2*n-1)
+        for i in range(n):
+            for j in range(n):
+                out[i+j] += P[i]*Q[j]
+        return out
+
+    h = n//2
+    P0, P1 = P[:h], P[h:]
+    Q0, Q1 = Q[:h], Q[h:]
+
+    # Pad the low halves so they line up with the high halves
+    P0s = P0 + [0]*(len(P1)-h)
+    Q0s = Q0 + [0]*(len(Q1)-h)
+
+    z0 = _karatsuba(P0s,Q0s)
+    z2 = _karatsuba(P1,Q1)
+    z1 = _karatsuba([a+b for a,b in zip(P0s,P1)],[a+b for a,b in zip(Q0s,Q1)])
+
+    out = [0]*(2*n-1)
+    for i,c in enumerate(z0):
+        out[i] += c
+        out[i+h] -= c
+    for i,c in enumerate(z2):
+        out[i+2*h] += c
+        out[i+h] -= c
+    for i,c in enumerate(z1):
+        out[i+h] += c
+    return out
+
+
+def karatsuba_mult(P, Q, m = 0):
+    """Multiply two polynomials using Karatsuba's algorithm"""
+    if len(P) < len(Q):
+        P,Q = Q,P
+    n = len(Q)
+
+    # Unbalanced inputs are cut into pieces as long as the shorter one
+    out = [0]*(len(P)+len(Q)-1)
+    for i in range(0,len(P),n):
+        A = P[i:i+n]
+        A = A + [0]*(n-len(A))
+        for j,c in enumerate(_karatsuba(A,Q)):
+            if i+j < len(out):
+                out[i+j] += c
+
+    if m != 0:
+        out = [c % m for c in out]
+
+    return poly_trim(out)
+
+
+def _pack(P, w):
+    """Evaluate a list of non-negative integers at 2^(8w)"""
+    return int.from_bytes(b"".join(c.to_bytes(w,"little") for c in P),"little")
+
+
+def _unpack(x, w, n):
+    """Split an integer back into n non-negative integers of w bytes"""
+    data = x.to_bytes(w*n,"little")
+    return [int.from_bytes(data[i:i+w],"little") for i in range(0,w*n,w)]
+
+
+def kronecker_mult(P, Q, m = 0):
+    """Multiply two polynomials with integer coefficients by Kronecker substitution"""
+    n = len(P)+len(Q)-1
+
+    if m != 0:
+        P = [p % m for p in P]
+        Q = [q % m for q in Q]
+
+    # Every coefficient of the product has to fit in its own slot, negative
+    # coefficients need one extra bit
+    bound = max(abs(p) for p in P) * max(abs(q) for q in Q) * min(len(P),len(Q))
+    w = (bound.bit_length() + 2) // 8 + 1
+
+    # Negative coefficients are handled by packing the positive and negative
+    # parts separately then shifting every slot of the result up by half its
+    # width so the unpacked digits are all non-negative
+    x = _pack([max(p,0) for p in P],w) - _pack([max(-p,0) for p in P],w)
+    y = _pack([max(q,0) for q in Q],w) - _pack([max(-q,0) for q in Q],w)
+    half = 1 << (8*w-1)
+    z = x*y + _pack([half]*n,w)
+
+    out = [c-half for c in _unpack(z,w,n)]
+
+    if m != 0:
+        out = [c % m for c in out]
+
+    return poly_trim(out)
+
+
+@lru_cache(maxsize=None)
+def ntt_friendly(m, n):
+    """Check if m is a prime that has a primitive root of unity of order n"""
+    return 0 < m < ARRAY_MODULUS_LIMIT and (m-1) % n == 0 and is_prime(m)
+
+
+def _roots_of_unity(w, n, m):
+    """Array of w^0, w^1, ... w^(n-1) modulo m"""
+    out = np.ones(n,dtype=np.int64)
+    k = 1
+    step = w
+    while k < n:
+        out[k:2*k] = out[:min(k,n-k)] * step % m
+        step = step*step % m
+        k *= 2
+    return out
+
+
+def _ntt(A, w, m):
+    """Number theoretic transform of an array whose length is a power of two"""
+    n = len(A)
+    bits = n.bit_length()-1
+
+    # Bit reversal permutation
+    idx = np.arange(n)
+    rev = np.zeros(n,dtype=np.int64)
+    for i in range(bits):
+        rev |= ((idx >> i) & 1) << (bits-1-i)
+    A = A[rev]
+
+    W = _roots_of_unity(w,n//2,m)
+    h = 1
+    while h < n:
+        A = A.reshape(-1,2*h)
+        u = A[:,:h]
+        v = A[:,h:] * W[::n//(2*h)] % m
+        A = np.concatenate([(u+v) % m,(u-v) % m],axis=1)
+        h *= 2
+    return A.reshape(n)
+
+
+def _ntt_convolve(A, B, p):
+    """Cyclic convolution of two arrays modulo an NTT friendly prime p"""
+    n = 1
+    while n < len(A)+len(B)-1:
+        n *= 2
+    g = primitive_root(p)
+    w = pow(g,(p-1)//n,p)
+
+    FA = _ntt(np.concatenate([A % p,np.zeros(n-len(A),dtype=np.int64)]),w,p)
+    FB = _ntt(np.concatenate([B % p,np.zeros(n-len(B),dtype=np.int64)]),w,p)
+    C = _ntt(FA*FB % p,pow(w,p-2,p),p)
+    return C[:len(A)+len(B)-1] * pow(n,p-2,p) % p
+
+
+def _use_ntt(a, b, m):
+    """Decide if a transform is faster than direct convolution with the array backend"""
+    n = min(a,b)
+    if n < NTT_THRESHOLD or a+b-1 > NTT_MAX_LENGTH:
+        return False
+    # A single transform mod m is cheap, as is direct convolution when a lot
+    # of products can be summed before reducing. Past that three transforms
+    # and the recombination are still faster.
+    N = 1 << (a+b-2).bit_length()
+    if ntt_friendly(m,N) or delay_length(m) < n:
+        return True
+    return n >= 8*NTT_THRESHOLD
+
+
+def ntt_mult(P, Q, m):
+    """Multiply two polynomials modulo m with a number theoretic transform"""
+    A = to_array(P,m)
+    B = to_array(Q,m)
+
+    n = 1
+    while n < len(A)+len(B)-1:
+        n *= 2
+
+    if ntt_friendly(m,n):
+        return from_array(_ntt_convolve(A,B,m))
+
+    # Otherwise multiply modulo three NTT primes and recombine with Garner's
+    # algorithm, every intermediate step stays below 2^62
+    p1, p2, p3 = NTT_PRIMES
+    r1 = _ntt_convolve(A,B,p1)
+    r2 = _ntt_convolve(A,B,p2)
+    r3 = _ntt_convolve(A,B,p3)
+
+    t2 = (r2-r1) % p2 * pow(p1,-1,p2) % p2
+    t3 = ((r3-r1) % p3 * pow(p1,-1,p3) % p3 - t2) % p3 * pow(p2,-1,p3) % p3
+
+    out = (r1 % m + t2 * (p1 % m) % m + t3 * (p1*p2 % m) % m) % m
+    return from_array(out)
+
+
+def poly_mult(P, Q, m = 0):
+    """Multiply two polynomials, choosing the algorithm by size and modulus"""
+    n = min(len(P),len(Q))
+
+    if 0 < m < ARRAY_MODULUS_LIMIT:
+        if _use_ntt(len(P),len(Q),m):
+            return ntt_mult(P,Q,m)
+        if use_array_backend(m,n):
+            return from_array(array_mult(to_array(P,m),to_array(Q,m),m))
+        return schoolbook_mult(P,Q,m)
+
+    if n < KRONECKER_THRESHOLD:
+        return schoolbook_mult(P,Q,m)
+
+    if all(type(c) == int for c in P) and all(type(c) == int for c in Q):
+        return kronecker_mult(P,Q,m)
+
+    if n <= KARATSUBA_THRESHOLD:
+        return schoolbook_mult(P,Q,m)
+    return karatsuba_mult(P,Q,m)
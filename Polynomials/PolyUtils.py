@@ -1,4 +1,7 @@
-from ModularArithmetic import modinv
+from Polynomials.PolyArray import use_array_backend, poly_add_array
+
+# Multiplication and division pick between several algorithms so they have
+# their own modules, PolyMultiplication and PolyDivision
 
 # Finite fields can often be represented by polynomials with the aid of modular
 # arithmetic. This is most useful for GF(p^n) when n is greater than 1.
@@ -25,6 +28,20 @@ def poly_norm(P):
         if len(P) == 1:
             break
         P.pop()
+
+
+# Same as poly_norm but returns the result, for lists or arrays
+def poly_trim(P):
+    n = len(P)
+    while n > 1 and P[n-1] == 0:
+        n -= 1
+    return P if n == len(P) else P[:n]
+
+
+# Scale a polynomial modulo a prime so its leading coefficient is 1
+def poly_monic(P, p):
+    inv = pow(int(P[-1]),-1,p)
+    return [int(c)*inv % p for c in P]
         
 
 # Determine the degree of a polynomial
@@ -124,6 +141,9 @@ def poly_add(P, Q, m = 0):
         
     pad = max(len(P),len(Q))
     
+    if use_array_backend(m,pad):
+        return poly_add_array(P,Q,m)
+    
     P = poly_pad(P,pad)
     Q = poly_pad(Q,pad)
     
@@ -142,76 +162,6 @@ def poly_add(P, Q, m = 0):
     
 
 
-# Multiply two polynomials modulo some number
-def poly_mult(P, Q, m = 0):
-    
-    out = [0]*(len(P)+len(Q))
-    
-    
-    if m == 0:
-        for i in range(len(P)):
-            for j in range(len(Q)):
-                out[i+j] += P[i]*Q[j]
-                out[i+j] = out[i+j]
-    else:
-        for i in range(len(P)):
-            for j in range(len(Q)):
-                out[i+j] += P[i]*Q[j]
-                out[i+j] = out[i+j] % m
-    
-    poly_norm(out)
-
-    return out
-
-# Divide two polynomials modulo some number
-def poly_divmod(P, Q, m = 0):
-    # Don't modify the inputs
-    P = P[:]
-    Q = Q[:]
-    
-    # Remove unnecessary zeroes
-    dP = poly_degree(P)
-    dQ = poly_degree(Q)
-    
-    
-    # Check for division by zero    
-    if poly_degree(Q) == -1:
-        raise ZeroDivisionError
-    
-    
-    if len(Q) == 1:
-        if m == 0:
-            return [p/Q[0] for p in P], [0]
-        else:
-            return [modinv(p,m)*Q[0] for p in P], [0]
-    if len(P) == 1:
-        if m == 0:
-            return [P[0]/q for q in Q], [0]
-        else:
-            return [P[0]*modinv(Q,m) for q in Q], [0]
-        
-    else:
-        dP = len(P)-1
-        dQ = len(Q)-1
-        if dP >= dQ:
-            qt = [0]*dP
-            while dP >= dQ:
-                d = [0]*(dP - dQ) + Q
-                mult = qt[dP - dQ] = P[-1] * modinv(d[-1],m)
-                d = [co*mult for co in d]
-                P = [ (coeffP - coeffd) % m for coeffP, coeffd in zip(P, d)]
-                poly_norm(P)
-                dP = len(P)-1
-            rm = [i % m for i in P]
-        else:
-            qt = [0]
-            rm = [i % m for i in P]
-
-    #poly_norm(qt)
-    #poly_norm(rm)
-    #print(qt)
-    return qt,rm
-
 def poly_derivative(P):
     P = P.copy()
     for i in range(len(P)):
@@ -1,4 +1,4 @@
-from PolynomialType import Polynomial
+from Polynomials.PolynomialType import Polynomial
 from math import sqrt, floor
 from itertools import product as cart_product
 from ModularArithmetic import gcd
@@ -78,13 +78,15 @@ def poly_factor_1L(P):
             
             
         
-Q = Polynomial([-20,6,2,12])
-g = abs(gcd(Q.coef))
-print(Q)
-print(f"GCD = {g}")
-Q = Q/g
-print(Q)
-F = poly_factor_1L(Q)
-print(F)
-print(Q/F)
-#print(F*(Q/F))
\ No newline at end of file
+
+if __name__ == '__main__':
+    Q = Polynomial([-20,6,2,12])
+    g = abs(gcd(Q.coef))
+    print(Q)
+    print(f"GCD = {g}")
+    Q = Q/g
+    print(Q)
+    F = poly_factor_1L(Q)
+    print(F)
+    print(Q/F)
+    #print(F*(Q/F))
\ No newline at end of file
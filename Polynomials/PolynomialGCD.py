@@ -1,13 +1,347 @@
-from PolynomialType import Polynomial
+from math import gcd
+from PrimeNumbers import is_prime
+from Polynomials.PolynomialType import Polynomial
+from Polynomials.PolynomialIntegerType import ZPoly
+from Polynomials.PolynomialRationalType import QPoly
+from Polynomials.PolyMultiplication import poly_mult
+from Polynomials.PolyUtils import poly_trim, poly_monic
+from Polynomials.PolyDivision import long_divmod, fast_poly_divmod
+from Rationals.RationalType import Rational
 
+# Euclid's algorithm works for polynomials over a field but over the integers
+# and the rationals the intermediate coefficients grow exponentially even
+# when the answer is small. There are three ways around that here.
+#
+# subresultant : pseudo-division with a known common factor divided out of
+#                every remainder keeps the coefficients polynomial in size
+# modular      : find the GCD modulo several primes and combine the results
+#                with the Chinese remainder theorem, then check it divides
+# half-GCD     : for large polynomials over GF(p) the quotients of Euclid's
+#                algorithm for the top half of the coefficients are found
+#                recursively so the whole GCD costs O(M(n) log n)
+
+# For our purposes polynomials will be in ASCENDING order, same as PolyUtils
+
+# Below this degree the plain Euclidean algorithm is used modulo p
+HGCD_THRESHOLD = 64
+
+# Below this degree the subresultant PRS is faster than the modular GCD
+SUBRESULTANT_THRESHOLD = 8
+
+
+def _degree(P):
+    if len(P) == 1 and P[0] == 0:
+        return -1
+    return len(P)-1
+
+
+def _sub(P, Q, m = 0):
+    n = max(len(P),len(Q))
+    P = P + [0]*(n-len(P))
+    Q = Q + [0]*(n-len(Q))
+    if m != 0:
+        return poly_trim([(a-b) % m for a,b in zip(P,Q)])
+    return poly_trim([a-b for a,b in zip(P,Q)])
+
+
+def _add(P, Q, m = 0):
+    return _sub(P,[-q for q in Q],m)
+
+
+## Modulo a prime ##
+
+def _euclid_modp(A, B, p):
+    while B != [0]:
+        n = len(B)-1
+        if n > 0 and len(A) == n+2:
+            # Almost every quotient is linear, q1*x + q0 is found from the top
+            # two terms and the remainder A - (q1*x + q0)*B is then a single
+            # pass over the coefficients
+            inv = pow(B[-1],-1,p)
+            q1 = A[-1]*inv % p
+            q0 = (A[-2] - q1*B[-2])*inv % p
+            R = [(a - q0*b - q1*c) % p for a,b,c in zip(A,B,[0]+B[:n-1])]
+            A, B = B, poly_trim(R)
+        else:
+            A, B = B, long_divmod(A,B,p)[1]
+    return A
+
+
+def _shift(P, k):
+    """Divide by x^k and drop the remainder"""
+    return P[k:] if len(P) > k else [0]
+
+
+def _apply(M, A, B, p):
+    """Multiply the vector (A,B) by the 2x2 polynomial matrix M"""
+    (a,b),(c,d) = M
+    return (_add(poly_mult(a,A,p),poly_mult(b,B,p),p),
+            _add(poly_mult(c,A,p),poly_mult(d,B,p),p))
+
+
+def _matmul(M, N, p):
+    """Product of two 2x2 polynomial matrices"""
+    (a,b),(c,d) = M
+    (e,f),(g,h) = N
+    return ((_add(poly_mult(a,e,p),poly_mult(b,g,p),p),_add(poly_mult(a,f,p),poly_mult(b,h,p),p)),
+            (_add(poly_mult(c,e,p),poly_mult(d,g,p),p),_add(poly_mult(c,f,p),poly_mult(d,h,p),p)))
+
+
+def _euclid_matrix(A, B, m, p):
+    """Euclidean steps on (A,B) until the degree of B drops below m, with their matrix"""
+    M = (([1],[0]),([0],[1]))
+    while _degree(B) >= m:
+        q, r = long_divmod(A,B,p)
+        (a,b),(c,d) = M
+        M = ((c,d),(_sub(a,poly_mult(q,c,p),p),_sub(b,poly_mult(q,d,p),p)))
+        A, B = B, r
+    return M
+
+
+def _half_gcd(A, B, p):
+    """Matrix of the Euclidean steps that halve the degree of A, deg(A) > deg(B)"""
+    # Only the top coefficients of A and B decide the first half of the
+    # quotients so they are found from the polynomials divided by x^m
+    m = (_degree(A)+1)//2
+    if _degree(B) < m:
+        return (([1],[0]),([0],[1]))
+    if _degree(A) < HGCD_THRESHOLD:
+        return _euclid_matrix(A,B,m,p)
+
+    R = _half_gcd(_shift(A,m),_shift(B,m),p)
+    A, B = _apply(R,A,B,p)
+    if _degree(B) < m:
+        return R
+
+    q, r = fast_poly_divmod(A,B,p)
+    Q = (([0],[1]),([1],_sub([0],q,p)))
+    A, B = B, r
+    k = 2*m - _degree(A)
+    S = _half_gcd(_shift(A,k),_shift(B,k),p)
+    return _matmul(S,_matmul(Q,R,p),p)
+
+
+def poly_gcd_modp(A, B, p):
+    """Monic GCD of two lists of coefficients modulo a prime p"""
+    A = poly_trim([a % p for a in A])
+    B = poly_trim([b % p for b in B])
+    if _degree(A) < _degree(B):
+        A, B = B, A
+    if B == [0]:
+        return poly_monic(A,p) if A != [0] else [0]
+
+    while B != [0]:
+        if _degree(B) < HGCD_THRESHOLD:
+            A = _euclid_modp(A,B,p)
+            break
+        # A half-GCD step when B is still large, a single division when the
+        # degrees are far apart
+        if 2*_degree(B) > _degree(A):
+            A, B = _apply(_half_gcd(A,B,p),A,B,p)
+        else:
+            A, B = B, fast_poly_divmod(A,B,p)[1]
+    return poly_monic(A,p)
+
+
+## Over the integers ##
+
+def _content(P):
+    return gcd(*P)
+
+
+def _primitive(P):
+    """Primitive part with a positive leading coefficient"""
+    c = _content(P)
+    if c == 0:
+        return [0]
+    if P[-1] < 0:
+        c = -c
+    return [a//c for a in P]
+
+
+def _pseudo_remainder(A, B):
+    """lc(B)^(deg(A)-deg(B)+1) * A reduced by B using only integer arithmetic"""
+    R = A[:]
+    dB = _degree(B)
+    b = B[-1]
+    e = _degree(A)-dB+1
+    while _degree(R) >= dB:
+        c = R[-1]
+        s = _degree(R)-dB
+        R = [b*r for r in R]
+        for i,q in enumerate(B):
+            R[s+i] -= c*q
+        R = poly_trim(R[:-1]) if len(R) > 1 else [0]
+        e -= 1
+    if e > 0:
+        f = b**e
+        R = [f*r for r in R]
+    return R
+
+
+def subresultant_gcd(A, B):
+    """GCD of two lists of integer coefficients by the subresultant PRS"""
+    A = poly_trim(A[:])
+    B = poly_trim(B[:])
+    if _degree(A) < _degree(B):
+        A, B = B, A
+    if B == [0]:
+        return _primitive(A) if A != [0] else [0]
+
+    d = gcd(_content(A),_content(B))
+    A, B = _primitive(A), _primitive(B)
+
+    # Every remainder is divisible by g*h^delta where g is the leading
+    # coefficient and h the subresultant factor from the previous step
+    g, h = 1, 1
+    while True:
+        delta = _degree(A)-_degree(B)
+        R = _pseudo_remainder(A,B)
+        if R == [0]:
+            break
+        if _degree(R) == 0:
+            B = [1]
+            break
+        A, B = B, [r // (g * h**delta) for r in R]
+        g = A[-1]
+        if delta > 0:
+            h = g**delta // h**(delta-1)
+
+    return [d*c for c in _primitive(B)]
+
+
+# Found once and shared by every call
+_CRT_PRIMES = []
+
+def _crt_primes():
+    """Primes just below 2^31 so the work modulo each fits the array backend"""
+    for p in _CRT_PRIMES:
+        yield p
+    n = _CRT_PRIMES[-1]-2 if _CRT_PRIMES else 2**31-1
+    while True:
+        if is_prime(n):
+            _CRT_PRIMES.append(n)
+            yield n
+        n -= 2
+
+
+def _exact_quotient(A, B):
+    """A/B if B divides A over the integers, otherwise None"""
+    A = A[:]
+    dB = _degree(B)
+    b = B[-1]
+    Q = [0]*(max(_degree(A)-dB,0)+1)
+    while _degree(A) >= dB:
+        c, r = divmod(A[-1],b)
+        if r != 0:
+            return None
+        s = _degree(A)-dB
+        Q[s] = c
+        for i,q in enumerate(B):
+            A[s+i] -= c*q
+        A = poly_trim(A[:-1]) if len(A) > 1 else [0]
+    if A != [0]:
+        return None
+    return Q
+
+
+def _symmetric(P, M):
+    """Coefficients reduced into the range -M/2 to M/2"""
+    return [c % M - M if 2*(c % M) > M else c % M for c in P]
+
+
+def modular_gcd(A, B):
+    """GCD of two lists of integer coefficients by CRT over many primes"""
+    A = poly_trim(A[:])
+    B = poly_trim(B[:])
+    if _degree(A) < _degree(B):
+        A, B = B, A
+    if B == [0]:
+        return _primitive(A) if A != [0] else [0]
+
+    d = gcd(_content(A),_content(B))
+    A, B = _primitive(A), _primitive(B)
+
+    # The leading coefficient of the GCD divides that of both inputs so the
+    # monic GCD modulo p is scaled by their GCD before combining
+    lc = gcd(A[-1],B[-1])
+    G, M = None, 1
+    for p in _crt_primes():
+        if A[-1] % p == 0 or B[-1] % p == 0:
+            continue
+        Gp = poly_gcd_modp(A,B,p)
+        if _degree(Gp) == 0:
+            return [d]
+        Gp = [c*lc % p for c in Gp]
+
+        # A prime where the GCD has a larger degree is unlucky, one where it
+        # has a smaller degree means every earlier prime was
+        if G is None or _degree(Gp) < _degree(G):
+            G, M = _symmetric(Gp,p), p
+            continue
+        if _degree(Gp) > _degree(G):
+            continue
+
+        inv = pow(M,-1,p)
+        H = [g + M*((gp-g)*inv % p) for g,gp in zip(G,Gp)]
+        M = M*p
+        H = _symmetric(H,M)
+
+        # Once another prime leaves the result unchanged it is very likely
+        # correct and only needs to be checked
+        if H == G:
+            H = _primitive(H)
+            if _exact_quotient(A,H) is not None and _exact_quotient(B,H) is not None:
+                return [d*c for c in H]
+        G = H
+
+
+def int_poly_gcd(A, B):
+    """GCD of two lists of integer coefficients with a positive leading coefficient"""
+    if min(_degree(A),_degree(B)) < SUBRESULTANT_THRESHOLD:
+        return subresultant_gcd(A,B)
+    return modular_gcd(A,B)
+
+
+## Polynomial types ##
+
+def zpoly_gcd(A, B):
+    """GCD of two integer polynomials with a positive leading coefficient"""
+    assert type(A) == ZPoly and type(B) == ZPoly
+    return ZPoly(int_poly_gcd(A.coef,B.coef))
+
+
+def _clear_denominators(P):
+    D = 1
+    for c in P:
+        D = D * c.d // gcd(D,c.d)
+    return [c.n*(D//c.d) for c in P]
+
+
+def qpoly_gcd(A, B):
+    """Monic GCD of two rational polynomials"""
+    assert type(A) == QPoly and type(B) == QPoly
+    # Scaling by a constant doesn't change the GCD over the rationals so the
+    # work is done with integer coefficients
+    G = int_poly_gcd(_clear_denominators(A.coef),_clear_denominators(B.coef))
+    if G == [0]:
+        return QPoly([0])
+    return QPoly([Rational(c,G[-1]) for c in G])
 
 
 def poly_GCD(A,B):
-    if B.coef == [0]:
-        return A
-    else:
-        return poly_GCD(B,A%B)
-    
+    """GCD of two Polynomials, monic when there is a modulus"""
+    if A.modulus != B.modulus:
+        raise Exception("Modulus does not match.")
+    if A.modulus != 0:
+        return Polynomial(poly_gcd_modp(A.coef,B.coef,A.modulus),A.modulus)
+    if all(type(c) == int for c in A.coef + B.coef):
+        return Polynomial(int_poly_gcd(A.coef,B.coef))
+    while B.coef != [0]:
+        A, B = B, A % B
+    return A
+
+
 
 if __name__ == '__main__':
     P = Polynomial([6,7,1])
@@ -15,10 +349,14 @@ if __name__ == '__main__':
     R = Polynomial([1,1])
     print(P)
     print(Q)
-    
+
     print("gcd should be (x+1)")
     print(poly_GCD(P,Q))
-    
+
     print(R)
     for i in divmod(P,R):
-        print(i)
\ No newline at end of file
+        print(i)
+
+    A = QPoly([Rational(1,2),Rational(7,6),Rational(1,3)])
+    B = QPoly([Rational(-3,4),Rational(1,2),Rational(1,4)])
+    print(f"\ngcd({A}, {B}) = {qpoly_gcd(A,B)}")
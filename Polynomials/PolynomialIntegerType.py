@@ -1,7 +1,10 @@
 # Univariate polynomials with coefficients in the ordinary ring of integers
 
 
-from Polynomials.PolyUtils import poly_print, poly_add, poly_mult
+from Polynomials.PolyUtils import poly_print, poly_add
+from Polynomials.PolyMultiplication import poly_mult
+from Polynomials.PolyDivision import fast_poly_divmod
+from Polynomials.MultipointEvaluation import horner, multipoint_evaluate
 from Polynomials.PolynomialIntegerTypeUtils import poly_print_simple
 from ModularArithmetic import gcd
 from math import copysign
@@ -30,10 +33,7 @@ class ZPoly:
 
     def __call__(self,x):
         """Evaluate the polynomial at a given point"""
-        out = 0
-        for pwr,coef in enumerate(self.coef):
-            out = out + coef*(x**pwr)
-        return out
+        return horner(self.coef,x)
 
 
     def __str__(self):
@@ -104,17 +104,17 @@ class ZPoly:
 
 
     def __pow__(self,pwr):
-        """Multiply a polynomial by itself"""
-        if pwr == 0:
-            return ZPoly([1])
-        if pwr == 1:
-            return self
-        else:
-            assert type(pwr) == int, f"{pwr} is not an integer"
-            assert type(pwr) > 0, f"{pwr} is negative"
-            out = self.copy()
-            for i in range(pwr-1):
-                out *= self
+        """Raise the polynomial to a power by repeated squaring"""
+        assert type(pwr) == int, f"{pwr} is not an integer"
+        assert pwr >= 0, f"{pwr} is negative"
+        out = ZPoly([1])
+        base = self
+        while pwr:
+            if pwr & 1:
+                out = out*base
+            pwr >>= 1
+            if pwr:
+                base = base*base
         return out
 
 
@@ -161,6 +161,11 @@ class ZPoly:
                 if p % Q[-1] != 0:
                     raise Exception(f"Integer division of {self} by {poly} is not defined")
 
+            # Large divisions by a monic polynomial use Newton iteration
+            if Q[-1] == 1 or Q[-1] == -1:
+                qt, rm = fast_poly_divmod(P,Q)
+                return ZPoly(qt), ZPoly(rm)
+
             dP = len(P)-1
             dQ = len(Q)-1
             if dP >= dQ:
@@ -216,11 +221,10 @@ class ZPoly:
     def evaluate(self,X):
         """Evaluate the polynomial at a given list of points"""
         assert type(X) == list
-        out = [0]*len(X)
-        for pwr,coef in enumerate(self.coef):
-            for pos,x in enumerate(X):
-                out[pos] = (out[pos] + coef*(x**pwr))
-        return out
+        # Many integer points at once are evaluated with a subproduct tree
+        if all(type(x) == int for x in X):
+            return multipoint_evaluate(self.coef,X)
+        return [horner(self.coef,x) for x in X]
 
 
     def degree(self):
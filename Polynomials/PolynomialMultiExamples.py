@@ -1,4 +1,4 @@
-from PolynomialMultiType import Atom
+from Polynomials.PolynomialMultiType import Atom
 #from NumberTheory.Rationals import Rational
 
 def atom_tests():
@@ -1,4 +1,5 @@
 from itertools import groupby
+from heapq import heappush, heappop
 
 class Atom:
     """An indeterminate raised to a certain power"""
@@ -282,47 +283,101 @@ class Particle:
 class MVPoly:
     """Polynomial with various indeterminates"""
     
+    # Terms are kept in a dict from tuples of exponents to coefficients, the
+    # exponents line up with self.V which holds the indeterminates in
+    # alphabetical order. Particles are only built when printing.
+    
     def __init__(self,terms):
-        self.terms = poly_merge(sorted(terms))
-        self.vars = set()
-        for t in self.terms:
-            self.vars.update(t.vars)
+        V = set()
+        for t in terms:
+            V.update(t.vars)
+        V = tuple(sorted(V))
+        pos = {s:i for i,s in enumerate(V)}
+        D = {}
+        for t in terms:
+            e = [0]*len(V)
+            for a in t.A:
+                e[pos[a.s]] += a.p
+            e = tuple(e)
+            D[e] = D.get(e,0) + t.coef
+        self._set(V,D)
+
+
+    def _set(self,V,D):
+        """Drop zero terms and indeterminates that are no longer used"""
+        D = {e:c for e,c in D.items() if c != 0}
+        used = [i for i in range(len(V)) if any(e[i] for e in D)]
+        if len(used) != len(V):
+            V = tuple(V[i] for i in used)
+            D = {tuple(e[i] for i in used):c for e,c in D.items()}
+        self.V = V
+        self.D = D
+        self.vars = set(V)
+
+
+    @classmethod
+    def from_dict(cls,D,V):
+        """MVPoly from a dict of exponent tuples that line up with the indeterminates V"""
+        P = cls.__new__(cls)
+        P._set(tuple(V),dict(D))
+        return P
+
+
+    def aligned(self,V):
+        """Terms with exponents lined up with V, which must include every indeterminate used"""
+        V = tuple(V)
+        if V == self.V:
+            return self.D
+        pos = [V.index(s) for s in self.V]
+        out = {}
+        for e,c in self.D.items():
+            f = [0]*len(V)
+            for i,p in zip(pos,e):
+                f[i] = p
+            out[tuple(f)] = c
+        return out
+
+
+    @property
+    def terms(self):
+        """The terms as Particles in the order they are printed"""
+        out = []
+        for e,c in self.D.items():
+            A = [Atom(s,p) for s,p in zip(self.V,e) if p != 0]
+            out.append(Particle(A,c))
+        return sorted(out,key=particle_key)
+
 
     def __len__(self):
         """Numbers of terms used"""
-        return len(self.terms)
+        return len(self.D)
 
     def __str__(self):
         """Print the MVPoly"""
         if len(self) == 0:
             return "0"
-        out = str(self.terms[0])
-        for term in self.terms[1:]:
+        terms = self.terms
+        out = str(terms[0])
+        for term in terms[1:]:
             sgn = "-" if term.coef < 0 else "+"
             out +=  " " + sgn + " " + str(abs(term))
         return out
     
 
     def __eq__(self,other):
-        """Check if two polynomials have identical Particles"""
+        """Check if two polynomials have identical terms"""
         if type(other) != MVPoly:
             return False
-        return self.terms == other.terms
+        return self.V == other.V and self.D == other.D
     
 
     def __mul__(self,other):
         """Multiply together two polynomials"""
-        if type(other) == MVPoly:
-            out = []
-            for p in self.terms:
-                for q in other.terms:
-                    out.append(p*q)
-            return MVPoly(out)
-        else:
-            out = []
-            for p in self.terms:
-                out.append(p*other)
-            return MVPoly(out)
+        if type(other) not in (MVPoly,Particle,Atom):
+            return MVPoly.from_dict({e:c*other for e,c in self.D.items()},self.V)
+        other = as_mvpoly(other)
+        V = tuple(sorted(self.vars | other.vars))
+        return MVPoly.from_dict(heap_mult(self.aligned(V),other.aligned(V)),V)
 
 
     def __rmul__(self,other):
@@ -332,13 +387,12 @@ class MVPoly:
 
     def __add__(self,other):
         """MVPoly addition"""
-        if type(other) == MVPoly:
-            return MVPoly(self.terms+other.terms)
-        if type(other) == Particle:
-            return MVPoly(self.terms+[other])
-        if type(other) == Atom:
-            return MVPoly(self.terms+[Particle([other])])
-        return MVPoly(self.terms+[Particle([],other)])
+        other = as_mvpoly(other)
+        V = tuple(sorted(self.vars | other.vars))
+        D = dict(self.aligned(V))
+        for e,c in other.aligned(V).items():
+            D[e] = D.get(e,0) + c
+        return MVPoly.from_dict(D,V)
 
 
     def __radd__(self,other):
@@ -359,38 +413,119 @@ class MVPoly:
         assert other >= 0
         if other == 0:
             return 1
-        if other == 1:
-            return self
-        else:
-            out = self
-            for i in range(other-1):
-                out *= self
-            return out
+        out = None
+        base = self
+        while other:
+            if other & 1:
+                out = base if out is None else out*base
+            other >>= 1
+            if other:
+                base = base*base
+        return out
 
 
     def __neg__(self):
-        a = [-i for i in self.terms]
-        return MVPoly(a)
+        return MVPoly.from_dict({e:-c for e,c in self.D.items()},self.V)
     
     
     def copy(self):
-        return MVPoly([t.copy() for t in self.terms])
+        return MVPoly.from_dict(self.D,self.V)
     
     
     def evaluate(self,V):
         """Partially or entirely evaluate all terms of the MVPoly"""
         assert type(V) == dict
-        a = [t.evaluate(V) for t in self.terms]
-        return MVPoly(a)
+        D = {}
+        for e,c in self.D.items():
+            f = list(e)
+            for i,s in enumerate(self.V):
+                if s in V and e[i] != 0:
+                    c = c * V[s]**e[i]
+                    f[i] = 0
+            f = tuple(f)
+            D[f] = D.get(f,0) + c
+        return MVPoly.from_dict(D,self.V)
 
 
     def derivative(self,T):
         """Partial derivative"""
         assert type(T) == list
         assert all([type(t) == str for t in T])
-        a = [t.derivative(T) for t in self.terms]
-        return MVPoly(a)
-
+        D = self.D
+        for t in T:
+            if t not in self.vars:
+                return MVPoly([])
+            i = self.V.index(t)
+            new = {}
+            for e,c in D.items():
+                if e[i] != 0:
+                    f = e[:i] + (e[i]-1,) + e[i+1:]
+                    new[f] = new.get(f,0) + c*e[i]
+            D = new
+        return MVPoly.from_dict(D,self.V)
+
+
+
+def as_mvpoly(P):
+    """Convert an Atom, Particle or constant to an MVPoly"""
+    if type(P) == MVPoly:
+        return P
+    if type(P) == Atom:
+        return MVPoly([Particle([P])])
+    if type(P) == Particle:
+        return MVPoly([P])
+    return MVPoly([Particle([],P)])
+
+
+def particle_key(part):
+    """Sort key that puts Particles in the same order as Particle.__lt__"""
+    return (-len(part.A), -sum([a.p for a in part.A]),
+            tuple([-ord(a.s) for a in part.A]), tuple([-a.p for a in part.A]))
+
+
+def heap_mult(A, B):
+    """Product of two dicts of exponent tuples by Johnson's heap method"""
+    if len(A) == 0 or len(B) == 0:
+        return {}
+    n = len(next(iter(A)))
+
+    # Each monomial is packed into a single int, first indeterminate in the
+    # highest bits, with enough room that adding two never carries. Then
+    # multiplying monomials is addition and comparing them is lex order.
+    bits = []
+    for i in range(n):
+        top = max(e[i] for e in A) + max(e[i] for e in B)
+        bits.append(top.bit_length())
+    shifts = [sum(bits[i+1:]) for i in range(n)]
+
+    def pack(e):
+        return sum([p << s for p,s in zip(e,shifts)])
+
+    P = sorted([(pack(e),c) for e,c in A.items()],reverse=True)
+    Q = sorted([(pack(e),c) for e,c in B.items()],reverse=True)
+    if len(P) > len(Q):
+        P,Q = Q,P
+
+    # The heap holds at most one product P[i]*Q[j] for each row i, the next
+    # row only starts once P[i]*Q[0] has been taken so the heap stays small.
+    # The rows run over the shorter operand so it has min(#P,#Q) entries.
+    heap = [(-(P[0][0]+Q[0][0]),0,0)]
+    out = {}
+    while heap:
+        key = heap[0][0]
+        c = 0
+        while heap and heap[0][0] == key:
+            _,i,j = heappop(heap)
+            c += P[i][1]*Q[j][1]
+            if j == 0 and i+1 < len(P):
+                heappush(heap,(-(P[i+1][0]+Q[0][0]),i+1,0))
+            if j+1 < len(Q):
+                heappush(heap,(-(P[i][0]+Q[j+1][0]),i,j+1))
+        if c != 0:
+            out[-key] = c
+
+    masks = [(1 << b)-1 for b in bits]
+    return {tuple([(k >> s) & m for s,m in zip(shifts,masks)]):c for k,c in out.items()}
 
 
 
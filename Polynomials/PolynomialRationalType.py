@@ -6,9 +6,12 @@
 ## TODO: Rational roots
 ## TODO: Lagrange interpolation
 
-from Polynomials.PolyUtils import poly_print, poly_add, poly_mult
+from Polynomials.PolyUtils import poly_print, poly_add
+from Polynomials.PolyMultiplication import KRONECKER_THRESHOLD, poly_mult
+from Polynomials.PolyDivision import DIVISION_THRESHOLD, fast_divmod
+from Polynomials.MultipointEvaluation import horner, multipoint_evaluate, fast_interpolate
 from Polynomials.PolynomialIntegerTypeUtils import poly_print_simple
-from ModularArithmetic import gcd
+from ModularArithmetic import gcd, lcm
 from math import copysign
 #from Computation.Factorization import factorization
 from Rationals.RationalType import Rational
@@ -41,10 +44,7 @@ class QPoly:
 
     def __call__(self,x):
         """Evaluate the polynomial at a given point"""
-        out = 0
-        for pwr,coef in enumerate(self.coef):
-            out = out + coef*(x**pwr)
-        return out
+        return horner(self.coef,x)
 
 
     def __str__(self):
@@ -104,8 +104,11 @@ class QPoly:
         """Multiply a polynomial by polynomial"""
         if type(poly)  == int or type(poly) == Rational:
             poly = QPoly([poly])
-            
-        L = poly_mult(self.coef,poly.coef)
+        
+        if min(len(self),len(poly)) >= KRONECKER_THRESHOLD:
+            L = rational_mult(self.coef,poly.coef)
+        else:
+            L = poly_mult(self.coef,poly.coef)
         return QPoly(L)
 
 
@@ -115,17 +118,17 @@ class QPoly:
 
 
     def __pow__(self,pwr):
-        """Multiply a polynomial by itself"""
-        if pwr == 0:
-            return QPoly([1])
-        if pwr == 1:
-            return self
-        else:
-            assert type(pwr) == int, f"{pwr} is not an integer"
-            assert type(pwr) > 0, f"{pwr} is negative"
-            out = self.copy()
-            for i in range(pwr-1):
-                out *= self
+        """Raise the polynomial to a power by repeated squaring"""
+        assert type(pwr) == int, f"{pwr} is not an integer"
+        assert pwr >= 0, f"{pwr} is negative"
+        out = QPoly([1])
+        base = self
+        while pwr:
+            if pwr & 1:
+                out = out*base
+            pwr >>= 1
+            if pwr:
+                base = base*base
         return out
 
 
@@ -162,6 +165,10 @@ class QPoly:
             return QPoly([p/Q[0] for p in P]), QPoly([0])
         # Use polynomial division algorithm, rationals are a field so this is
         # always defined
+        # Large divisions use Newton iteration
+        elif min(len(Q)-1,len(P)-len(Q)+1) >= DIVISION_THRESHOLD:
+            qt, rm = fast_divmod(P,Q,mult=lambda A,B,m: rational_mult(A,B))
+            return QPoly(qt), QPoly(rm)
         else:
             dP = len(P)-1
             dQ = len(Q)-1
@@ -226,11 +233,10 @@ class QPoly:
     def evaluate(self,X):
         """Evaluate the polynomial at a given list of points"""
         assert type(X) == list
-        out = [0]*len(X)
-        for pwr,coef in enumerate(self.coef):
-            for pos,x in enumerate(X):
-                out[pos] = (out[pos] + coef*(x**pwr))
-        return out
+        # Many integer points at once are evaluated with a subproduct tree
+        if all(type(x) == int for x in X):
+            return multipoint_evaluate(self.coef,X)
+        return [horner(self.coef,x) for x in X]
 
 
     def degree(self):
@@ -267,18 +273,24 @@ def monic(poly):
     return QPoly([p/poly.coef[-1] for p in poly.coef])
 
 
+def rational_mult(P,Q):
+    """Multiply lists of rationals by clearing denominators first"""
+    P = [Rational(c) if type(c) == int else c for c in P]
+    Q = [Rational(c) if type(c) == int else c for c in Q]
+    # Scaling both lists to integers lets the fast integer multiplication
+    # algorithms do the work and leaves only one division per coefficient
+    dP = lcm([c.d for c in P])
+    dQ = lcm([c.d for c in Q])
+    A = poly_mult([c.n*(dP//c.d) for c in P],[c.n*(dQ//c.d) for c in Q])
+    D = dP*dQ
+    return [Rational(a,D) for a in A]
+
+
 def lagrange_interpolation(X,Y):
     """Lagrange Polynomial"""
-    final = QPoly([0])
-    for x,y in zip(X,Y):
-        out = QPoly([y])
-        for m in X:
-            if m != x:
-                d = Rational(1,(x-m))
-                P = QPoly([-m,1])
-                out *= P*d
-        final += out
-    return final
+    # Built from the subproduct tree of the points rather than multiplying
+    # out each basis polynomial separately
+    return QPoly(fast_interpolate(X,Y))
 
 
 if __name__ == '__main__':
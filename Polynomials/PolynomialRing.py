@@ -1,7 +1,9 @@
 # Univariate polynomials with coefficients from any ring
 
 
-from Polynomials.PolyUtils import poly_print, poly_add, poly_mult
+from Polynomials.PolyUtils import poly_print, poly_add
+from Polynomials.PolyMultiplication import poly_mult
+from Polynomials.MultipointEvaluation import horner
 from Polynomials.PolynomialIntegerTypeUtils import poly_print_simple
 
 class RPoly:
@@ -25,10 +27,7 @@ class RPoly:
 
     def __call__(self,x):
         """Evaluate the polynomial at a given point"""
-        out = 0
-        for pwr,coef in enumerate(self.coef):
-            out = out + coef*(x**pwr)
-        return out
+        return horner(self.coef,x)
 
 
     def __str__(self):
@@ -99,17 +98,17 @@ class RPoly:
 
 
     def __pow__(self,pwr):
-        """Multiply a polynomial by itself"""
-        if pwr == 0:
-            return RPoly([1])
-        if pwr == 1:
-            return self
-        else:
-            assert type(pwr) == int, f"{pwr} is not an integer"
-            assert type(pwr) > 0, f"{pwr} is negative"
-            out = self.copy()
-            for i in range(pwr-1):
-                out *= self
+        """Raise the polynomial to a power by repeated squaring"""
+        assert type(pwr) == int, f"{pwr} is not an integer"
+        assert pwr >= 0, f"{pwr} is negative"
+        out = RPoly([1])
+        base = self
+        while pwr:
+            if pwr & 1:
+                out = out*base
+            pwr >>= 1
+            if pwr:
+                base = base*base
         return out
 
 
@@ -211,11 +210,7 @@ class RPoly:
     def evaluate(self,X):
         """Evaluate the polynomial at a given list of points"""
         assert type(X) == list
-        out = [0]*len(X)
-        for pwr,coef in enumerate(self.coef):
-            for pos,x in enumerate(X):
-                out[pos] = (out[pos] + coef*(x**pwr))
-        return out
+        return [horner(self.coef,x) for x in X]
 
 
     def degree(self):
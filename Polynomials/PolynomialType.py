@@ -1,5 +1,8 @@
-from Polynomials.PolyUtils import poly_print, poly_add, poly_repr, poly_mult, \
-                                  poly_divmod, poly_norm, poly_derivative
+from Polynomials.PolyUtils import poly_print, poly_add, poly_repr, poly_norm, \
+                                  poly_derivative
+from Polynomials.PolyMultiplication import poly_mult
+from Polynomials.PolyDivision import PolyModulus, poly_powmod, poly_divmod
+from Polynomials.MultipointEvaluation import horner, multipoint_evaluate
 
 class Polynomial:
     
@@ -128,15 +131,17 @@ class Polynomial:
 
 
     def __pow__(self,pwr):
-        """Multiply a polynomial by itself"""
-        if pwr == 0:
-            return Polynomial([1],self.modulus)
-        if pwr == 1:
-            return self
-        else:
-            out = self
-            for i in range(pwr-1):
-                out *= self
+        """Raise the polynomial to a power by repeated squaring"""
+        assert type(pwr) == int, f"{pwr} is not an integer"
+        assert pwr >= 0, f"{pwr} is negative"
+        out = Polynomial([1],self.modulus)
+        base = self
+        while pwr:
+            if pwr & 1:
+                out = out*base
+            pwr >>= 1
+            if pwr:
+                base = base*base
         return out
 
 
@@ -151,14 +156,19 @@ class Polynomial:
     
     def __divmod__(self,poly):
         """Get the quotient and remainder of one polynomial by another"""
-        a,b = poly_divmod(self.coef,poly.coef,self.modulus)
+        if type(poly) == PolyModulus:
+            if self.modulus != poly.modulus:
+                raise Exception("Modulus does not match.")
+            a,b = poly.divmod(self.coef)
+        else:
+            a,b = poly_divmod(self.coef,poly.coef,self.modulus)
         return Polynomial(a,self.modulus), Polynomial(b,self.modulus)
 
 
     def __mod__(self,poly):
         """Get the remainder of one polynomial divided by another"""
-        a,b = poly_divmod(self.coef,poly.coef,self.modulus)
-        return Polynomial(b,self.modulus)
+        a,b = divmod(self,poly)
+        return b
     
     
     def __getitem__(self,n):
@@ -178,13 +188,11 @@ class Polynomial:
         """Evaluate the polynomial at a given point or points"""
         if type(X) != list:
             X = [X]
-        out = [0]*len(X)
-        for pwr,coef in enumerate(self.coef):
-            for pos,x in enumerate(X):
-                if self.modulus != 0:
-                    out[pos] = (out[pos] + coef*(x**pwr)) % self.modulus
-                else:
-                    out[pos] = (out[pos] + coef*(x**pwr))
+        # Many integer points at once are evaluated with a subproduct tree
+        if self.modulus != 0 and all(type(x) == int for x in X):
+            out = multipoint_evaluate(self.coef,X,self.modulus)
+        else:
+            out = [horner(self.coef,x,self.modulus) for x in X]
         
         if len(out) == 1:
             return out[0]
@@ -197,4 +205,29 @@ class Polynomial:
 
     def degree(self):
         """Degree of the polynomial"""
-        return len(self)-1
\ No newline at end of file
+        return len(self)-1
+
+
+
+def powmod(base,e,modulus):
+    """Raise a polynomial to a power, reducing by the modulus polynomial after every step"""
+    if type(base) == Polynomial:
+        if type(modulus) != PolyModulus:
+            if type(modulus) != Polynomial:
+                modulus = Polynomial(modulus,base.modulus)
+            modulus = PolyModulus(modulus)
+        if base.modulus != modulus.modulus:
+            raise Exception("Modulus does not match.")
+        return Polynomial(poly_powmod(base.coef,e,modulus),base.modulus)
+
+    # Other polynomial types only need to support * and %
+    assert e >= 0, f"{e} is negative"
+    out = type(base)([1]) % modulus
+    base = base % modulus
+    while e:
+        if e & 1:
+            out = (out*base) % modulus
+        e >>= 1
+        if e:
+            base = (base*base) % modulus
+    return out
\ No newline at end of file
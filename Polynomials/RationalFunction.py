@@ -1,4 +1,5 @@
 from Polynomials.PolynomialRationalType import QPoly
+from Polynomials.PolynomialGCD import qpoly_gcd
 
 ## TODO: rational fractions will be ratios of QPoly
 ## TODO: rational expressions will be sums of rational fraction
@@ -18,7 +19,16 @@ class RationalFrac:
 
     # Will have to return a new object because type could change
     def simplify(self):
-        pass
+        """Cancel common factors, the denominator is made monic"""
+        g = qpoly_gcd(self.n,self.d)
+        n = self.n // g
+        d = self.d // g
+        lead = d.coef[-1]
+        n = QPoly([c/lead for c in n.coef])
+        d = QPoly([c/lead for c in d.coef])
+        if len(d) == 1:
+            return n
+        return RationalFrac(n,d)
 
 #    TODO: Floats cause errors here gotta fix that
 #    def evaluate(self,X):
@@ -46,6 +56,8 @@ if __name__ == '__main__':
     Q = QPoly([1,3])
     R = RationalFrac(P,Q)
     print(R)
+    print(RationalFrac(P*Q,Q*Q).simplify())
+    print(RationalFrac(P*Q,Q).simplify())
     
     
 #    import matplotlib.pyplot as plt
@@ -1,6 +1,49 @@
-from PolynomialType import Polynomial
+import numpy as np
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+from Polynomials.PolynomialType import Polynomial
+from Polynomials.PolyArray import ARRAY_MODULUS_LIMIT
+from Polynomials.MultipointEvaluation import horner
 from PrimeNumbers import is_prime
-from random import randint
+
+# Shamir's secret sharing hides the secret S as the constant term of a random
+# polynomial of degree k-1 over GF(p). Each person gets one point on the
+# polynomial and any k of them can recover S by interpolating at zero.
+#
+# Sharing many secrets with the same people means evaluating many polynomials
+# at the same few points, which is done for all of them at once with NumPy.
+# Recovering from a fixed set of share ids uses the same Lagrange weights for
+# every secret so those are computed once.
+
+# Batches with at least this many secrets are split between worker processes
+# when the caller asks for them
+PARALLEL_THRESHOLD = 2**15
+
+
+def _random_field_elements(count, p):
+    """List of count uniformly random integers from 0 to p-1"""
+    if count == 0:
+        return []
+    if p >= ARRAY_MODULUS_LIMIT:
+        return [secrets.randbelow(p) for i in range(count)]
+
+    # Draw 64-bit words in bulk and throw away the ones past the last whole
+    # multiple of p so that the reduction is unbiased
+    limit = (2**64 // p) * p
+    out = []
+    while len(out) < count:
+        need = count - len(out)
+        words = np.frombuffer(secrets.token_bytes(8*(need+need//8+1)),dtype=np.uint64)
+        words = words[words < np.uint64(limit)][:need]
+        out.extend((words % np.uint64(p)).astype(np.int64).tolist())
+    return out
+
+
+def _check_parameters(n, k, p):
+    assert is_prime(p), "p must be prime"
+    assert p > n, "p must be strictly greater than n"
+    assert 0 < k <= n, "k must be between 1 and n"
+
 
 # S: the secret
 # n: the number of people to share with
@@ -8,20 +51,129 @@ from random import randint
 # p: the order of the field used, a prime
 def shamir(S,n,k,p):
     assert p > S, "p must be strictly greater than S"
-    assert p > n, "p must be strictly greater than n"
-    assert is_prime(p), "p must be prime"
-        
-    A = [S] + [randint(1,p) for i in range(k-1)]
-    
+    _check_parameters(n,k,p)
+
+    A = [S] + _random_field_elements(k-1,p)
+
     PA = Polynomial(A,p)
-    
+
     ps = [(i,PA.evaluate(i)) for i in range(1,n+1)]
-    
+
     return ps
-    
-    
-    
-S = shamir(1234,6,3,1931)
 
-for i in S:
-    print(i)
\ No newline at end of file
+
+def _split_block(S, n, k, p):
+    """Share values for a block of secrets, one row per person"""
+    ids = list(range(1,n+1))
+    C = _random_field_elements(len(S)*(k-1),p)
+
+    if p < ARRAY_MODULUS_LIMIT:
+        # Horner's method on every polynomial at every point at once, each row
+        # of A holds the coefficients of one polynomial
+        A = np.array(S,dtype=np.int64).reshape(-1,1)
+        if k > 1:
+            A = np.hstack([A,np.array(C,dtype=np.int64).reshape(len(S),k-1)])
+        X = np.array(ids,dtype=np.int64)
+        out = np.zeros((n,len(S)),dtype=np.int64)
+        for j in range(k-1,-1,-1):
+            out = (out * X.reshape(-1,1) + A[:,j]) % p
+        return out.tolist()
+
+    polys = [[s] + C[i*(k-1):(i+1)*(k-1)] for i,s in enumerate(S)]
+    return [[horner(P,x,p) for P in polys] for x in ids]
+
+
+def shamir_split_many(S, n, k, p, workers = None):
+    """Share every secret in S between n people so that any k can recover them"""
+    _check_parameters(n,k,p)
+    S = list(S)
+    assert all(0 <= s < p for s in S), "every secret must be between 0 and p-1"
+
+    if workers and len(S) >= PARALLEL_THRESHOLD:
+        size = -(-len(S) // workers)
+        blocks = [S[i:i+size] for i in range(0,len(S),size)]
+        rows = [[] for i in range(n)]
+        with ProcessPoolExecutor(workers) as ex:
+            for part in ex.map(_split_block,blocks,[n]*len(blocks),
+                               [k]*len(blocks),[p]*len(blocks)):
+                for row,vals in zip(rows,part):
+                    row.extend(vals)
+    else:
+        rows = _split_block(S,n,k,p)
+
+    # Same layout as shamir, one (id, shares) pair per person
+    return [(i,row) for i,row in enumerate(rows,1)]
+
+
+def lagrange_weights(ids, p):
+    """Weights that recover the constant term from shares with the given ids"""
+    assert len(set(x % p for x in ids)) == len(ids), "share ids must be distinct"
+
+    # The Lagrange basis polynomial for x_i evaluated at zero is the product of
+    # x_j/(x_j - x_i) over every other share
+    W = []
+    for i,xi in enumerate(ids):
+        num, den = 1, 1
+        for j,xj in enumerate(ids):
+            if i != j:
+                num = num * xj % p
+                den = den * (xj - xi) % p
+        W.append(num * pow(den,-1,p) % p)
+    return W
+
+
+def _recover_block(Y, W, p):
+    """Secrets from one block of share values given the weights for their ids"""
+    if p < ARRAY_MODULUS_LIMIT:
+        out = np.zeros(len(Y[0]),dtype=np.int64)
+        for w,row in zip(W,Y):
+            out = (out + w * np.array(row,dtype=np.int64)) % p
+        return out.tolist()
+
+    out = [0]*len(Y[0])
+    for w,row in zip(W,Y):
+        out = [(a + w*y) % p for a,y in zip(out,row)]
+    return out
+
+
+def shamir_recover_many(shares, p, weights = None, workers = None):
+    """Recover every secret from a list of (id, shares) pairs as made by shamir_split_many"""
+    ids = [i for i,row in shares]
+    Y = [row for i,row in shares]
+    assert len(set(len(row) for row in Y)) == 1, "every person must hold the same number of shares"
+    if weights is None:
+        weights = lagrange_weights(ids,p)
+    assert len(weights) == len(ids), "need one weight for each share id"
+
+    N = len(Y[0])
+    if workers and N >= PARALLEL_THRESHOLD:
+        size = -(-N // workers)
+        blocks = [[row[i:i+size] for row in Y] for i in range(0,N,size)]
+        out = []
+        with ProcessPoolExecutor(workers) as ex:
+            for part in ex.map(_recover_block,blocks,[weights]*len(blocks),
+                               [p]*len(blocks)):
+                out.extend(part)
+        return out
+
+    return _recover_block(Y,weights,p)
+
+
+def shamir_recover(shares, p):
+    """Recover the secret from a list of (id, share) pairs as made by shamir"""
+    return shamir_recover_many([(i,[y]) for i,y in shares],p)[0]
+
+
+
+if __name__ == '__main__':
+    S = shamir(1234,6,3,1931)
+
+    for i in S:
+        print(i)
+
+    print(shamir_recover(S[2:5],1931))
+
+    secret_list = [secrets.randbelow(1931) for i in range(10)]
+    shares = shamir_split_many(secret_list,6,3,1931)
+    print(secret_list)
+    print(shamir_recover_many(shares[:3],1931))
@@ -1,6 +1,9 @@
-from Polynomials.PolynomialType import Polynomial
+from Polynomials.PolynomialType import Polynomial, powmod
 from Polynomials.RationalRoots import rational_roots
 from Polynomials.BernsteinPolynomials import bernstein_polynomial
 from Polynomials.PolynomialMultiType import Atom, Particle, MVPoly
-__all__=["Polynomial","rational_roots","bernstein_polynomial",
-         "Atom","Particle","MVPoly"]
\ No newline at end of file
+from Polynomials.FiniteFields import GF, GFElement
+from Polynomials.FiniteFieldFactoring import factor_modp, is_irreducible
+__all__=["Polynomial","powmod","rational_roots","bernstein_polynomial",
+         "Atom","Particle","MVPoly","GF","GFElement","factor_modp",
+         "is_irreducible"]
\ No newline at end of file
@@ -0,0 +1,86 @@
+from math import isqrt
+from PrimeNumbers.MillerRabinTest import miller_rabin_test
+
+# The Baillie-PSW test combines a strong probable prime test to base 2 with a
+# strong Lucas probable prime test. The pseudoprimes for the two tests seem to
+# have almost nothing in common and no number passing both has been found.
+# Every composite below 2^64 is known to fail it.
+
+def jacobi(a,n):
+    """Jacobi symbol (a/n) for odd positive n"""
+    a %= n
+    out = 1
+    while a != 0:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3,5):
+                out = -out
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            out = -out
+        a %= n
+    return out if n == 1 else 0
+
+
+def _halve(x,n):
+    """x/2 modulo odd n"""
+    if x % 2 == 1:
+        x += n
+    return (x // 2) % n
+
+
+def strong_lucas_test(n):
+    """Strong Lucas probable prime test with Selfridge's parameters"""
+    if n == 2:
+        return True
+    if n < 2 or n % 2 == 0:
+        return False
+    # Only a square can keep the search for D below going forever
+    r = isqrt(n)
+    if r*r == n:
+        return False
+
+    # First D in 5, -7, 9, -11, ... with (D/n) = -1
+    D = 5
+    while True:
+        j = jacobi(D,n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D-2 if D > 0 else -D+2
+    P, Q = 1, (1-D)//4
+
+    d, s = n+1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    # U_k, V_k and Q^k by doubling and stepping through the bits of d
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U, V = U*V % n, (V*V - 2*Qk) % n
+        Qk = Qk*Qk % n
+        if bit == "1":
+            U, V = _halve(P*U + V,n), _halve(D*U + P*V,n)
+            Qk = Qk*Q % n
+
+    if U == 0 or V == 0:
+        return True
+    for i in range(s-1):
+        V = (V*V - 2*Qk) % n
+        Qk = Qk*Qk % n
+        if V == 0:
+            return True
+    return False
+
+
+def baillie_psw_test(n):
+    """Baillie-PSW primality test"""
+    if n < 2:
+        return False
+    if n < 4:
+        return True
+    if n % 2 == 0:
+        return False
+    return miller_rabin_test(n,[2]) and strong_lucas_test(n)
@@ -4,10 +4,15 @@
 # However with the default set of witnesses this is deterministic only for
 # number up to 2^80
 
-# Test if a number is composite for a given base
+# Test if a number is composite for a given base, n-1 = 2^r * d with d odd
 def is_composite(a,d,n,r):
-    for i in range(0,r+1):
-        if pow(a,2**i*d,n) == 1:
+    # a^(2^i*d) comes from squaring the previous one rather than a new pow
+    x = pow(a,d,n)
+    if x == 1 or x == n-1:
+        return False
+    for i in range(r-1):
+        x = x*x % n
+        if x == n-1:
             return False
     return True
 
@@ -31,8 +36,9 @@ def miller_rabin_test(n,W=[],silent=False):
         d //= 2
         r += 1
     for witness in W:
-        if witness >= n:
-            break
+        witness %= n
+        if witness == 0:
+            continue
         # If the test for compositeness returns true we know for certain the
         # number is composite and we return false
         if is_composite(witness,d,n,r):
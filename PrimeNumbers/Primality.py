@@ -1,29 +1,93 @@
 from PrimeNumbers.MillerRabinTest import miller_rabin_test
-from math import ceil, sqrt
+from PrimeNumbers.BailliePSWTest import baillie_psw_test
+import numpy as np
+
+# Small primes removed by trial division before any stronger test
+W = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61,
+     67, 71, 73, 79, 83, 89, 97]
+
+# Witness sets that make Miller-Rabin deterministic below a bound. Jaeschke
+# showed 2, 7, 61 are enough below 4759123141 and Sinclair found seven bases
+# that cover every n below 2^64
+WITNESSES_32 = [2, 7, 61]
+WITNESSES_64 = [2, 325, 9375, 28178, 450775, 9780504, 1795265022]
+
 
 def is_prime(n):
-    
-    W = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 
-         67, 71, 73, 79, 83, 89, 97, 101, 103, 107, 109, 113, 127, 131, 137, 
-         139, 149, 151, 157, 163, 167, 173, 179, 181, 191, 193, 197, 199, 211, 
-         223, 227, 229, 233, 239, 241, 251, 257, 263, 269, 271, 277, 281, 283, 
-         293, 307, 311, 313, 317, 331, 337, 347, 349, 353, 359, 367, 373, 379, 
-         383, 389, 397, 401, 409, 419, 421, 431, 433, 439, 443, 449, 457, 461, 
-         463, 467, 479, 487, 491, 499, 503, 509, 521, 523, 541, 547, 557, 563, 
-         569, 571, 577, 587, 593, 599, 601, 607, 613, 617, 619, 631, 641, 643, 
-         647, 653, 659, 661, 673, 677, 683, 691, 701, 709, 719, 727, 733, 739, 
-         743, 751, 757, 761, 769, 773, 787, 797, 809, 811, 821, 823, 827, 829, 
-         839, 853, 857, 859, 863, 877, 881, 883, 887, 907, 911, 919, 929, 937, 
-         941, 947, 953, 967, 971, 977, 983, 991, 997]
+    """Deterministic primality test"""
+    if n < 2:
+        return False
 
     # First check small numbers since trial division terminates quickly
-    x = ceil(sqrt(n))+1
     for i in W:
-        if i >= x:
-            return True
         if n % i == 0:
-            return False
-    # Otherwise use the Miller-Rabin test with the first 168 bases
-    # Random hardware errors are significantly more likely than the test finding
-    # a strong pseudo-prime. It is determinist for numbers up to at least 2^80
-    return miller_rabin_test(n,W)
\ No newline at end of file
+            return n == i
+    if n < 97*97:
+        return True
+
+    if n < 2**32:
+        return miller_rabin_test(n,WITNESSES_32)
+    if n < 2**64:
+        return miller_rabin_test(n,WITNESSES_64)
+    # No counterexample to Baillie-PSW is known and every composite below
+    # 2^64 fails it
+    return baillie_psw_test(n)
+
+
+def _powmod_array(a, e, n):
+    """a^e modulo n elementwise for uint64 arrays with n < 2^32"""
+    out = np.ones_like(n)
+    a = a % n
+    e = e.copy()
+    while e.any():
+        odd = (e & 1) == 1
+        out = np.where(odd,out*a % n,out)
+        a = a*a % n
+        e >>= 1
+    return out
+
+
+def is_prime_many(L):
+    """Primality of each element of an array or list of integers, as a boolean array"""
+    A = np.asarray(L)
+    if A.dtype == object or not np.issubdtype(A.dtype,np.integer):
+        return np.array([is_prime(int(n)) for n in A],dtype=bool)
+
+    out = np.zeros(A.shape,dtype=bool)
+    small = (A >= 2) & (A < 2**32)
+    # Anything larger is tested one at a time
+    for i in np.flatnonzero(~small & (A >= 2**32)):
+        out.flat[i] = is_prime(int(A.flat[i]))
+
+    n = A[small].astype(np.uint64)
+    prime = np.ones(n.shape,dtype=bool)
+    undecided = np.ones(n.shape,dtype=bool)
+    for p in W:
+        div = n % p == 0
+        prime[div] = n[div] == p
+        undecided &= ~div
+    undecided &= n >= 97*97
+
+    # Miller-Rabin with the 32 bit witnesses, every product of two numbers
+    # below 2^32 fits in a uint64
+    m = n[undecided]
+    d = m-1
+    r = np.zeros(m.shape,dtype=np.uint64)
+    while True:
+        even = (d & 1) == 0
+        if not even.any():
+            break
+        d[even] >>= 1
+        r[even] += 1
+    ok = np.ones(m.shape,dtype=bool)
+    for a in WITNESSES_32:
+        x = _powmod_array(np.full(m.shape,a,dtype=np.uint64),d,m)
+        passed = (x == 1) | (x == m-1) | (a % m == 0)
+        for i in range(1,int(r.max()) if len(r) else 0):
+            x = x*x % m
+            passed |= (x == m-1) & (i < r)
+        ok &= passed
+    prime[undecided] = ok
+
+    out[small] = prime
+    return out
@@ -0,0 +1,109 @@
+from math import isqrt, log
+import numpy as np
+from PrimeNumbers.Sieve import primes_in_range
+
+# Lucy Hedgehog's method for pi(n) and sums of powers of primes. Only the
+# values S(v) for v = n//i are needed and there are about 2*sqrt(n) of them,
+# S(v) starts as the sum over every 2 <= m <= v and for each prime p up to
+# sqrt(n) in turn the numbers whose smallest prime factor is p are removed
+#
+#   S(v) -= p^k * (S(v//p) - S(p-1))    for every v >= p^2
+#
+# The values are kept as two arrays, small[v] = S(v) for v <= sqrt(n) and
+# large[i] = S(n//i), so every update for one prime is a few NumPy calls.
+# That is about n^(3/4)/log(n) work in total.
+
+def _power_sum(v, k):
+    """Sum of m^k for 2 <= m <= v, elementwise"""
+    if k == 0:
+        return v - 1
+    if k == 1:
+        return v*(v+1)//2 - 1
+    if k == 2:
+        return v*(v+1)*(2*v+1)//6 - 1
+    if k == 3:
+        return (v*(v+1)//2)**2 - 1
+    raise Exception("k must be 0, 1, 2 or 3")
+
+
+def _lucy(n, k):
+    r = isqrt(n)
+    # Exact int64 while the largest sum fits, Python ints otherwise
+    dt = np.int64 if n**(k+1) < 2**62 else object
+    v_small = np.arange(r+1,dtype=np.int64).astype(dt)
+    v_large = np.zeros(r+1,dtype=np.int64)
+    v_large[1:] = n // np.arange(1,r+1,dtype=np.int64)
+    small = _power_sum(v_small,k)
+    large = _power_sum(v_large.astype(dt),k)
+    small[0] = 0
+
+    for p in range(2,r+1):
+        if small[p] == small[p-1]:
+            continue
+        c = small[p-1]
+        pk = p**k
+        p2 = p*p
+
+        # S(n//i) for every i with n//i >= p^2. Since n//(ip) = (n//i)//p it
+        # is large[ip] when ip <= r and small[(n//i)//p] otherwise
+        L = min(r,n//p2)
+        m = min(L,r//p)
+        large[1:m+1] -= pk*(large[p:m*p+1:p] - c)
+        large[m+1:L+1] -= pk*(small[v_large[m+1:L+1]//p] - c)
+
+        if p2 <= r:
+            v = np.arange(p2,r+1)
+            small[p2:] -= pk*(small[v//p] - c)
+    return int(large[1]) if r > 0 else 0
+
+
+def prime_pi(n):
+    """Number of primes up to n"""
+    if n < 2:
+        return 0
+    return _lucy(n,0)
+
+
+def prime_sum(n, k = 1):
+    """Sum of p^k over the primes up to n, for k from 0 to 3"""
+    if n < 2:
+        return 0
+    return _lucy(n,k)
+
+
+def nth_prime(k):
+    """The kth prime, starting with nth_prime(1) = 2"""
+    assert k >= 1, "k must be positive"
+    if k < 6:
+        return [2,3,5,7,11][k-1]
+    # Close to p_k and then sieve the gap in whichever direction is needed
+    x = int(k*(log(k) + log(log(k)) - 1))
+    c = prime_pi(x)
+    width = max(2**16,int(8*log(x)**2))
+    if c < k:
+        lo = x+1
+        while True:
+            P = primes_in_range(lo,lo+width)
+            if c + len(P) >= k:
+                return int(P[k-c-1])
+            c += len(P)
+            lo += width
+    else:
+        hi = x+1
+        while True:
+            P = primes_in_range(max(hi-width,0),hi)
+            if c - len(P) < k:
+                return int(P[k-(c-len(P))-1])
+            c -= len(P)
+            hi -= width
+
+
+
+if __name__ == '__main__':
+    import time
+
+    for e in range(1,13):
+        t0 = time.time()
+        print(f"pi(10^{e}) = {prime_pi(10**e)}  ({time.time()-t0:.2f}s)")
+    print(f"sum of primes below 2*10^6 = {prime_sum(2*10**6)}")
+    print(f"the 10^9th prime is {nth_prime(10**9)}")
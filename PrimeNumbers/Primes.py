@@ -1,17 +1,7 @@
-## Generator that returns primes (not my work)
-def primes():
-    """Prime Numbers"""
-    D = {}
-    q = 2
-    
-    while True:
-        if q not in D:
-            
-            yield q
-                
-            D[q * q] = [q]
-        else:
-            for p in D[q]:
-                D.setdefault(p + q, []).append(p)
-            del D[q]
-        q += 1
+from PrimeNumbers.Sieve import prime_blocks
+
+# Every prime generator in the project streams from the segmented sieve
+def primes(start = 0):
+    """Prime Numbers, beginning with the first prime at least start"""
+    for block in prime_blocks(start):
+        yield from block.tolist()
\ No newline at end of file
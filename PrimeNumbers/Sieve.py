@@ -0,0 +1,201 @@
+from math import isqrt
+import numpy as np
+from PrimeNumbers.Primality import is_prime
+
+# Segmented sieve of Eratosthenes on a mod 30 wheel. Only the eight residues
+# coprime to 30 can be prime (besides 2, 3 and 5) so each byte of a segment
+# holds the numbers 30k+1, 30k+7, ..., 30k+29 as its eight bits. A segment of
+# SEGMENT_BYTES bytes covers 30*SEGMENT_BYTES numbers and fits in L1 cache.
+#
+# Multiples of p in the residue class r are p*m with m = r/p (mod 30), which
+# lie in byte k = (p*m - r)/30 and every p bytes after that, so crossing off
+# p is eight strided slices for a small p. A large p hits each residue at most
+# a few times per segment and those hits are worked out for all the large
+# primes at once.
+#
+# Sieving by every prime up to sqrt(b) would take far longer than a short
+# range near 2^64 itself, so then sieving stops at BASE_LIMIT and the few
+# survivors are tested with the deterministic Miller-Rabin test instead.
+
+# Bytes per segment
+SEGMENT_BYTES = 2**15
+
+# Primes at least this large are crossed off by computed positions rather
+# than slices
+LARGE_PRIME = 2**10
+
+# Sieving primes up to this are kept. Far beyond BASE_LIMIT^2 a short range
+# is sieved only by them and the numbers left are checked with is_prime
+BASE_LIMIT = 2**22
+
+# Sieving primes above SEGMENT_BYTES are handled this many at a time
+FAR_BLOCK = 2**17
+
+# Bytes of a range sieved before its primes are collected
+WINDOW_BYTES = 2**22
+
+_RESIDUES = np.array([1,7,11,13,17,19,23,29],dtype=np.int64)
+
+# _MULT[p % 30][i] is the m with p*m = _RESIDUES[i] (mod 30)
+_MULT = np.zeros((30,8),dtype=np.int64)
+for _p in _RESIDUES.tolist():
+    for _i,_r in enumerate(_RESIDUES.tolist()):
+        _MULT[_p][_i] = _r * pow(_p,-1,30) % 30
+
+# Bit i of a byte is the residue _RESIDUES[i]
+_CLEAR = np.array([0xFF ^ (1 << i) for i in range(8)],dtype=np.uint8)
+
+_SMALL = {"N": 0, "P": np.zeros(0,dtype=np.int64)}
+
+
+def _simple_sieve(N):
+    """Primes up to N by an ordinary sieve, used to start everything off"""
+    is_p = np.ones(N+1,dtype=bool)
+    is_p[:2] = False
+    for p in range(2,int(N**0.5)+1):
+        if is_p[p]:
+            is_p[p*p::p] = False
+    return np.flatnonzero(is_p)
+
+
+def _starts(P):
+    """For each prime and residue the first byte at or after p^2 holding a multiple"""
+    m = _MULT[P % 30]
+    k = (P[:,None]*m - _RESIDUES[None,:]) // 30
+    # m + 30j >= p gives the first multiple that is at least p^2
+    j = np.maximum(0,(P[:,None] - m + 29) // 30)
+    return k + P[:,None]*j
+
+
+def _cross_off(seg, K0, P, start):
+    """Cross off the sieving primes P above 5 in bytes from K0, start is from _starts"""
+    S = len(seg)
+
+    # First byte at or after K0 for each prime and residue
+    first = np.where(start >= K0,start,start + (K0 - start + P[:,None] - 1) // P[:,None] * P[:,None]) - K0
+
+    small = P < LARGE_PRIME
+    for p,f in zip(P[small].tolist(),first[small].tolist()):
+        for i in range(8):
+            if f[i] < S:
+                seg[f[i]::p] &= _CLEAR[i]
+
+    # Each large prime has at most S/p hits in each residue, generate them
+    # all and clear them with one call
+    Pl, Fl = P[~small], first[~small]
+    if len(Pl):
+        step = np.repeat(Pl,8)
+        pos = Fl.ravel()
+        bit = np.tile(np.arange(8),len(Pl))
+        keep = pos < S
+        step, pos, bit = step[keep], pos[keep], bit[keep]
+        while len(pos):
+            np.bitwise_and.at(seg,pos,_CLEAR[bit])
+            pos = pos + step
+            keep = pos < S
+            step, pos, bit = step[keep], pos[keep], bit[keep]
+
+
+def _decode(seg, K0):
+    """Numbers whose bits are still set in a segment starting at byte K0"""
+    bits = np.flatnonzero(np.unpackbits(seg,bitorder="little"))
+    k = (bits >> 3).astype(np.uint64) + np.uint64(K0)
+    return k * np.uint64(30) + _RESIDUES[bits & 7].astype(np.uint64)
+
+
+def _sieving_primes(N):
+    """Primes above 5 up to N, those up to BASE_LIMIT are kept between calls"""
+    if N > BASE_LIMIT:
+        return np.concatenate([_sieving_primes(BASE_LIMIT),
+                               _primes_between(BASE_LIMIT+1,N+1).astype(np.int64)])
+    if N > _SMALL["N"]:
+        _SMALL["N"] = min(max(N,2*_SMALL["N"]),BASE_LIMIT)
+        _SMALL["P"] = _simple_sieve(_SMALL["N"])
+    P = _SMALL["P"]
+    return P[(P > 5) & (P <= N)]
+
+
+def _primes_between(a, b):
+    """Primes p with a <= p < b as a uint64 array"""
+    out = [np.array([p for p in (2,3,5) if a <= p < b],dtype=np.uint64)]
+    if b <= 7:
+        return out[0]
+    # Sieving by every prime up to sqrt(b) is only worth it when there are
+    # not many more of them than numbers in the range
+    r = isqrt(b-1)
+    full = r <= max(BASE_LIMIT,4*(b-a))
+    P = _sieving_primes(r if full else BASE_LIMIT)
+    near = P < SEGMENT_BYTES
+    P_near, P_far = P[near], P[~near]
+    start_near = _starts(P_near)
+
+    # The range is done WINDOW_BYTES at a time. Primes below SEGMENT_BYTES
+    # are crossed off one segment at a time so the bytes stay in cache, the
+    # rest hit a segment at most once per residue and are crossed off over
+    # the whole window a block of primes at a time
+    K_lo = max(a,7) // 30
+    K_hi = (b-1) // 30 + 1
+    for W0 in range(K_lo,K_hi,WINDOW_BYTES):
+        W1 = min(W0+WINDOW_BYTES,K_hi)
+        win = np.full(W1-W0,0xFF,dtype=np.uint8)
+        for K0 in range(W0,W1,SEGMENT_BYTES):
+            _cross_off(win[K0-W0:K0-W0+SEGMENT_BYTES],K0,P_near,start_near)
+        for i in range(0,len(P_far),FAR_BLOCK):
+            Q = P_far[i:i+FAR_BLOCK]
+            _cross_off(win,W0,Q,_starts(Q))
+        n = _decode(win,W0)
+        n = n[(n >= a) & (n < b) & (n != 1)]
+        # Otherwise what survives has no factor up to BASE_LIMIT and is
+        # tested directly
+        if not full:
+            n = n[[is_prime(int(x)) for x in n.tolist()]]
+        out.append(n)
+    return np.concatenate(out)
+
+
+def _segment_task(args):
+    return _primes_between(*args)
+
+
+def primes_in_range(a, b, workers = None):
+    """Primes p with a <= p < b as a NumPy array, b at most 2^64"""
+    assert 0 <= a and b <= 2**64, "the range must be within 0 to 2^64"
+    if b <= a:
+        return np.zeros(0,dtype=np.int64)
+    if workers is None:
+        P = _primes_between(a,b)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        span = -(-(b-a) // workers)
+        span = -(-span // 30) * 30
+        tasks = [(lo,min(lo+span,b)) for lo in range(a,b,span)]
+        with ProcessPoolExecutor(workers) as pool:
+            P = np.concatenate(list(pool.map(_segment_task,tasks)))
+    if b <= 2**63:
+        return P.astype(np.int64)
+    return P
+
+
+def prime_blocks(start = 0, size = 30*SEGMENT_BYTES):
+    """Arrays of the consecutive primes from start onward, one block of numbers at a time"""
+    lo = start
+    while True:
+        yield primes_in_range(lo,lo+size)
+        lo += size
+
+
+
+if __name__ == '__main__':
+    import time
+
+    print(primes_in_range(0,100))
+    print(primes_in_range(10**12,10**12+200))
+    print(primes_in_range(2**64-1000,2**64))
+
+    t0 = time.time()
+    P = primes_in_range(0,10**8)
+    print(f"{len(P)} primes below 10^8 in {time.time()-t0:.2f}s")
+
+    t0 = time.time()
+    P = primes_in_range(10**15,10**15+10**7)
+    print(f"{len(P)} primes in [10^15,10^15+10^7) in {time.time()-t0:.2f}s")
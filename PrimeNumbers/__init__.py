@@ -1,4 +1,7 @@
-from PrimeNumbers.Primality import is_prime
+from PrimeNumbers.Primality import is_prime, is_prime_many
 from PrimeNumbers.Primes import primes
+from PrimeNumbers.Sieve import primes_in_range, prime_blocks
+from PrimeNumbers.PrimeCounting import prime_pi, prime_sum, nth_prime
 
-__all__=["is_prime","primes"]
\ No newline at end of file
+__all__=["is_prime","is_prime_many","primes","primes_in_range","prime_blocks",
+         "prime_pi","prime_sum","nth_prime"]
\ No newline at end of file
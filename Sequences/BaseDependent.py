@@ -2,6 +2,7 @@ from Sequences.Simple import naturals, evens, powers
 from Sequences.Manipulations import offset
 from Sequences.MathUtils import digital_sum, digital_root, repeating_part, digital_prod, int_to_digits
 from Sequences.NiceErrorChecking import require_integers, require_geq
+from Sequences.Parallel import with_kernel
 
 
 def evil():
@@ -148,6 +149,7 @@ def base_length(B=10):
             yield n
 
 
+@with_kernel(digital_sum,first=0)
 def digital_sums(B=10):
     """
     Digital Sums: Sum of the digits of each non-negative integer in base B\n
@@ -205,6 +207,15 @@ def additive_persistence(B=10):
         yield ctr
 
 
+def _multiplicative_persistence(n,B=10):
+    ctr = 0
+    while n >= B:
+        ctr += 1
+        n = digital_prod(n,B)
+    return ctr
+
+
+@with_kernel(_multiplicative_persistence,first=0)
 def multiplicative_persistence(B=10):
     """
     Multiplicative persistence of each natural number in base B\n
@@ -215,12 +226,7 @@ def multiplicative_persistence(B=10):
     require_geq(["B"],[B],2)
     
     for n in naturals():
-        ctr = 0
-        while n >= B:
-            ctr += 1
-            n = digital_prod(n,B)
-        
-        yield ctr
+        yield _multiplicative_persistence(n,B)
 
 
 def palindrome(B=10):
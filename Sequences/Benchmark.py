@@ -0,0 +1,254 @@
+import argparse
+import json
+import platform
+import sys
+import tracemalloc
+from itertools import islice
+from statistics import median
+from time import perf_counter_ns, strftime
+
+# Benchmarks for the sequences and the algorithms under them. Each benchmark
+# is registered by name with a function make() and a number of terms n
+#
+#   sequence benchmark: make() returns a fresh iterator and taking n terms
+#                       from it is timed
+#   call benchmark:     n is None and the call make() itself is timed
+#
+# Every benchmark is run a few times to warm up caches and then repeat more
+# times with perf_counter_ns, the best time is the one reported. Peak memory
+# is measured with tracemalloc in one extra run since tracing slows
+# everything down. Results are plain dicts written as JSON and a saved run
+# can be used as a baseline to catch slowdowns.
+#
+#   python -m Sequences.Benchmark run --out baseline.json
+#   python -m Sequences.Benchmark run --out current.json
+#   python -m Sequences.Benchmark compare baseline.json current.json
+
+# Runs before timing starts
+WARMUP = 1
+
+# Timed runs of each benchmark
+REPEAT = 5
+
+# A benchmark this much slower than the baseline is a regression
+THRESHOLD = 0.10
+
+BENCHMARKS = {}
+
+_DEFAULTS = {"loaded": False}
+
+
+def register(name, make, n = None, group = "sequences"):
+    """
+    Add a benchmark to the registry
+
+    Args:
+        name -- unique name used in results
+        make -- function returning a fresh iterator, or the call to time if n is None
+        n -- number of terms taken from the iterator
+        group -- label for picking out related benchmarks
+    """
+
+    if name in BENCHMARKS:
+        raise Exception(f"a benchmark named {name} is already registered")
+    BENCHMARKS[name] = {"name": name, "make": make, "n": n, "group": group}
+
+
+def benchmark(name, n = None, group = "sequences"):
+    """Decorator registering a function as a benchmark"""
+
+    def decorate(make):
+        register(name,make,n,group)
+        return make
+
+    return decorate
+
+
+def _run_once(entry):
+    if entry["n"] is None:
+        t0 = perf_counter_ns()
+        entry["make"]()
+        return perf_counter_ns() - t0
+    # Creating the iterator is part of what is timed, some set up their
+    # state there
+    t0 = perf_counter_ns()
+    S = entry["make"]()
+    for t in islice(S,entry["n"]):
+        pass
+    return perf_counter_ns() - t0
+
+
+def _peak_memory(entry):
+    tracemalloc.start()
+    try:
+        _run_once(entry)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmark(name, repeat = REPEAT, warmup = WARMUP, memory = True):
+    """Time one registered benchmark, returns a dict of results"""
+    entry = BENCHMARKS[name]
+    for i in range(warmup):
+        _run_once(entry)
+    times = [_run_once(entry) for i in range(repeat)]
+
+    best = min(times)
+    out = {"name": name,
+           "group": entry["group"],
+           "n": entry["n"],
+           "repeat": repeat,
+           "times_ns": times,
+           "best_ns": best,
+           "median_ns": int(median(times))}
+    if entry["n"] is not None:
+        out["terms_per_second"] = entry["n"] * 10**9 / max(best,1)
+    if memory:
+        out["peak_bytes"] = _peak_memory(entry)
+    return out
+
+
+def run_suite(names = None, group = None, repeat = REPEAT, warmup = WARMUP, memory = True, verbose = True):
+    """Run the chosen benchmarks, all of them by default, returns a dict ready to save as JSON"""
+    _default_benchmarks()
+    if names is None:
+        names = [k for k,v in BENCHMARKS.items() if group is None or v["group"] == group]
+
+    results = {}
+    for name in names:
+        results[name] = run_benchmark(name,repeat,warmup,memory)
+        if verbose:
+            print(_format_result(results[name]))
+
+    return {"timestamp": strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "results": results}
+
+
+def _format_result(r):
+    line = f"{r['name']:<28} {r['best_ns']/1e6:>10.3f} ms"
+    if "terms_per_second" in r:
+        line += f" {r['terms_per_second']:>14,.0f} terms/s"
+    if "peak_bytes" in r:
+        line += f" {r['peak_bytes']/2**20:>9.2f} MiB"
+    return line
+
+
+def save_results(results, path):
+    """Write results from run_suite as JSON"""
+    with open(path,"w") as f:
+        json.dump(results,f,indent=1)
+
+
+def load_results(path):
+    """Read results saved by save_results"""
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_results(baseline, current, threshold = THRESHOLD, verbose = True):
+    """
+    Benchmarks that got slower than the baseline by more than threshold
+
+    Returns a list of (name, baseline ns, current ns, ratio). Only benchmarks
+    in both runs are compared.
+    """
+
+    regressions = []
+    for name,r in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        b = baseline["results"][name]["best_ns"]
+        c = r["best_ns"]
+        ratio = c / max(b,1)
+        if verbose:
+            flag = "  SLOWER" if ratio > 1+threshold else ""
+            print(f"{name:<28} {b/1e6:>10.3f} ms -> {c/1e6:>10.3f} ms  x{ratio:.2f}{flag}")
+        if ratio > 1+threshold:
+            regressions.append((name,b,c,ratio))
+    return regressions
+
+
+## Registry ##
+
+def _default_benchmarks():
+    """Register the standard benchmarks, the imports are here so importing this module stays cheap"""
+    if _DEFAULTS["loaded"]:
+        return
+    _DEFAULTS["loaded"] = True
+
+    from Sequences.Divisibility.Primes import primes
+    from Sequences.Totient import totients
+    from Sequences.ModularArithmetic import mobius_function
+    from Sequences.Collatz import collatz_length
+    from Sequences.Combinatorics.Partitions import partition_count
+    from Sequences.Weird import lucky
+    from PrimeNumbers import primes_in_range, prime_pi
+    from Computation.FactorizationECM import pipeline_factorization
+    from ModularArithmetic.DiscreteLog import discrete_log, _TABLES
+
+    register("primes",primes,10**6)
+    register("totients",totients,10**6)
+    register("mobius_function",mobius_function,10**6)
+    register("collatz_length",collatz_length,10**6)
+    register("partition_count",partition_count,2000)
+    register("lucky",lucky.uncached,3000)
+    register("totients.block",lambda: totients.block(10**9,10**9+10**6),group="blocks")
+    register("collatz_length.block",lambda: collatz_length.block(10**9,10**9+10**6),group="blocks")
+    register("primes_in_range",lambda: primes_in_range(10**12,10**12+10**7),group="algorithms")
+    register("prime_pi",lambda: prime_pi(10**10),group="algorithms")
+    register("pipeline_factorization",lambda: pipeline_factorization(1000000007*998244353*1000000009),group="algorithms")
+
+    def discrete_log_cold():
+        # Baby step tables are kept between calls, drop them so that building
+        # them is timed as well
+        _TABLES.clear()
+        discrete_log(pow(3,10**30,2**127-1),3,2**127-1)
+
+    register("discrete_log",discrete_log_cold,group="algorithms")
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog="python -m Sequences.Benchmark")
+    sub = parser.add_subparsers(dest="command",required=True)
+
+    run = sub.add_parser("run",help="run benchmarks and optionally save the results")
+    run.add_argument("names",nargs="*",help="benchmarks to run, all if none are given")
+    run.add_argument("--group")
+    run.add_argument("--repeat",type=int,default=REPEAT)
+    run.add_argument("--warmup",type=int,default=WARMUP)
+    run.add_argument("--no-memory",action="store_true")
+    run.add_argument("--out",help="JSON file for the results")
+
+    cmp = sub.add_parser("compare",help="compare two saved runs, exits with 1 on a regression")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold",type=float,default=THRESHOLD)
+
+    sub.add_parser("list",help="list the registered benchmarks")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        _default_benchmarks()
+        for name,entry in BENCHMARKS.items():
+            print(f"{name:<28} {entry['group']:<12} n = {entry['n']}")
+        return 0
+
+    if args.command == "run":
+        results = run_suite(args.names or None,args.group,args.repeat,args.warmup,not args.no_memory)
+        if args.out:
+            save_results(results,args.out)
+        return 0
+
+    regressions = compare_results(load_results(args.baseline),load_results(args.current),args.threshold)
+    return 1 if regressions else 0
+
+
+
+
+
+if __name__ == '__main__':
+    sys.exit(main())
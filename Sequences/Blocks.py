@@ -0,0 +1,54 @@
+from Sequences.NiceErrorChecking import require_integers, require_geq
+
+# Some sequences have a direct way to compute a whole range of terms at once,
+# usually a sieve or a vectorized map over n. Such a sequence carries a block
+# method, seq.block(start,stop), returning the terms for start <= n < stop as a
+# NumPy array, and the generator itself just streams those blocks. So term
+# 10^7 doesn't need the ten million before it and each term costs a share of
+# a NumPy call rather than a generator step.
+
+# Number of terms computed at once when streaming
+BLOCK_SIZE = 2**16
+
+
+def with_block(block, first = 1):
+    """
+    Decorator attaching block(start,stop) to a sequence
+
+    Args:
+        block -- function giving the terms for start <= n < stop as an array
+        first -- index n of the first term of the sequence
+    """
+
+    def checked_block(start, stop):
+        require_integers(["start","stop"],[start,stop])
+        require_geq(["start"],[start],first)
+        require_geq(["stop"],[stop],start)
+        return block(start,stop)
+
+    def decorate(f):
+        f.block = checked_block
+        f.first = first
+        return f
+
+    return decorate
+
+
+def stream_blocks(sequence, state = None):
+    """
+    Terms of a sequence with a block method
+
+    Args:
+        sequence -- the sequence, with block and first set by with_block
+        state -- optional dict, state["n"] is kept as the index of the next term
+    """
+
+    if state is None:
+        state = {}
+    state.setdefault("n",sequence.first)
+
+    while True:
+        lo = state["n"]
+        for t in sequence.block(lo,lo+BLOCK_SIZE).tolist():
+            state["n"] += 1
+            yield t
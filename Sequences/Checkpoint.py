@@ -0,0 +1,117 @@
+import copy
+import os
+import pickle
+from importlib import import_module
+from time import time
+
+# Generators can't be saved so a sequence that keeps a lot of state is
+# written as a generator function taking a dict, state, as its first argument
+# and keeping everything it needs to continue in there. Whenever it yields,
+# the dict must be enough to carry on from the term after the one just
+# yielded. The checkpointable decorator turns such a function into one that
+# takes only the usual arguments and returns an iterator with a save_state
+# method, and resume_from(path) gives back an iterator that picks up where the
+# saved one left off.
+#
+#   S = lucky.uncached()
+#   for n in S:
+#       ...
+#       S.save_state("lucky.ckpt")
+#
+#   S = resume_from("lucky.ckpt")
+
+# Protocol version stored with each snapshot
+STATE_VERSION = 1
+
+
+class Resumable:
+    """Iterator over a checkpointable sequence"""
+
+    def __init__(self, sequence, args, kwargs, state):
+        self.sequence = sequence
+        self.args = args
+        self.kwargs = kwargs
+        self._state = state
+        self._gen = sequence.generator(state,*args,**kwargs)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._gen)
+
+    def state(self):
+        """Copy of the current state"""
+        return copy.deepcopy(self._state)
+
+    def save_state(self, path):
+        """Write the state to path so resume_from can continue from here"""
+        save_state(self,path)
+
+
+def checkpointable(g):
+    """Decorator for a generator function g(state, *args) that keeps all its state in the dict state"""
+
+    def start(*args, **kwargs):
+        return Resumable(start,args,kwargs,{})
+
+    def from_state(state, args = (), kwargs = {}):
+        return Resumable(start,args,kwargs,state)
+
+    start.generator = g
+    start.from_state = from_state
+    start.__name__ = g.__name__
+    start.__qualname__ = g.__qualname__
+    start.__doc__ = g.__doc__
+    start.__module__ = g.__module__
+    return start
+
+
+def save_state(S, path):
+    """Write a snapshot of a Resumable sequence to path, replacing any older one"""
+    snapshot = {"version": STATE_VERSION,
+                "module": S.sequence.__module__,
+                "name": S.sequence.__qualname__,
+                "args": S.args,
+                "kwargs": S.kwargs,
+                "state": S._state}
+    # Write to a temporary file first so a crash never leaves a broken
+    # checkpoint in place of a good one
+    tmp = path + ".tmp"
+    with open(tmp,"wb") as f:
+        pickle.dump(snapshot,f)
+    os.replace(tmp,path)
+
+
+def load_state(path):
+    """The snapshot dict written by save_state"""
+    with open(path,"rb") as f:
+        snapshot = pickle.load(f)
+    if snapshot.get("version") != STATE_VERSION:
+        raise Exception(f"{path} is not a version {STATE_VERSION} checkpoint")
+    return snapshot
+
+
+def resume_from(path):
+    """Continue the sequence saved at path from the term after the last one it gave"""
+    snapshot = load_state(path)
+    sequence = getattr(import_module(snapshot["module"]),snapshot["name"])
+    # A term cache wraps the checkpointable function
+    sequence = getattr(sequence,"uncached",sequence)
+    return sequence.from_state(snapshot["state"],snapshot["args"],snapshot["kwargs"])
+
+
+def checkpointed(S, path, seconds = 60):
+    """Terms of a Resumable sequence, saving its state to path every few seconds and when stopped"""
+    last = time()
+    for t in S:
+        # The state is only known to be whole right after a term, so nothing
+        # is saved if the sequence itself fails
+        try:
+            yield t
+        except GeneratorExit:
+            save_state(S,path)
+            raise
+        if time() - last >= seconds:
+            save_state(S,path)
+            last = time()
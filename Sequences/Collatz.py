@@ -1,5 +1,17 @@
 from Sequences.Simple import naturals, odds
 from Sequences.NiceErrorChecking import require_integers, require_geq
+from Sequences.Blocks import with_block, stream_blocks
+from Sequences.Checkpoint import checkpointable
+
+import numpy as np
+
+# Lengths for n below this are kept once computed
+LENGTH_TABLE_SIZE = 2**20
+
+# Past this 3n+1 might not fit in an int64
+_INT64_LIMIT = (2**63-2)//3
+
+_LENGTHS = {"T": None}
 
 
 def _collatz_step(n):
@@ -78,40 +90,83 @@ def collatz_all():
         yield from collatz(n)
 
 
+def _collatz_steps_below(x, limit, T):
+    """Steps for each x to drop below limit plus the length T gives from there"""
+    
+    # Every value is advanced at once and those that have dropped below the
+    # limit are taken out, an odd value takes two steps to (3x+1)/2
+    out = np.zeros(len(x),dtype=np.int64)
+    idx = np.arange(len(x))
+    steps = np.zeros(len(x),dtype=np.int64)
+    
+    while len(x):
+        done = x < limit
+        out[idx[done]] = steps[done] + T[x[done]]
+        x, idx, steps = x[~done], idx[~done], steps[~done]
+        
+        # The rare values that could overflow finish with Python integers
+        big = x > _INT64_LIMIT
+        for i,v,st in zip(idx[big].tolist(),x[big].tolist(),steps[big].tolist()):
+            while v >= limit:
+                v = _collatz_step(v)
+                st += 1
+            out[i] = st + T[v]
+        x, idx, steps = x[~big], idx[~big], steps[~big]
+        
+        odd = (x & 1) == 1
+        x = np.where(odd,(3*x+1) >> 1,x >> 1)
+        steps += 1 + odd
+    
+    return out
+
+
+def _collatz_length_table():
+    if _LENGTHS["T"] is None:
+        # Values from a to 2a-1 only need the table below a
+        T = np.zeros(LENGTH_TABLE_SIZE,dtype=np.int64)
+        a = 2
+        while a < LENGTH_TABLE_SIZE:
+            n = np.arange(a,min(2*a,LENGTH_TABLE_SIZE),dtype=np.int64)
+            T[a:2*a] = _collatz_steps_below(n,a,T)
+            a *= 2
+        _LENGTHS["T"] = T
+    return _LENGTHS["T"]
+
+
+def collatz_length_block(start,stop):
+    """Collatz sequence lengths for start <= n < stop as an array"""
+    
+    T = _collatz_length_table()
+    if stop <= LENGTH_TABLE_SIZE:
+        return T[start:stop].copy()
+    
+    # Past _INT64_LIMIT the first step could already overflow so those n are
+    # done with Python integers from the start
+    mid = min(stop,max(start,_INT64_LIMIT+1))
+    out = np.zeros(stop-start,dtype=np.int64)
+    if mid > start:
+        n = np.arange(start,mid,dtype=np.int64)
+        out[:mid-start] = _collatz_steps_below(n,LENGTH_TABLE_SIZE,T)
+    for i,v in enumerate(range(mid,stop),mid-start):
+        st = 0
+        while v >= LENGTH_TABLE_SIZE:
+            v = _collatz_step(v)
+            st += 1
+        out[i] = st + T[v]
+    return out
+
+
 # Unknown if any terms are undefined but this code isn't fast enough to ever 
 # encounter such a case.
-# This algorithm stores a lot of intermediate results for a few percent speed
-# increase
-def collatz_length():
+@with_block(collatz_length_block)
+@checkpointable
+def collatz_length(state):
     """
     Collatz Sequence Lengths: Steps until the Collatz function equals 1 for each positive natural\n
     OEIS A006577, A008908
     """
     
-    D = {1:0}
-    
-    for n in naturals(1):
-        if n in D:
-            yield D[n]
-        
-        else:
-            ctr = n
-            length = 0
-            seen = []
-            
-            while ctr not in D:
-                ctr = _collatz_step(ctr)
-                length += 1
-                seen.append(ctr)
-            
-            length = D[ctr] + length
-            D[n] = length
-            
-            yield D[n]
-            
-            for num in seen:
-                length -= 1
-                D[num] = length
+    yield from stream_blocks(collatz_length,state)
 
 
 def collatz_longest():
@@ -233,6 +288,10 @@ if __name__ == '__main__':
     simple_test(collatz_length(),16,
                 "0, 1, 7, 2, 5, 8, 16, 3, 19, 6, 14, 9, 9, 17, 17, 4")
     
+    print("\nLength of the Collatz Sequences from 10^12")
+    simple_test(iter(collatz_length.block(10**12,10**12+8).tolist()),8,
+                "146, 146, 239, 239, 296, 296, 296, 239")
+    
     print("\nHighly Collatz Numbers")
     simple_test(collatz_longest(),14,
                 "1, 2, 3, 6, 7, 9, 18, 25, 27, 54, 73, 97, 129, 171")
@@ -4,20 +4,27 @@ from Sequences.Divisibility import primes
 from Sequences.Recurrence import tribonacci
 from Sequences.Manipulations import offset
 from Sequences.MathUtils import factors
+from Sequences.Checkpoint import checkpointable
 
 from math import prod
 from sympy import prime
 
-def partition_count():
+@checkpointable
+def partition_count(state):
     """
     Partition Numbers: Number of unique multisets of positive integers with sum n\n
     OEIS A000041
     """
     
-    D = [1]
+    # Every term so far, the next is found from them
+    D = state.setdefault("D",[])
     
-    for n in naturals(1):
-        yield D[-1]
+    if not D:
+        D.append(1)
+        yield 1
+    
+    while True:
+        n = len(D)
         
         P = gen_pentagonal()
         next(P)
@@ -27,13 +34,15 @@ def partition_count():
         
         for ctr,i in enumerate(P):
             if n-i < 0:
-                D.append(k)
                 break
             
             if ctr % 2 == 0:
                 sign *= -1
             
             k += sign*D[n-i]
+        
+        D.append(k)
+        yield k
 
 
 def partitions(n):
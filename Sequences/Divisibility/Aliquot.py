@@ -1,9 +1,12 @@
 from Sequences.NiceErrorChecking import require_integers, require_geq
 from Sequences.MathUtils import aliquot_parts, sum_of_divisors, powerset, aliquot_sum, prime_factorization
 from Sequences.Simple import naturals, arithmetic
+from Sequences.TermCache import term_cache
+from Sequences.Parallel import with_kernel
 
 from collections import Counter
 
+@with_kernel(aliquot_sum)
 def aliquot():
     """
     Aliquot Numbers: Sum of proper divisors for each positive integer\n
@@ -38,6 +41,9 @@ def touchable():
         lo = hi
 
 
+# Resuming needs the aliquot sums of everything up to the last term squared,
+# as much work as starting over, so a cached run skips the terms it has
+@term_cache()
 def untouchable():
     """
     Untouchable Numbers: Non-negative integers that cannot be an aliquot sum\n
@@ -158,20 +164,23 @@ def highly_abundant():
             yield n
 
 
+def _superabundant_from(start,M):
+    for n in naturals(start):
+        m = sum_of_divisors(n)/n
+        
+        if m > M:
+            M = m
+            yield n
+
+
+@term_cache(resume=lambda last: _superabundant_from(last+1,sum_of_divisors(last)/last))
 def superabundant():
     """
     Super Abundant Numbers: Positive integers such that the sum of divisors divided by n is greater than for every smaller positive integer\n
     OEIS A004394
     """
     
-    M = 0
-    
-    for n in naturals(1):
-        m = sum_of_divisors(n)/n
-        
-        if m > M:
-            M = m
-            yield n
+    yield from _superabundant_from(1,0)
 
 
 def deficient():
@@ -228,23 +237,29 @@ def pseudoperfect():
                 break
 
 
+def _is_pseudoperfect(n):
+    F = aliquot_parts(n)
+    for s in powerset(F):
+        if sum(s) == n:
+            return True
+    return False
+
+
+def _weird_from(start):
+    for a in naturals(start):
+        if aliquot_sum(a) > a and not _is_pseudoperfect(a):
+            yield a
+
+
 # Must be a more efficient way to generate these
+@term_cache(resume=lambda last: _weird_from(last+1))
 def weird():
     """
     Weird Numbers: Positive integers that are abundant but not pseudoperfect\n
     OEIS A006037
     """
     
-    def _is_pseudoperfect(n):
-        F = aliquot_parts(n)
-        for s in powerset(F):
-            if sum(s) == n:
-                return True
-        return False
-    
-    for a in abundant():
-        if not _is_pseudoperfect(a):
-            yield a
+    yield from _weird_from(1)
 
 
 def amicable_pairs():
@@ -4,6 +4,7 @@ from Sequences.Simple import naturals, arithmetic
 from Sequences.MathUtils import factors, prime_factorization, unique_prime_factors, \
                                 nth_sign, list_diffs
 from Sequences.Manipulations import partial_sums, prepend, partial_prods
+from Sequences.TermCache import term_cache
 
 from collections import defaultdict
 from math import prod, gcd
@@ -74,20 +75,23 @@ def rough(B):
             yield n
 
 
+def _highly_composite_from(start,F):
+    for i in naturals(start):
+        L = len(factors(i))
+        
+        if L > F:
+            F = L
+            yield i
+
+
+@term_cache(resume=lambda last: _highly_composite_from(last+1,len(factors(last))))
 def highly_composite():
     """
     Highly Composite Numbers: Positive integers that have more factors than any smaller positive integer\n
     OEIS A002182
     """
     
-    F = 0
-    
-    for i in naturals(1):
-        L = len(factors(i))
-        
-        if L > F:
-            F = L
-            yield i
+    yield from _highly_composite_from(1,0)
 
 
 def highly_composite_factor():
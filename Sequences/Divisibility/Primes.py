@@ -3,23 +3,30 @@ from Sequences.Manipulations import partial_prods, prepend, hypersequence, diffe
 from Sequences.NiceErrorChecking import require_integers, require_geq, require_iterable
 
 from collections import defaultdict
-from sympy import sieve, isprime
+from sympy import isprime
+from PrimeNumbers.Sieve import prime_blocks
+from PrimeNumbers.PrimeCounting import prime_pi
 from math import prod
 
 ##############################
 ## CLASSES OF PRIME NUMBERS ##
 ##############################
 
-def primes():
+def primes(start=0):
     """
-    Prime Numbers: Positive integers with exactly two factors\n
+    Prime Numbers: Positive integers with exactly two factors
+    
+    Args:
+        start -- only primes at least this large are generated
+    
     OEIS A000040
     """
     
-    upper = 2
-    while True:
-        upper *= 2
-        yield from sieve.primerange(upper//2, upper)
+    require_integers(["start"],[start])
+    require_geq(["start"],[start],0)
+    
+    for block in prime_blocks(start):
+        yield from block.tolist()
 
 
 def odd_primes():
@@ -291,16 +298,23 @@ def prime_characteristic():
         cur = p+1
 
 
-def prime_counting():
+def prime_counting(start=0):
     """
-    Prime Counting Function: Count of primes less than each non-negative integer\n
+    Prime Counting Function: Count of primes less than each non-negative integer
+    
+    Args:
+        start -- the first integer counted up to, the count for it is found directly
+    
     OEIS A000720
     """
     
-    ctr = 0
-    cur = 0
+    require_integers(["start"],[start])
+    require_geq(["start"],[start],0)
     
-    for p in primes():
+    ctr = prime_pi(start-1)
+    cur = start
+    
+    for p in primes(start):
         for i in range(p-cur):
             yield ctr
         
@@ -410,6 +424,10 @@ if __name__ == '__main__':
     simple_test(prime_counting(),18,
                 "0, 0, 1, 2, 2, 3, 3, 4, 4, 4, 4, 5, 5, 6, 6, 6, 6, 7")
     
+    print("\nPrime Counting Function from 10^12+36")
+    simple_test(prime_counting(10**12+36),5,
+                "37607912018, 37607912018, 37607912018, 37607912019, 37607912019")
+    
     print("\nCharacteristic Function of the Primes")
     simple_test(prime_characteristic(),18,
                 "0, 1, 1, 0, 1, 0, 1, 0, 0, 0, 1, 0, 1, 0, 0, 0, 1, 0")
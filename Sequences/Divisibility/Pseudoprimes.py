@@ -1,11 +1,13 @@
 from Sequences.Divisibility import composites, primes
 from Sequences.MathUtils import factor_out_twos, coprime_to
 from Sequences.NiceErrorChecking import require_integers, require_geq
+from Sequences.TermCache import term_cache
 #from Sequences.Weird import selfridge
 
 from sympy import jacobi_symbol
 #from sympy.ntheory.primetest import is_square
 from math import gcd
+from itertools import dropwhile
 
 def fermat_pseudoprimes(a):
     """
@@ -43,13 +45,7 @@ def cipolla_pseudoprimes(a):
             yield ((a**p-1)*(a**p+1))//d
 
 
-#Absurdly inefficient. Must be a better way.
-def carmichael_numbers():
-    """
-    Charmichael Numbers: Composite numbers that are Fermat Pseudoprimes to all bases\n
-    OEIS A002997
-    """
-    
+def _carmichael_from(C):
     def all_fermat_test(n):
         B = coprime_to(n)
         for b in B:
@@ -57,11 +53,22 @@ def carmichael_numbers():
                 return False
         return True
     
-    for c in composites():
+    for c in C:
         if all_fermat_test(c):
             yield c
 
 
+#Absurdly inefficient. Must be a better way.
+@term_cache(resume=lambda last: _carmichael_from(dropwhile(lambda c: c <= last,composites())))
+def carmichael_numbers():
+    """
+    Charmichael Numbers: Composite numbers that are Fermat Pseudoprimes to all bases\n
+    OEIS A002997
+    """
+    
+    yield from _carmichael_from(composites())
+
+
 def weak_pseudoprimes(a):
     """
     Weak Pseudoprimes to Base a
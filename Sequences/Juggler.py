@@ -1,4 +1,5 @@
 from Sequences.Simple import naturals, odds
+from Sequences.Parallel import with_kernel
 from math import isqrt
 
 def _juggler_step(n):
@@ -46,7 +47,17 @@ def juggler_map():
         yield _juggler_step(n)
 
 
+def _juggler_length(n):
+    """Steps for the Juggler Sequence starting at n to reach 1, without any memory of other n"""
+    ctr = 0
+    while n != 1:
+        n = _juggler_step(n)
+        ctr += 1
+    return ctr
+
+
 # As with the Collatz sequences it is unknown if all terms are defined
+@with_kernel(_juggler_length)
 def juggler_length():
     """
     Juggler Sequence Lengths: Steps until the Juggler Sequence starting at each positive natural reaches 1\n
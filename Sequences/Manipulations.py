@@ -1,9 +1,10 @@
 from Sequences.MathUtils import prime_power_factorization, prime_factorization, factors
+from PrimeNumbers import primes
 
-from itertools import islice, cycle, count, zip_longest, chain, accumulate, repeat, compress
+from itertools import islice, cycle, count, zip_longest, chain, accumulate, repeat
 from math import comb, prod
 import operator
-from time import time
+from time import perf_counter_ns
 
 # Many of these are copied from the itertools recipies
 
@@ -458,39 +459,13 @@ def memoize_total_additive(function):
         yield sum([D[i] for i in p])
 
 
-# To avoid potential circular reference from Sequences.Primes in following functions
-def _primes_copy():
-    yield 2
-    yield 3
-    yield 5
-    
-    D = { 9: 3, 25: 5 }
-    MASK = cycle((1, 0, 1, 1, 0, 1, 1, 0, 1, 0, 0, 1, 1, 0, 0))
-    MODULOS = frozenset( (1, 7, 11, 13, 17, 19, 23, 29) )
-    
-    for q in compress(count(7,2),MASK):
-        p = D.pop(q, None)
-        
-        if p is None:
-            D[q*q] = q
-            yield q
-        
-        else:
-            x = q + 2*p
-            
-            while x in D or (x%30) not in MODULOS:
-                x += 2*p
-            
-            D[x] = p
-
-
 def prime_subsequence(sequence):
     """
     Given a monotonically increasing sequence return all the prime elements
     WARNING: Doesn't check for monotonically increasing property
     """
     
-    prime = _primes_copy()
+    prime = primes()
     
     a = next(prime)
     b = next(sequence)
@@ -557,21 +532,26 @@ def simple_test(sequence,N,check):
         print(f"Produced:\n{S}")
 
 
+def time_terms(S, n):
+    """Nanoseconds to take n terms from an iterator"""
+    t0 = perf_counter_ns()
+    for t in islice(S,n):
+        pass
+    return perf_counter_ns() - t0
+
+
 def speed_compare(sequences,names=[],*,n=1,reps=1):
+    """
+    Print the seconds each sequence takes to give n terms, reps times over
+    For repeatable measurements register a benchmark in Sequences.Benchmark
+    """
     
     if names == []:
         names = [f"Sequence {i}" for i in range(1,len(sequences)+1)]
     
     for S,name in zip(sequences,names):
         print(name)
-        
-        t0 = time()
-        
-        for r in range(reps):
-            for t in islice(S, n):
-                pass
-        
-        print(time()-t0)
+        print(sum(time_terms(S,n) for r in range(reps))/10**9)
 
 
 def head(sequence,n):
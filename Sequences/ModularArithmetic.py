@@ -1,9 +1,12 @@
 from Sequences.Divisibility import primes
 from Sequences.Simple import odds, naturals
-from Sequences.MathUtils import egcd, prime_factorization, nth_sign, canonical_factorization
+from Sequences.MathUtils import egcd, canonical_factorization
 from Sequences.Figurate import squares
 from Sequences.Manipulations import segment, partial_sums
 from Sequences.NiceErrorChecking import require_integers
+from Sequences.Blocks import with_block, stream_blocks
+from Sequences.Checkpoint import checkpointable
+from ModularArithmetic.SieveTables import mobius_block
 
 from itertools import cycle
 from math import gcd
@@ -94,22 +97,15 @@ def kronecker_symbols():
     yield from cycle([1,0,-1,0,-1,0,1,0])
 
 
-def mobius_function():
+@with_block(mobius_block)
+@checkpointable
+def mobius_function(state):
     """
     Map of the Mobius Function\n
     OEIS A008683
     """
     
-    yield 1
-    
-    for n in naturals(2):
-        P = prime_factorization(n)
-        
-        if len(P) == len(set(P)):
-            yield nth_sign(len(P))
-        
-        else:
-            yield 0
+    yield from stream_blocks(mobius_function,state)
 
 
 def mertens_function():
@@ -230,6 +226,10 @@ if __name__ == '__main__':
     simple_test(mobius_function(),16,
                 "1, -1, -1, 0, -1, 1, -1, 0, 0, 1, -1, 0, -1, 1, 1, 0")
     
+    print("\nMobius Function after 10^12")
+    simple_test(iter(mobius_function.block(10**12+1,10**12+13).tolist()),12,
+                "-1, -1, -1, 0, -1, 1, 1, 0, -1, 0, 1, 0")
+    
     print("\nMerten's Function")
     simple_test(mertens_function(),14,
                 "1, 0, -1, -1, -2, -1, -2, -2, -2, -1, -2, -2, -3, -2")
@@ -0,0 +1,161 @@
+from Sequences.NiceErrorChecking import require_integers, require_geq, require_callable
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import count
+
+# Many sequences are a function applied to each n in turn and nothing is
+# shared between the terms, so the range of n can be cut into chunks that are
+# handed out to worker processes. The chunks are collected in order and only
+# a few per worker are ever in flight so memory stays bounded even for an
+# endless range.
+#
+# The function has to be picklable, which means defined at the top level of a
+# module. A sequence marked with with_kernel (or with_block from
+# Sequences.Blocks) carries its function so parallel_terms can use it
+# directly.
+#
+#   for t in parallel_terms(aliquot,1,10**6,workers=8):
+#       ...
+
+# Values of n in each chunk sent to a worker
+CHUNK_SIZE = 2**12
+
+# Chunks per worker submitted ahead of the one being read
+PREFETCH = 2
+
+
+def with_kernel(kernel, first = 1):
+    """
+    Decorator attaching the function giving each term, kernel(n, *args), to a sequence
+
+    Args:
+        kernel -- top level function of n and the sequence's arguments
+        first -- index n of the first term of the sequence
+    """
+
+    def decorate(f):
+        f.kernel = kernel
+        f.first = first
+        return f
+
+    return decorate
+
+
+def _kernel_chunk(kernel, lo, hi):
+    return [kernel(n) for n in range(lo,hi)]
+
+
+def _block_chunk(block, lo, hi):
+    return block(lo,hi).tolist()
+
+
+def _apply_kernel(sequence, args, n):
+    return sequence.kernel(n,*args)
+
+
+def _apply_block(sequence, lo, hi):
+    return sequence.block(lo,hi)
+
+
+def parallel_map(kernel, start, stop = None, workers = None, chunk_size = CHUNK_SIZE, vectorized = False):
+    """
+    Generate kernel(n) for start <= n < stop in order using several processes
+
+    Args:
+        kernel -- top level function of n, or of (lo,hi) giving an array when vectorized
+        start -- first n
+        stop -- end of the range, None for no end
+        workers -- number of processes, all the CPUs by default and 1 runs in this process
+        chunk_size -- values of n per task
+        vectorized -- whether kernel takes a whole range at once
+    """
+
+    require_callable(["kernel"],[kernel])
+    require_integers(["start","chunk_size"],[start,chunk_size])
+    require_geq(["chunk_size"],[chunk_size],1)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    task = _block_chunk if vectorized else _kernel_chunk
+    if stop is None:
+        bounds = ((lo,lo+chunk_size) for lo in count(start,chunk_size))
+    else:
+        bounds = ((lo,min(lo+chunk_size,stop)) for lo in range(start,stop,chunk_size))
+
+    if workers == 1:
+        for lo,hi in bounds:
+            yield from task(kernel,lo,hi)
+        return
+
+    pool = ProcessPoolExecutor(workers)
+    pending = deque()
+    try:
+        for lo,hi in bounds:
+            pending.append(pool.submit(task,kernel,lo,hi))
+            # Wait for the oldest chunk once enough are queued, the rest
+            # keep the workers busy in the meantime
+            if len(pending) >= workers*PREFETCH:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for f in pending:
+            f.cancel()
+        pool.shutdown(wait=True)
+
+
+def parallel_terms(sequence, start = None, stop = None, *args, workers = None, chunk_size = CHUNK_SIZE):
+    """
+    Terms of a sequence with a kernel or block, computed in parallel
+
+    Args:
+        sequence -- sequence marked by with_kernel or with_block
+        start -- first index n, the start of the sequence by default
+        stop -- end of the range, None for no end
+        args -- arguments of the sequence, passed on to its kernel
+        workers -- number of processes
+        chunk_size -- values of n per task
+    """
+
+    if start is None:
+        start = sequence.first
+    require_integers(["start"],[start])
+    require_geq(["start"],[start],sequence.first)
+
+    # The sequence itself is sent to the workers, it is pickled by name
+    if hasattr(sequence,"kernel"):
+        kernel = partial(_apply_kernel,sequence,args)
+        yield from parallel_map(kernel,start,stop,workers,chunk_size)
+    elif hasattr(sequence,"block"):
+        block = partial(_apply_block,sequence)
+        yield from parallel_map(block,start,stop,workers,chunk_size,vectorized=True)
+    else:
+        raise Exception(f"{sequence.__name__} has neither a kernel nor a block function")
+
+
+
+
+
+if __name__ == '__main__':
+    import time
+    from itertools import islice
+    from Sequences.Divisibility.Aliquot import aliquot
+    from Sequences.Juggler import juggler_length
+    from Sequences.BaseDependent import digital_sums, multiplicative_persistence
+    from Sequences.ModularArithmetic import mobius_function
+    from Sequences.Collatz import collatz_length
+
+    for S,args in [(aliquot,()), (juggler_length,()), (digital_sums,(7,)),
+                   (multiplicative_persistence,(10,)), (mobius_function,()),
+                   (collatz_length,())]:
+        serial = list(islice(S(*args),5000))
+        t0 = time.time()
+        par = list(parallel_terms(S,None,S.first+5000,*args,workers=2,chunk_size=512))
+        assert par == serial, S.__name__
+        print(f"{S.__name__:<28} matches  ({time.time()-t0:.2f}s)")
+
+    # An endless range stops cleanly when the consumer does
+    print(list(islice(parallel_terms(aliquot,10**6,workers=2),8)))
@@ -1,6 +1,6 @@
 from Sequences.Manipulations import speed_compare, memoize_multiplicative, memoize_total_additive
 from Sequences.MathUtils import jordan_totient, prime_factorization
-from Sequences.Primes import primes
+from Sequences.Divisibility.Primes import primes
 from Sequences.Simple import naturals
 
 from collections import defaultdict
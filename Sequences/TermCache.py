@@ -0,0 +1,281 @@
+from Sequences.NiceErrorChecking import require_callable
+
+import numpy as np
+import os
+import json
+import pickle
+import hashlib
+from itertools import islice
+
+# Terms of slow sequences kept on disk so a new process doesn't start again
+# from n = 1. Each cached sequence, identified by its function and arguments,
+# has three files in the cache directory
+#
+#   <key>.i64   the terms as int64, appended to and read as a memory map
+#   <key>.big   terms that don't fit in an int64 as zigzag varints, their
+#               place in the .i64 file holds BIG_TERM
+#   <key>.json  the name and arguments, rewritten on use so its time stamp
+#               shows which caches were used least recently
+#   <key>.state for a checkpointable sequence its state after the cached
+#               terms, so it continues without recomputing them
+#
+# Caching is off until a directory is given with set_cache_dir or by the
+# SEQUENCES_CACHE_DIR environment variable, until then the decorated
+# generators behave exactly as before.
+
+# Once the cache directory is larger than this the least recently used
+# sequences are removed
+MAX_CACHE_BYTES = 2**30
+
+# Terms written to disk at once
+FLUSH_TERMS = 2**10
+
+# Terms read from the memory map at once
+READ_TERMS = 2**12
+
+# Marks a term stored in the .big file
+BIG_TERM = -2**63
+
+_CACHE = {"dir": os.environ.get("SEQUENCES_CACHE_DIR")}
+
+
+def set_cache_dir(path):
+    """Directory for cached terms, None turns caching off"""
+    if path is not None:
+        os.makedirs(path,exist_ok=True)
+    _CACHE["dir"] = path
+
+
+def clear_cache():
+    """Delete every cached sequence"""
+    for key in _cache_keys():
+        _remove(key)
+
+
+def _cache_keys():
+    if _CACHE["dir"] is None or not os.path.isdir(_CACHE["dir"]):
+        return []
+    return [f[:-5] for f in os.listdir(_CACHE["dir"]) if f.endswith(".json")]
+
+
+def _path(key, ext):
+    return os.path.join(_CACHE["dir"],key+ext)
+
+
+def _remove(key):
+    for ext in [".i64",".big",".state",".json"]:
+        if os.path.exists(_path(key,ext)):
+            os.remove(_path(key,ext))
+
+
+def _evict(keep):
+    """Remove the least recently used sequences until the cache fits in MAX_CACHE_BYTES"""
+    used = []
+    total = 0
+    for key in _cache_keys():
+        size = sum(os.path.getsize(_path(key,ext)) for ext in [".i64",".big",".state"] if os.path.exists(_path(key,ext)))
+        used.append((os.path.getmtime(_path(key,".json")),size,key))
+        total += size
+    for t,size,key in sorted(used):
+        if total <= MAX_CACHE_BYTES:
+            break
+        if key != keep:
+            _remove(key)
+            total -= size
+
+
+def _write_varint(n, out):
+    # Zigzag so negative numbers stay short
+    n = 2*n if n >= 0 else -2*n-1
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varint(f):
+    n, shift = 0, 0
+    while True:
+        b = f.read(1)[0]
+        n |= (b & 0x7F) << shift
+        shift += 7
+        if b < 0x80:
+            break
+    return n//2 if n % 2 == 0 else -(n+1)//2
+
+
+def _cached_terms(key, big):
+    """Terms already on disk, leaves big positioned just past the last one used"""
+    if not os.path.exists(_path(key,".i64")):
+        return
+    count = os.path.getsize(_path(key,".i64")) // 8
+    if count == 0:
+        return
+    A = np.memmap(_path(key,".i64"),dtype=np.int64,mode="r",shape=(count,))
+    for lo in range(0,count,READ_TERMS):
+        for t in A[lo:lo+READ_TERMS].tolist():
+            yield _read_varint(big) if t == BIG_TERM else t
+
+
+def _append(key, terms, count):
+    """Write terms after the first count already on disk, False if another writer got there first"""
+    path = _path(key,".i64")
+    size = os.path.getsize(path) if os.path.exists(path) else 0
+    if size // 8 != count:
+        return False
+    small = np.zeros(len(terms),dtype=np.int64)
+    big = bytearray()
+    for i,t in enumerate(terms):
+        if type(t) != int:
+            raise TypeError("only integer terms can be cached")
+        if BIG_TERM < t < 2**63:
+            small[i] = t
+        else:
+            small[i] = BIG_TERM
+            _write_varint(t,big)
+    # The big terms go first so every marker written has its term
+    with open(_path(key,".big"),"ab") as f:
+        f.write(bytes(big))
+    with open(path,"r+b" if size else "wb") as f:
+        # Drop a partly written term left by an interrupted run
+        f.truncate(count*8)
+        f.seek(count*8)
+        f.write(small.tobytes())
+    return True
+
+
+def _save_sequence_state(key, R, count):
+    tmp = _path(key,".state.tmp")
+    with open(tmp,"wb") as f:
+        pickle.dump({"count": count, "state": R._state},f)
+    os.replace(tmp,_path(key,".state"))
+
+
+def _load_sequence_state(key, count):
+    """Saved state of a checkpointable sequence if it matches the cached terms"""
+    if not os.path.exists(_path(key,".state")):
+        return None
+    with open(_path(key,".state"),"rb") as f:
+        saved = pickle.load(f)
+    return saved["state"] if saved["count"] == count else None
+
+
+def term_cache(resume = None):
+    """
+    Decorator keeping the terms of a sequence on disk between runs
+
+    Args:
+        resume -- optional function taking the last cached term and the
+                  arguments of the sequence, giving the terms after it
+
+    A checkpointable sequence continues from its saved state instead. Other
+    sequences without resume are restarted and the cached terms skipped.
+    """
+
+    if resume is not None:
+        require_callable(["resume"],[resume])
+
+    def decorate(f):
+        name = f"{f.__module__}.{f.__qualname__}"
+
+        def cached(*args, **kwargs):
+            if _CACHE["dir"] is None:
+                yield from f(*args,**kwargs)
+                return
+
+            os.makedirs(_CACHE["dir"],exist_ok=True)
+            desc = {"name": name, "args": repr(args), "kwargs": repr(sorted(kwargs.items()))}
+            key = hashlib.sha1(json.dumps(desc).encode()).hexdigest()[:20]
+            with open(_path(key,".json"),"w") as meta:
+                json.dump(desc,meta)
+
+            # Serve what is on disk first
+            count = 0
+            last = None
+            big_path = _path(key,".big")
+            with open(big_path,"a+b") as big:
+                big.seek(0)
+                for t in _cached_terms(key,big):
+                    yield t
+                    last = t
+                    count += 1
+                # Anything past the last big term read is left over from an
+                # interrupted write
+                big.truncate(big.tell())
+
+            R = None
+            state = _load_sequence_state(key,count) if hasattr(f,"from_state") and count > 0 else None
+            if state is not None:
+                S = R = f.from_state(state,args,kwargs)
+            elif resume is not None and count > 0:
+                S = resume(last,*args,**kwargs)
+            else:
+                S = f(*args,**kwargs)
+                if hasattr(f,"from_state"):
+                    R = S
+                S = islice(S,count,None)
+
+            # Then generate new terms, saving them as they go
+            pending = []
+            writing = True
+            try:
+                for t in S:
+                    pending.append(t)
+                    yield t
+                    if len(pending) >= FLUSH_TERMS and writing:
+                        writing = _append(key,pending,count)
+                        count += len(pending)
+                        pending = []
+                        if writing and R is not None:
+                            _save_sequence_state(key,R,count)
+            finally:
+                if pending and writing:
+                    if _append(key,pending,count) and R is not None:
+                        _save_sequence_state(key,R,count+len(pending))
+                _evict(key)
+
+        cached.__name__ = f.__name__
+        cached.__qualname__ = f.__qualname__
+        cached.__doc__ = f.__doc__
+        cached.__module__ = f.__module__
+        cached.uncached = f
+        return cached
+
+    return decorate
+
+
+
+
+
+if __name__ == '__main__':
+    import tempfile
+    import time
+    from Sequences.Manipulations import simple_test
+
+    def slow_squares(k):
+        """Squares plus k, with a term too big for an int64"""
+        n = 0
+        while True:
+            time.sleep(0.001)
+            yield n*n + k if n != 5 else 2**70
+            n += 1
+
+    set_cache_dir(tempfile.mkdtemp())
+    S = term_cache(resume=None)(slow_squares)
+
+    print("First run")
+    simple_test(S(1),8,
+                "1, 2, 5, 10, 17, 1180591620717411303424, 37, 50")
+
+    t0 = time.time()
+    print("\nSecond run")
+    simple_test(S(1),10,
+                "1, 2, 5, 10, 17, 1180591620717411303424, 37, 50, 65, 82")
+    print(f"8 cached and 2 new terms in {time.time()-t0:.3f}s")
+
+    print("\nDifferent arguments")
+    simple_test(S(0),4,
+                "0, 1, 4, 9")
+
+    clear_cache()
+    set_cache_dir(None)
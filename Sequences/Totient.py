@@ -2,37 +2,23 @@ from Sequences.Simple import naturals
 from Sequences.Divisibility import primorial
 from Sequences.MathUtils import jordan_totient, prime_power_factorization, multi_lcm
 from Sequences.Manipulations import offset
+from Sequences.Blocks import with_block, stream_blocks
+from Sequences.Checkpoint import checkpointable
+from ModularArithmetic.SieveTables import totient_block
 
 from collections import defaultdict
 
 
-def totients():
+@with_block(totient_block)
+@checkpointable
+def totients(state):
     """
     Totients: Count of positive integers coprime to each positive integer\n
     OEIS A000010
     """
     
-    D = defaultdict(list)
-    
-    yield 1
-    
-    for q in naturals(2):
-        if q not in D:
-            yield q-1
-            D[q + q] = [q]
-        
-        else:
-            n,d = 1,1
-            
-            for p in D[q]:
-                D[p+q].append(p)
-                
-                n *= (p-1)
-                d *= p
-            
-            yield q*n//d
-            
-            del D[q]
+    # Read from the sieve tables in blocks, past them each block is sieved
+    yield from stream_blocks(totients,state)
 
 
 def cototients():
@@ -233,6 +219,10 @@ if __name__ == '__main__':
     simple_test(totients(),17,
                 "1, 1, 2, 2, 4, 2, 6, 4, 6, 4, 10, 4, 12, 6, 8, 8, 16")
     
+    print("\nTotients from 10^12")
+    simple_test(iter(totients.block(10**12,10**12+8).tolist()),8,
+                "400000000000, 979102080000, 333333333332, 983536538400, 465056256000, 533333333328, 427865376456, 999970995936")
+    
     print("\nJordan 2-Totients")
     simple_test(jordan_totients(2),13,
                 "1, 3, 8, 12, 24, 24, 48, 48, 72, 72, 120, 96, 168")
@@ -1,5 +1,7 @@
 from Sequences.Simple import naturals, arithmetic, sign_sequence
 from Sequences.MathUtils import int_to_bits, int_to_digits, int_to_name, int_to_hered_base_str, hered_base_to_int
+from Sequences.TermCache import term_cache
+from Sequences.Checkpoint import checkpointable
 
 from math import gcd
 from fractions import Fraction
@@ -193,18 +195,26 @@ def even_odd():
         yield n+s
 
 
-def lucky():
+# The term cache keeps the cycle positions along with the terms so a cached
+# run carries on from them
+@term_cache()
+@checkpointable
+def lucky(state):
     """
     Lucky Numbers: Prime-like integers resulting from a modified sieve of Eratosthenes\n
     OEIS A000959
     """
     
-    yield 1
-    yield 3
+    if not state:
+        # Terms of the sequence and where in the cycle each is, the next odd
+        # number to check and which lucky number we're currently looking for
+        state.update({"terms": [3], "ctrs": [2], "o": 5, "nth": 3, "start": [1,3]})
+    
+    while state["start"]:
+        yield state["start"].pop(0)
     
-    # Terms of the sequence and where in the cycle each is
-    terms = [3]
-    ctrs = [2]
+    terms = state["terms"]
+    ctrs = state["ctrs"]
     
     # Update the cycles positions
     # If any cycle has reached zero we're not at a lucky number and no later 
@@ -217,18 +227,18 @@ def lucky():
                 return False
         return True
     
-    # Which lucky number we're currently looking for
-    # This sets where the cycle for a newly found lucky number begins
-    nth = 3
-    
-    # Go through the odds greater than 5 looking for lucky numbers
-    for o in arithmetic(5,2):
+    # Go through the odds from 5 looking for lucky numbers, nth is which lucky
+    # number we're currently looking for and sets where its cycle begins
+    while True:
+        o = state["o"]
+        state["o"] += 2
+        
         if update():
-            yield o
-            
             terms.append(o)
-            ctrs.append(nth)
-            nth += 1
+            ctrs.append(state["nth"])
+            state["nth"] += 1
+            
+            yield o
 
 
 def selfridge():
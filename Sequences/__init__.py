@@ -68,6 +68,13 @@ from Sequences.Totient import totients, cototients, charmichael, \
        jordan_totients, totient_range, nontotients, even_nontotients, \
        sparsely_totient, highly_totient, totient_count
 
+from Sequences.TermCache import term_cache, set_cache_dir, clear_cache
+
+from Sequences.Checkpoint import checkpointable, save_state, resume_from, \
+       checkpointed
+
+from Sequences.Parallel import with_kernel, parallel_map, parallel_terms
+
 from Sequences.Weird import recaman, nonadditive, hofstader, co_hofstader, \
        even_odd, hofstader_Q, lucky, birthday, selfridge, goodstein, \
        binary_addition_chain, binary_addition_chain_chi, number_name_lengths
@@ -84,6 +91,13 @@ __all__=[#MANIPULATIONS
          "pairwise_apply","differences","hypersequence","run_length_encoding",
          "run_lengths",
          
+         #CACHING
+         "term_cache","set_cache_dir","clear_cache","checkpointable",
+         "save_state","resume_from","checkpointed",
+
+         #PARALLEL
+         "with_kernel","parallel_map","parallel_terms",
+         
          #BASE DEPENDENT
          "evil","odious","binary_weight","co_binary_weight","ruler",
          "binary_length","base_length","digital_sums","digital_roots",
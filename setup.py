@@ -17,7 +17,7 @@ DESCRIPTION = 'Stuff from number theory.'
 URL = 'https://github.com/SymmetricChaos/NumberTheory'
 EMAIL = 'me@example.com'
 AUTHOR = ''
-REQUIRES_PYTHON = '>=3.6.0'
+REQUIRES_PYTHON = '>=3.9.0'
 VERSION = None
 
 # What packages are required for this module to be executed?
@@ -119,7 +119,7 @@ setup(
         'License :: OSI Approved :: MIT License',
         'Programming Language :: Python',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.6',
+        'Programming Language :: Python :: 3.9',
         'Programming Language :: Python :: Implementation :: CPython',
         'Programming Language :: Python :: Implementation :: PyPy'
     ],